@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+from html_parsing import BACKENDS, get_parser
+from test_html_parsing import CORPUS_DIR, corpus
+
+print("--- BENCHMARK: HTML PARSING BACKENDS ON SAVED F319 / CAFEF PAGES ---\n")
+
+# ---------------------------------------------------------
+# SETUP: The checked-in corpus (python benchmark_html_parsing.py --save refreshes it from the live sites)
+# ---------------------------------------------------------
+MIN_SECONDS = 1.0   # Repeat the corpus until each backend has run at least this long
+SAVE_PAGES = {
+    'f319': {f"page-{p}.html": f"https://f319.com/forums/thi-truong-chung-khoan.3/page-{p}" for p in (1, 2, 3, 57)},
+    'cafef': {f"{t}.html": f"https://cafef.vn/du-lieu//Ajax/Events_RelatedNews_New.aspx?symbol={t}&floorID=0&configID=0&PageIndex=1&PageSize=10&Type=2"
+              for t in ('SHB', 'PVS', 'CEO')},
+}
+
+if '--save' in sys.argv:
+    from http_fetcher import AsyncFetcher
+    fetcher = AsyncFetcher()
+    for site, pages in SAVE_PAGES.items():
+        for name, result in zip(pages, fetcher.fetch_all(list(pages.values()))):
+            if result.ok:
+                with open(os.path.join(CORPUS_DIR, site, name), 'w', encoding='utf-8') as f:
+                    f.write(result.text)
+                print(f"   saved {site}/{name} ({len(result.text) / 1e3:.0f} KB)")
+            else:
+                print(f"   skipped {site}/{name}: {result.error or result.status}")
+    fetcher.close()
+
+f319, cafef = corpus('f319'), corpus('cafef')
+size_kb = sum(len(h.encode('utf-8')) for h in list(f319.values()) + list(cafef.values())) / 1e3
+print(f"{len(f319)} F319 pages + {len(cafef)} CafeF fragments ({size_kb:.0f} KB)")
+print("-" * 30)
+
+# ---------------------------------------------------------
+# TIMINGS
+# ---------------------------------------------------------
+def pages_per_second(fn, pages):
+    runs, start = 0, time.perf_counter()
+    while True:
+        for html in pages:
+            fn(html)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            return runs * len(pages) / elapsed
+
+
+reference = get_parser('bs4')
+rates = {}
+for name in BACKENDS:
+    try:
+        parser = get_parser(name)
+    except ImportError as e:
+        print(f"   {name:<11} skipped: {e}")
+        continue
+    same = (all(parser.forum_threads(h) == reference.forum_threads(h) for h in f319.values())
+            and all(parser.cafef_items(h) == reference.cafef_items(h) for h in cafef.values()))
+    rates[name] = (pages_per_second(parser.forum_threads, list(f319.values())),
+                   pages_per_second(parser.cafef_items, list(cafef.values())), same)
+
+base = rates['bs4']
+print(f"\n   {'Backend':<11} {'F319 pages/s':>13} {'Speed-up':>9} {'CafeF pages/s':>14} {'Speed-up':>9} {'Same output':>12}")
+for name, (forum, news, same) in rates.items():
+    print(f"   {name:<11} {forum:13.1f} {forum / base[0]:8.1f}x {news:14.1f} {news / base[1]:8.1f}x "
+          f"{'yes' if same else 'NO':>12}")
+
+print("\nSame output = identical threads / news items to BeautifulSoup on every page.")
+print("--- BENCHMARK COMPLETE ---")
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+print("--- BENCHMARK: FINBERT PER-HEADLINE LOOP vs LENGTH-BUCKETED BATCHES (CPU) ---\n")
+
+# ---------------------------------------------------------
+# SETUP: English headlines (already-translated corpus if present, else synthetic)
+# ---------------------------------------------------------
+CORPUS_FILE = 'data/headline_corpus.csv'   # Optional: one English headline per row, column 'text'
+N_HEADLINES = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+BATCH_SIZES = (8, 16, 32, 64)
+
+if os.path.exists(CORPUS_FILE):
+    headlines = pd.read_csv(CORPUS_FILE)['text'].dropna().astype(str).tolist()[:N_HEADLINES]
+else:
+    rng = np.random.default_rng(0)
+    subjects = ["Vinamilk", "Hoa Phat", "FPT", "Vietcombank", "Masan Group", "Vingroup", "PetroVietnam Gas"]
+    events = ["reports record quarterly profit", "misses revenue expectations", "plans to issue new shares",
+              "is fined for late disclosure", "raises full-year dividend", "sees steel demand recovering",
+              "expands into new export markets after strong first half", "cuts workforce amid weak orders"]
+    tails = ["", " as foreign investors return", " despite rising input costs and a weaker dong",
+             " according to the company's board of directors at the annual shareholders' meeting"]
+    headlines = [f"{rng.choice(subjects)} {rng.choice(events)}{rng.choice(tails)}" for _ in range(N_HEADLINES)]
+
+import torch
+import sentiment_engine as se
+
+print(f"{len(headlines)} headlines | torch threads: {torch.get_num_threads()}")
+print("-" * 30)
+
+# ---------------------------------------------------------
+# TIMINGS
+# ---------------------------------------------------------
+def timed(label, fn):
+    fn(headlines[:8])  # Warm-up (allocator, kernels)
+    start = time.perf_counter()
+    result = fn(headlines)
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<28} {elapsed:7.2f}s  {len(headlines) / elapsed:8.1f} headlines/s")
+    return result
+
+baseline = timed("Per-headline loop", lambda texts: [se.score_text(t) for t in texts])
+batched = {}
+for size in BATCH_SIZES:
+    batched[size] = timed(f"Batched (batch={size})", lambda texts, size=size: se.score_texts(texts, batch_size=size))
+
+# ---------------------------------------------------------
+# CORRECTNESS: Same label and confidence as the per-headline path
+# ---------------------------------------------------------
+print("\nAgreement with the per-headline loop")
+base = np.array(baseline, dtype=float)
+for size, scores in batched.items():
+    scores = np.array(scores, dtype=float)
+    same_sign = np.mean(np.sign(scores) == np.sign(base))
+    print(f"   batch={size:<3} label agreement {same_sign:7.2%} | max |score diff| {np.max(np.abs(scores - base)):.2e}")
+
+print("\n--- BENCHMARK COMPLETE ---")
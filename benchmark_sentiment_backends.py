@@ -0,0 +1,105 @@
+import sys
+import json
+import time
+import subprocess
+import numpy as np
+
+# ---------------------------------------------------------
+# SETUP: Stored headline corpus (translation cache), else a synthetic one
+# ---------------------------------------------------------
+N_HEADLINES = 1000
+BATCH_SIZE = 32
+
+
+def load_corpus(n=N_HEADLINES):
+    from sentiment_cache import SentimentCache
+    headlines = SentimentCache().english_corpus(limit=n)
+    if len(headlines) >= 50:
+        return headlines, "translation cache"
+    rng = np.random.default_rng(0)
+    subjects = ["Vinamilk", "Hoa Phat", "FPT", "Vietcombank", "Masan Group", "Vingroup", "PetroVietnam Gas"]
+    events = ["reports record quarterly profit", "misses revenue expectations", "plans to issue new shares",
+              "is fined for late disclosure", "raises full-year dividend", "sees steel demand recovering",
+              "expands into new export markets after strong first half", "cuts workforce amid weak orders"]
+    tails = ["", " as foreign investors return", " despite rising input costs and a weaker dong"]
+    return [f"{rng.choice(subjects)} {rng.choice(events)}{rng.choice(tails)}" for _ in range(n)], "synthetic"
+
+
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1e6
+    except ImportError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def run_backend(name):
+    """Runs inside a fresh process so load time and memory belong to one backend only."""
+    import sentiment_engine as se
+    headlines, _ = load_corpus()
+    base_rss = rss_mb()
+    start = time.perf_counter()
+    se.get_backend(name)
+    load_s = time.perf_counter() - start
+
+    se.score_texts(headlines[:BATCH_SIZE], backend=name)   # Warm-up
+    batch_lat = []
+    for i in range(0, min(len(headlines), 10 * BATCH_SIZE), BATCH_SIZE):
+        t = time.perf_counter()
+        se.score_texts(headlines[i:i + BATCH_SIZE], batch_size=BATCH_SIZE, backend=name)
+        batch_lat.append(time.perf_counter() - t)
+    single_lat = []
+    for text in headlines[:50]:
+        t = time.perf_counter()
+        se.score_texts([text], backend=name)
+        single_lat.append(time.perf_counter() - t)
+
+    start = time.perf_counter()
+    scores = se.score_texts(headlines, batch_size=BATCH_SIZE, backend=name)
+    total_s = time.perf_counter() - start
+    return {
+        'load_s': load_s, 'throughput': len(headlines) / total_s,
+        'batch_p50_ms': 1e3 * float(np.percentile(batch_lat, 50)),
+        'single_p50_ms': 1e3 * float(np.percentile(single_lat, 50)),
+        'single_p95_ms': 1e3 * float(np.percentile(single_lat, 95)),
+        'rss_mb': rss_mb(), 'model_mb': rss_mb() - base_rss, 'scores': scores,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == '--worker':
+        print(json.dumps(run_backend(sys.argv[2])))
+        sys.exit(0)
+
+    from finbert_backends import BACKENDS
+    headlines, source = load_corpus()
+    print("--- BENCHMARK: FINBERT BACKENDS (fp32 vs int8 vs ONNX Runtime, CPU) ---\n")
+    print(f"{len(headlines)} headlines ({source}) | batch size {BATCH_SIZE}")
+    print("-" * 30)
+
+    results = {}
+    for name in BACKENDS:
+        proc = subprocess.run([sys.executable, __file__, '--worker', name], capture_output=True, text=True)
+        if proc.returncode != 0:
+            reason = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+            print(f"   {name:<6} skipped: {reason}")
+            continue
+        results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    baseline = np.array(results['torch']['scores']) if 'torch' in results else None
+    print(f"\n   {'Backend':<7} {'Load':>6} {'Items/s':>9} {'Batch p50':>10} {'1-item p50/p95':>16} {'RSS':>8} "
+          f"{'Model':>8} {'Agree':>7} {'Max diff':>9}")
+    for name, r in results.items():
+        scores = np.array(r['scores'])
+        if baseline is not None:
+            agree = f"{np.mean(np.sign(scores) == np.sign(baseline)):.2%}"
+            diff = f"{np.max(np.abs(scores - baseline)):.1e}"
+        else:
+            agree = diff = "n/a"
+        print(f"   {name:<7} {r['load_s']:5.1f}s {r['throughput']:9.1f} {r['batch_p50_ms']:8.1f}ms "
+              f"{r['single_p50_ms']:7.1f}/{r['single_p95_ms']:<6.1f}ms {r['rss_mb']:6.0f}MB {r['model_mb']:6.0f}MB "
+              f"{agree:>7} {diff:>9}")
+
+    print("\nAgreement = same label (sign of the score) as the fp32 torch baseline.")
+    print("--- BENCHMARK COMPLETE ---")
@@ -0,0 +1,39 @@
+import sys
+import json
+import subprocess
+
+print("--- BENCHMARK: SENTIMENT ENGINE IMPORT TIME & MEMORY ---\n")
+
+# Each scenario runs in a fresh interpreter so imports and RSS are measured from a cold start
+PROBE = r'''
+import sys, time, json
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+try:
+    import psutil
+    rss_mb = psutil.Process().memory_info().rss / 1e6
+except ImportError:
+    import resource
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3   # Peak RSS, kB on Linux
+print(json.dumps({{'seconds': elapsed, 'rss_mb': rss_mb, 'torch': 'torch' in sys.modules}}))
+'''
+
+SCENARIOS = [
+    ("Bare interpreter", "pass"),
+    ("import sentiment_engine", "import sentiment_engine"),
+    ("Read cached scores", "import sentiment_engine as se\nse.cached_scores_for(['Tin tức thử nghiệm'])"),
+    ("Model loaded (warm-up)", "import sentiment_engine as se\nse.get_classifier()"),
+]
+
+print(f"   {'Scenario':<26} {'Time':>8} {'RSS':>10}  torch imported")
+for label, body in SCENARIOS:
+    proc = subprocess.run([sys.executable, '-c', PROBE.format(body=body)], capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(f"   {label:<26} failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr else proc.returncode}")
+        continue
+    r = json.loads(proc.stdout.strip().splitlines()[-1])
+    print(f"   {label:<26} {r['seconds']:7.2f}s {r['rss_mb']:8.0f} MB  {'yes' if r['torch'] else 'no'}")
+
+print("\n'Model loaded' is what importing the module used to cost before loading became lazy.")
+print("--- BENCHMARK COMPLETE ---")
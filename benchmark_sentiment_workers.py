@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import numpy as np
+from benchmark_sentiment_backends import load_corpus
+
+# ---------------------------------------------------------
+# SETUP: Scale the process pool from 1 worker up to MAX_WORKERS
+# ---------------------------------------------------------
+MAX_WORKERS = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+N_HEADLINES = 2000
+
+
+if __name__ == "__main__":
+    import sentiment_engine as se
+
+    headlines, source = load_corpus(N_HEADLINES)
+    print("--- BENCHMARK: FINBERT SCORING SCALED ACROSS WORKER PROCESSES (CPU) ---\n")
+    print(f"{len(headlines)} headlines ({source}) | {os.cpu_count()} cores | backend {se.BACKEND} | "
+          f"batch size {se.BATCH_SIZE}")
+    print("-" * 30)
+
+    results = {}
+    for workers in range(1, MAX_WORKERS + 1):
+        start = time.perf_counter()
+        se.score_texts_parallel(headlines[:se.BATCH_SIZE * workers], workers=workers)   # Start-up + warm-up
+        startup_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = se.score_texts_parallel(headlines, workers=workers)
+        elapsed = time.perf_counter() - start
+        se.shutdown_score_pool()
+        results[workers] = (startup_s, elapsed, np.array(scores, dtype=float))
+
+    base_time, base_scores = results[1][1], results[1][2]
+    print(f"\n   {'Workers':<8} {'Threads':>7} {'Start-up':>9} {'Time':>8} {'Items/s':>9} {'Speed-up':>9} "
+          f"{'Efficiency':>11} {'Max diff':>9}")
+    for workers, (startup_s, elapsed, scores) in results.items():
+        threads = se.threads_per_worker(workers) if workers > 1 else (se.TORCH_THREADS or "default")
+        speedup = base_time / elapsed
+        print(f"   {workers:<8} {threads:>7} {startup_s:8.1f}s {elapsed:7.2f}s {len(headlines) / elapsed:9.1f} "
+              f"{speedup:8.2f}x {speedup / workers:10.0%} {np.max(np.abs(scores - base_scores)):9.1e}")
+
+    print("\n1 worker = in-process scoring. Start-up includes loading one model per worker process.")
+    print("--- BENCHMARK COMPLETE ---")
@@ -1,7 +1,7 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import os
+from quant_starting_stocks.artifacts import read_artifact
 
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="Quant Value Dashboard", layout="wide")
@@ -13,7 +13,7 @@ FILE_PATH = 'MASTER_INVESTMENT_DASHBOARD.csv'
 def load_data():
     if not os.path.exists(FILE_PATH):
         return None
-    df = pd.read_csv(FILE_PATH)
+    df = read_artifact(FILE_PATH)
     return df
 
 df = load_data()
@@ -81,26 +81,100 @@
 # if __name__ == "__main__":
 #     scrape_f319_raw()
 
-import requests
-from bs4 import BeautifulSoup
-import time
 import pandas as pd
 import os
+import sys
+import json
+import time
+import hashlib
 from tqdm import tqdm
-import re  # <--- NEW: Needed for accurate word matching
+from http_fetcher import AsyncFetcher
+from html_parsing import get_parser
+from ticker_extractor import TickerExtractor
+from quant_starting_stocks.artifacts import read_artifact, write_artifact
 
 # --- CONFIGURATION ---
 TARGET_LIST_FILE = 'data/target_list_for_scrapers.csv'
 OUTPUT_FILE = 'data/f319_smart_filtered.csv' # Changed name to reflect filtered status
+STATE_FILE = 'data/f319_crawl_state.json'    # Threads seen so far (id -> last activity) + page validators
+FORUM_URL = "https://f319.com/forums/thi-truong-chung-khoan.3/page-{page}"
+PAGE_WAVE = 6  # Pages requested together; f319.com host limits live in http_fetcher.py
+MAX_TRACKED_THREADS = 20000   # Watermark size; the least recently seen threads are forgotten first
+RETENTION_DAYS = 90           # Merged rows not seen again within this many days are dropped
+
+def targets_hash(tickers):
+    """Fingerprint of the tracked ticker set (the crawl state is only valid for the set it was built with)."""
+    return hashlib.sha1(','.join(sorted(set(tickers))).encode('utf-8')).hexdigest()
+
+class ForumState:
+    """
+    What earlier crawls saw: thread id -> last-activity marker, and the ETag / Last-Modified
+    validators of each listing page. The forum lists threads by last activity, so once a page
+    holds only threads we have already seen with the same marker, everything below it is old too.
+    `targets` is the targets_hash the state was built for: threads skipped as "seen" were only
+    checked against those tickers.
+    """
+
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            self.threads, self.pages = data['threads'], data['pages']
+            self.targets = data.get('targets')
+        except (OSError, ValueError, KeyError):
+            self.threads, self.pages, self.targets = {}, {}, None
+
+    def is_new(self, thread):
+        """Never seen, or active again since the last crawl."""
+        return self.threads.get(thread['thread_id'], '') != thread['last_activity']
+
+    def mark(self, threads):
+        for t in threads:
+            self.threads.pop(t['thread_id'], None)   # Re-insert: dict order = least recently seen first
+            self.threads[t['thread_id']] = t['last_activity']
+
+    def conditional_headers(self, url):
+        validators = self.pages.get(url, {})
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers or None
+
+    def remember_page(self, url, response_headers):
+        etag, modified = response_headers.get('ETag'), response_headers.get('Last-Modified')
+        if etag or modified:
+            self.pages[url] = {'etag': etag, 'last_modified': modified}
+        else:
+            self.pages.pop(url, None)
 
-def load_targets():
-    """Loads the Top 50 tickers from the previous step."""
+    def save(self):
+        for key in list(self.threads)[:max(0, len(self.threads) - MAX_TRACKED_THREADS)]:
+            del self.threads[key]
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'threads': self.threads, 'pages': self.pages, 'targets': self.targets,
+                       'saved_at': time.time()}, f)
+        os.replace(tmp, self.path)
+
+def load_targets(all_tickers=False):
+    """Loads the Top 50 tickers from the previous step (or every listed ticker with all_tickers)."""
     try:
+        if all_tickers:
+            universe = TickerExtractor.from_universe()
+            if universe is not None:
+                print(f"🎯 Wide Mode Activated: Tracking all {len(universe)} listed tickers.")
+                return sorted(universe.tickers)
+            print("⚠️ Warning: Company master list not found. Falling back to the target list.")
+
         if not os.path.exists(TARGET_LIST_FILE):
             print(f"⚠️ Warning: {TARGET_LIST_FILE} not found. Running in 'Capture All' mode.")
             return []
             
-        df = pd.read_csv(TARGET_LIST_FILE)
+        df = read_artifact(TARGET_LIST_FILE, columns=['ticker'])
         # Convert to a list of uppercase strings
         targets = df['ticker'].astype(str).str.upper().unique().tolist()
         print(f"🎯 Sniper Mode Activated: Tracking {len(targets)} tickers.")
@@ -109,14 +183,90 @@ def load_targets():
         print(f"Error loading targets: {e}")
         return []
 
-def scrape_f319_smart():
+def parse_forum_threads(html, parser=None):
+    """
+    Threads on one forum listing page: id, title, last-activity marker and sticky flag,
+    or None when the page has no threads at all (end of the forum).
+    `parser` is one of html_parsing.BACKENDS (default: HTML_PARSER, lxml).
     """
-    Scrapes F319 but ONLY keeps threads related to our Target List.
+    return get_parser(parser).forum_threads(html)
+
+def thread_rows(threads, page, extractor):
+    """Output rows for the threads to keep. `extractor` is a TickerExtractor, or None to keep every thread."""
+    rows = []
+    for thread in threads:
+        raw_title = thread['title']
+        
+        # --- THE SNIPER FILTER ---
+        if extractor is not None:
+            # Every tracked ticker in the title, as whole words ("VIX" but NOT "VIXION").
+            # A thread about two stocks counts once for each.
+            for ticker in extractor.find_all(raw_title):
+                rows.append({
+                    'ticker': ticker, # Store which ticker matched
+                    'original_title': raw_title,
+                    'page': page,
+                    'source': 'F319_FORUM',
+                    'thread_id': thread['thread_id']
+                })
+        else:
+            # Fallback: If no target file exists, keep everything (Original behavior)
+            rows.append({
+                'ticker': 'UNKNOWN',
+                'original_title': raw_title,
+                'page': page,
+                'source': 'F319_FORUM',
+                'thread_id': thread['thread_id']
+            })
+    return rows
+
+def parse_forum_page(html, page, extractor):
+    """
+    Returns the rows to keep from one forum listing page,
+    or None when the page has no threads at all (end of the forum).
+    """
+    threads = parse_forum_threads(html)
+    return None if threads is None else thread_rows(threads, page, extractor)
+
+def prune_rows(df, target_tickers, now=None):
+    """
+    Keeps merged rows for tickers still tracked (all rows in 'Capture All' mode) and seen within
+    RETENTION_DAYS. Rows from before the scraped_at column count as seen today.
+    """
+    if df.empty:
+        return df
+    today = (now or pd.Timestamp.now()).normalize()
+    seen = pd.to_datetime(df['scraped_at'] if 'scraped_at' in df.columns else pd.Series(pd.NaT, index=df.index),
+                          errors='coerce').fillna(today)
+    df = df.assign(scraped_at=seen.dt.strftime('%Y-%m-%d'))
+    keep = seen >= today - pd.Timedelta(days=RETENTION_DAYS)
+    if target_tickers:
+        keep &= df['ticker'].astype(str).str.upper().isin(set(target_tickers))
+    return df[keep]
+
+def scrape_f319_smart(all_tickers=False, full=False):
+    """
+    Scrapes F319 but ONLY keeps threads related to our Target List
+    (or to any listed ticker with all_tickers).
+    After the first run the crawl is incremental: it stops at the first page with nothing new
+    and merges the new threads into the previous output. full=True walks every page again, and so
+    does a run whose ticker set differs from the one the saved state was built for.
     """
     print("--- SCRAPING F319: EXTRACTING SMART SIGNALS ---")
     
-    # 1. Load the Hit List
-    target_tickers = load_targets()
+    # 1. Load the Hit List (matched against every title in one pass)
+    target_tickers = load_targets(all_tickers)
+    extractor = TickerExtractor(target_tickers) if target_tickers else None
+
+    state = ForumState()
+    current_targets = targets_hash(target_tickers)
+    incremental = bool(state.threads) and not full and os.path.exists(OUTPUT_FILE)
+    if incremental and state.targets != current_targets:
+        print("🎯 Target list changed since the last crawl: full rescan so new tickers get their existing threads.")
+        incremental = False
+    state.targets = current_targets
+    if incremental:
+        print(f"🔁 Incremental crawl: {len(state.threads)} threads already seen (--full to rescan).")
     
     pages_to_scan = 150 
     all_data = []
@@ -127,82 +277,82 @@ def scrape_f319_smart():
         'Referer': 'https://f319.com/'
     }
 
-    # Loop through pages 1 to 150
-    for page in tqdm(range(1, pages_to_scan + 1), desc="Scanning F319 Pages"):
-        
-        url = f"https://f319.com/forums/thi-truong-chung-khoan.3/page-{page}"
-        
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            
-            if response.status_code != 200:
-                tqdm.write(f"  [ERROR] Page {page} failed. Status: {response.status_code}. Stopping.")
+    fetcher = AsyncFetcher(headers=headers)
+    pbar = tqdm(total=pages_to_scan, desc="Scanning F319 Pages")
+    stop = False
+    requests_sent = 0
+
+    # Pages go out in waves through the shared fetcher; results are still processed in page order.
+    # A refresh usually ends on page 1 or 2, so incremental waves start at one page and double.
+    wave = 1 if incremental else PAGE_WAVE
+    wave_start = 1
+    while wave_start <= pages_to_scan and not stop:
+        pages = list(range(wave_start, min(wave_start + wave, pages_to_scan + 1)))
+        urls = [FORUM_URL.format(page=p) for p in pages]
+        conditional = [state.conditional_headers(url) if incremental else None for url in urls]
+        results = fetcher.fetch_all(urls, headers=conditional)
+        requests_sent += len(urls)
+
+        for page, url, result in zip(pages, urls, results):
+            pbar.update(1)
+
+            if result.error is not None:
+                tqdm.write(f"  [Error] Page {page}: {result.error}")
+                continue
+
+            if result.status == 304:
+                tqdm.write(f"  [INFO] Page {page} unchanged since the last crawl. Stopping.")
+                stop = True
                 break
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find titles
-            titles = soup.find_all('h3', class_='title')
-            if not titles:
-                titles = soup.find_all('a', class_='PreviewTooltip')
-            
-            if titles:
-                for title_tag in titles:
-                    link = title_tag.find('a') if title_tag.name == 'h3' else title_tag
-                    if link:
-                        raw_title = link.get_text(strip=True)
-                        title_upper = raw_title.upper()
-                        
-                        # --- THE SNIPER FILTER ---
-                        matched_ticker = None
-                        
-                        if target_tickers:
-                            # Check if any of our 50 tickers appear in this title
-                            for ticker in target_tickers:
-                                # Regex \b means "Word Boundary". 
-                                # It ensures "VIX" matches "VIX" but NOT "VIXION"
-                                if re.search(r'\b' + re.escape(ticker) + r'\b', title_upper):
-                                    matched_ticker = ticker
-                                    break # Found a match, stop checking other tickers
-                            
-                            # If we found a match (or if we have no targets), keep it
-                            if matched_ticker:
-                                all_data.append({
-                                    'ticker': matched_ticker, # Store which ticker matched
-                                    'original_title': raw_title,
-                                    'page': page,
-                                    'source': 'F319_FORUM'
-                                })
-                        else:
-                            # Fallback: If no target file exists, keep everything (Original behavior)
-                            all_data.append({
-                                'ticker': 'UNKNOWN',
-                                'original_title': raw_title,
-                                'page': page,
-                                'source': 'F319_FORUM'
-                            })
-                            
-            else:
+            if result.status != 200:
+                tqdm.write(f"  [ERROR] Page {page} failed. Status: {result.status}. Stopping.")
+                stop = True
+                break
+
+            threads = parse_forum_threads(result.text)
+            if threads is None:
                 tqdm.write(f"  [INFO] No threads found on page {page}. Stopping scan.")
+                stop = True
                 break
-            
-            time.sleep(1.0) 
+            state.remember_page(url, result.headers)
 
-        except Exception as e:
-            tqdm.write(f"  [Error] Page {page}: {e}")
-            continue
+            fresh = [t for t in threads if state.is_new(t)]
+            all_data.extend(thread_rows(fresh if incremental else threads, page, extractor))
+            state.mark(threads)
+
+            # Sticky threads sit on top whatever their activity, so only normal threads count
+            if incremental and not any(not t['sticky'] for t in fresh):
+                tqdm.write(f"  [INFO] Page {page} holds only threads seen before. Stopping.")
+                stop = True
+                break
+
+        wave_start += len(pages)
+        wave = min(wave * 2, PAGE_WAVE)
+
+    pbar.close()
+    fetcher.report("F319")
+    print(f"  [F319] {requests_sent} listing pages requested.")
 
     # SAVE TO CSV
-    if all_data:
-        df = pd.DataFrame(all_data)
-        
+    df = pd.DataFrame(all_data)
+    if not df.empty:
+        df['scraped_at'] = pd.Timestamp.now().strftime('%Y-%m-%d')
+    if incremental:
+        # New and re-activated threads first, then what is kept from earlier runs
+        previous = prune_rows(read_artifact(OUTPUT_FILE), target_tickers)
+        print(f"  [F319] {len(df)} new rows merged into {len(previous)} kept from earlier runs.")
+        df = pd.concat([df, previous], ignore_index=True)
+
+    if not df.empty:
         if not os.path.exists('data'):
             os.makedirs('data')
             
         # Drop duplicates (sticky threads appear on every page)
-        df = df.drop_duplicates(subset=['original_title'])
+        df = df.drop_duplicates(subset=['ticker', 'original_title'])
             
-        df.to_csv(OUTPUT_FILE, index=False, encoding='utf-8-sig')
+        write_artifact(df, OUTPUT_FILE, encoding='utf-8-sig')
+        state.save()
         
         print(f"\n[SUCCESS] Found {len(df)} relevant discussions.")
         print(f"Saved to {OUTPUT_FILE}")
@@ -214,6 +364,9 @@ def scrape_f319_smart():
         
     else:
         print("\n[INFO] No relevant discussions found for your target list.")
+        state.save()   # Still remember the threads, so the next run starts from here
 
 if __name__ == "__main__":
-    scrape_f319_smart()
\ No newline at end of file
+    # --all-tickers: track every listed company instead of the Top 50 target list
+    # --full: ignore the saved watermark and walk every page
+    scrape_f319_smart(all_tickers='--all-tickers' in sys.argv, full='--full' in sys.argv)
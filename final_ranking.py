@@ -1,5 +1,5 @@
-import pandas as pd
 import numpy as np
+from quant_starting_stocks.artifacts import read_artifact, write_artifact
 
 # --- CONFIGURATION ---
 TARGET_LIST = 'data/target_list_for_scrapers.csv'
@@ -13,8 +13,8 @@ W_SENTIMENT = 0.30     # 30% (News + Forum)
 
 def generate_final_report():
     try:
-        targets_df = pd.read_csv(TARGET_LIST)
-        sentiment_df = pd.read_csv(SENTIMENT_DATA)
+        targets_df = read_artifact(TARGET_LIST)
+        sentiment_df = read_artifact(SENTIMENT_DATA, columns=['ticker', 'type', 'sentiment_score'])
     except FileNotFoundError:
         print("❌ Missing input files. Run previous steps first.")
         return
@@ -95,7 +95,7 @@ def generate_final_report():
     
     report = targets_df.sort_values('ALPHA_SCORE', ascending=False)[final_cols]
     
-    report.to_csv(FINAL_REPORT, index=False)
+    write_artifact(report, FINAL_REPORT)
     
     print(f"\n🏆 TOP 10 HIDDEN GEMS 🏆")
     print(report.head(10).to_string(index=False))
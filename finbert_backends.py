@@ -0,0 +1,83 @@
+import os
+import numpy as np
+
+# --- CONFIGURATION ---
+BACKENDS = ('torch', 'int8', 'onnx')
+ONNX_DIR = 'data/models'
+
+
+class TorchBackend:
+    """fp32 PyTorch (the baseline). With quantize=True, Linear layers use dynamic int8 weights."""
+
+    tensors = 'pt'
+
+    def __init__(self, tokenizer, model, quantize=False):
+        import torch
+        self.torch = torch
+        self.tokenizer = tokenizer
+        self.id2label = model.config.id2label
+        self.model = model.eval()
+        if quantize:
+            self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def probabilities(self, enc):
+        torch = self.torch
+        with torch.inference_mode():
+            logits = self.model(**enc.to(self.model.device)).logits.float()
+            return torch.softmax(logits, dim=-1).cpu().numpy()
+
+
+class OnnxBackend:
+    """ONNX Runtime on CPU. The model is exported once per revision and reused from ONNX_DIR."""
+
+    tensors = 'np'
+
+    def __init__(self, tokenizer, model, revision, threads=0, onnx_dir=ONNX_DIR):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("The 'onnx' backend needs onnxruntime (pip install onnxruntime)")
+        self.tokenizer = tokenizer
+        self.id2label = model.config.id2label
+        path = os.path.join(onnx_dir, f"finbert-{revision}.onnx")
+        if not os.path.exists(path):
+            _export_onnx(tokenizer, model, path)
+
+        options = ort.SessionOptions()
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.inputs = [i.name for i in self.session.get_inputs()]
+
+    def probabilities(self, enc):
+        feed = {name: np.asarray(enc[name], dtype=np.int64) for name in self.inputs}
+        logits = self.session.run(None, feed)[0].astype(np.float64)
+        logits -= logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def _export_onnx(tokenizer, model, path):
+    import torch
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    sample = tokenizer(["Company reports record quarterly profit"], return_tensors='pt')
+    # Positional inputs in BERT forward() order, so the ONNX input names line up with the tokenizer's keys
+    names = [n for n in ('input_ids', 'attention_mask', 'token_type_ids') if n in sample]
+    dynamic = {name: {0: 'batch', 1: 'tokens'} for name in names}
+    dynamic['logits'] = {0: 'batch'}
+    tmp = f"{path}.tmp"
+    with torch.inference_mode():
+        torch.onnx.export(model.eval(), tuple(sample[n] for n in names), tmp, input_names=names, output_names=['logits'],
+                          dynamic_axes=dynamic, opset_version=17)
+    os.replace(tmp, path)
+
+
+def load_backend(name, tokenizer, model, revision='main', threads=0):
+    """Builds one of BACKENDS around an already-loaded tokenizer and fp32 model."""
+    if name == 'torch':
+        return TorchBackend(tokenizer, model)
+    if name == 'int8':
+        return TorchBackend(tokenizer, model, quantize=True)
+    if name == 'onnx':
+        return OnnxBackend(tokenizer, model, revision, threads)
+    raise ValueError(f"Unknown FinBERT backend '{name}' (choose from {', '.join(BACKENDS)})")
@@ -1,55 +1,110 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from vnstock import Vnstock
+from quant_starting_stocks.statement_store import StatementStore
+from quant_starting_stocks.field_resolver import FieldResolver, find_column
+from quant_starting_stocks.rate_limiter import VNSTOCK
+from quant_starting_stocks.data_adapter import DataProvider
+from quant_starting_stocks.artifacts import read_artifact, write_artifact
 
 # --- CONFIGURATION ---
 TARGET_FILE = 'data/target_list_for_scrapers.csv'
-CACHE_DIR = 'data/cache'
 OUTPUT_FILE = 'data/target_list_with_forensics.csv'
+MASTER_FILE = 'data/company_master_list.csv'
+UNIVERSE_OUTPUT_FILE = 'data/market_forensics.csv'
+PREFETCH_WORKERS = VNSTOCK.max_concurrency  # Threads only; the shared limiter sets the in-flight cap
+FORENSIC_REPORTS = ('bs', 'is')
+
+# Same Parquet statement store the Piotroski step writes to
+STATEMENTS = StatementStore()
 
 # --- DATA HELPERS ---
 def get_cached_data(symbol, report_type):
     """Retrieves cached data used by Piotroski score."""
-    file_path = os.path.join(CACHE_DIR, f"{symbol}_{report_type}.json")
-    if os.path.exists(file_path):
-        try:
-            return pd.read_json(file_path)
-        except ValueError:
-            return None
-    # If not in cache, fetch it (Fallback)
+    df = STATEMENTS.load(symbol, report_type)
+    if df is not None:
+        return df
+    # If not in cache, fetch it (Fallback) and keep it for the next run
+    df = fetch_statements(symbol, [report_type]).get(report_type)
+    if df is not None:
+        STATEMENTS.save(symbol, report_type, df)
+    return df
+
+def fetch_statements(symbol, report_types):
+    """Downloads the requested yearly reports from VCI. Returns {report_type: DataFrame}."""
+    fetched = {}
     try:
         stock = Vnstock().stock(symbol=symbol, source='VCI')
-        if report_type == 'bs':
-            df = stock.finance.balance_sheet(period='year', lang='en', dropna=True)
-        elif report_type == 'is':
-            df = stock.finance.income_statement(period='year', lang='en', dropna=True)
+    except Exception:
+        return fetched
+    # Retries, error classification and fail-fast breakers live in the shared API wrapper
+    for r_type in report_types:
+        if r_type == 'bs':
+            df = DataProvider._safe_api_call(stock.finance.balance_sheet, period='year', lang='en', dropna=True,
+                                             endpoint='finance.balance_sheet')
+        elif r_type == 'is':
+            df = DataProvider._safe_api_call(stock.finance.income_statement, period='year', lang='en', dropna=True,
+                                             endpoint='finance.income_statement')
         else:
-            return None
-        return df
-    except:
-        return None
+            df = DataProvider._safe_api_call(stock.finance.cash_flow, period='year', dropna=True,
+                                             endpoint='finance.cash_flow')
+        if df is not None and not df.empty:
+            fetched[r_type] = df
+    return fetched
+
+def prefetch_statements(tickers, report_types=FORENSIC_REPORTS, max_workers=PREFETCH_WORKERS):
+    """
+    Fills the statement store for every ticker that is missing a report.
+    Misses are fetched concurrently and persisted in batches, so the next run starts warm.
+    """
+    cached = STATEMENTS.load_many(tickers, report_types)
+    missing = {t: [r for r in report_types if (t, r) not in cached] for t in tickers}
+    missing = {t: reports for t, reports in missing.items() if reports}
+    if not missing:
+        return
+
+    print(f"Prefetching statements for {len(missing)} tickers missing from the store...")
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_statements, t, reports): t for t, reports in missing.items()}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Fetching Statements"):
+            ticker = futures[future]
+            for r_type, df in future.result().items():
+                pending[(ticker, r_type)] = df
+            if len(pending) >= 100:
+                STATEMENTS.save_many(pending)
+                pending = {}
+    STATEMENTS.save_many(pending)
+    STATEMENTS.compact()
 
 def get_val(df, idx, keywords):
     """Safely extracts a value from a dataframe column based on keywords."""
     if df is None or df.empty or idx >= len(df):
         return 0.0
-    for col in df.columns:
-        if any(k.lower() in col.lower() for k in keywords):
-            try:
-                # Handle cases where data might be a string or None
-                val = df.iloc[idx][col]
-                return float(val) if val is not None else 0.0
-            except:
-                return 0.0
-    return 0.0
+    pos = find_column(df.columns, keywords)
+    if pos < 0:
+        return 0.0
+    return _to_float(df.iat[idx, pos])
+
+def _to_float(val):
+    # Handle cases where data might be a string or None
+    try:
+        return float(val) if val is not None else 0.0
+    except:
+        return 0.0
 
 # --- BENEISH M-SCORE CALCULATOR ---
 def calculate_m_score(symbol):
     bs = get_cached_data(symbol, 'bs')
     is_ = get_cached_data(symbol, 'is')
-    
+    return m_score_from_statements(bs, is_)
+
+def m_score_from_statements(bs, is_):
+    """Scalar M-Score for one stock. This is the reference the batch path must match."""
     # Needs at least 2 years of data
     if bs is None or is_ is None or len(bs) < 2 or len(is_) < 2:
         return np.nan
@@ -135,6 +190,137 @@ def calculate_m_score(symbol):
               
     return m_score
 
+# --- VECTORIZED BENEISH M-SCORE ---
+# Canonical fields per statement. Keyword lists mirror m_score_from_statements exactly.
+BENEISH_FIELDS = {
+    'bs': FieldResolver('beneish/bs', {
+        'receivables': ['Receivables', 'Short-term receivables'],
+        'total_assets': ['Total Assets'],
+        'current_assets': ['Current assets', 'Short-term assets'],
+        'fixed_assets': ['Fixed assets', 'Property, plant'],
+        'current_liabilities': ['Current liabilities'],
+        'lt_liabilities': ['Long-term liabilities', 'Non-current liabilities'],
+        'cash': ['Cash', 'Cash equivalents'],
+    }),
+    'is': FieldResolver('beneish/is', {
+        'revenue': ['Revenue', 'Net Revenue'],
+        'cogs': ['Cost of Goods Sold', 'Cost of Sales'],
+        'sga': ['Selling expenses', 'Admin', 'Operating expenses'],
+        'net_income': ['Net Profit', 'Net Income'],
+    }),
+}
+
+# (input name, statement, canonical field, row). Row 0 = current year, 1 = prior year.
+BENEISH_INPUTS = [
+    ('rec_cy', 'bs', 'receivables', 0),
+    ('rec_py', 'bs', 'receivables', 1),
+    ('rev_cy', 'is', 'revenue', 0),
+    ('rev_py', 'is', 'revenue', 1),
+    ('cogs_cy', 'is', 'cogs', 0),
+    ('cogs_py', 'is', 'cogs', 1),
+    ('ta_cy', 'bs', 'total_assets', 0),
+    ('ta_py', 'bs', 'total_assets', 1),
+    ('ca_cy', 'bs', 'current_assets', 0),
+    ('ca_py', 'bs', 'current_assets', 1),
+    ('ppe_cy', 'bs', 'fixed_assets', 0),
+    ('ppe_py', 'bs', 'fixed_assets', 1),
+    ('sga_cy', 'is', 'sga', 0),
+    ('sga_py', 'is', 'sga', 1),
+    ('cl_cy', 'bs', 'current_liabilities', 0),
+    ('cl_py', 'bs', 'current_liabilities', 1),
+    ('ltd_cy', 'bs', 'lt_liabilities', 0),
+    ('ltd_py', 'bs', 'lt_liabilities', 1),
+    ('net_income', 'is', 'net_income', 0),
+    ('cash', 'bs', 'cash', 0),
+]
+
+BENEISH_INDICES = ['DSRI', 'GMI', 'AQI', 'SGI', 'DEPI', 'SGAI', 'LVGI', 'TATA']
+
+def beneish_inputs(bs, is_):
+    """Raw M-Score inputs of one stock, or None where the scalar path returns NaN."""
+    if bs is None or is_ is None or len(bs) < 2 or len(is_) < 2:
+        return None
+    statements = {'bs': bs, 'is': is_}
+    positions = {stmt: BENEISH_FIELDS[stmt].resolve(df.columns) for stmt, df in statements.items()}
+    values = {}
+    for name, stmt, field, row in BENEISH_INPUTS:
+        pos = positions[stmt][field]
+        # Missing fields read as 0, like get_val (reported once per schema)
+        values[name] = _to_float(statements[stmt].iat[row, pos]) if pos >= 0 else 0.0
+    return values
+
+def score_beneish_batch(rows):
+    """
+    All eight Beneish indices plus the M-Score for N stocks as column operations.
+    `rows` is a list of beneish_inputs() results. Returns a DataFrame aligned with it.
+    """
+    n = len(rows)
+    valid = np.array([r is not None for r in rows], dtype=bool)
+    x = {name: np.array([r[name] if r is not None else 0.0 for r in rows], dtype=np.float64)
+         for name, _, _, _ in BENEISH_INPUTS}
+    # Scalar Python raises ZeroDivisionError (-> NaN score) where NumPy would return inf
+    failed = np.zeros(n, dtype=bool)
+
+    def div(num, den, cond):
+        failed[cond & (den == 0)] = True
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return num / np.where(den == 0, 1.0, den)
+
+    def pick(cond, value, default):
+        return np.where(cond, value, default)
+
+    # 1. DSRI
+    cond = (x['rev_cy'] != 0) & (x['rev_py'] != 0) & (x['rec_py'] != 0)
+    dsri = pick(cond, div(div(x['rec_cy'], x['rev_cy'], cond), div(x['rec_py'], x['rev_py'], cond), cond), 1.0)
+
+    # 2. GMI
+    gp_cy = x['rev_cy'] - np.abs(x['cogs_cy'])
+    gp_py = x['rev_py'] - np.abs(x['cogs_py'])
+    gm_cy = pick(x['rev_cy'] != 0, div(gp_cy, x['rev_cy'], x['rev_cy'] != 0), 0.0)
+    gm_py = pick(x['rev_py'] != 0, div(gp_py, x['rev_py'], x['rev_py'] != 0), 0.0)
+    gmi = pick(gm_cy != 0, div(gm_py, gm_cy, gm_cy != 0), 1.0)
+
+    # 3. AQI
+    ta_ok_cy, ta_ok_py = x['ta_cy'] != 0, x['ta_py'] != 0
+    aq_cy = pick(ta_ok_cy, 1 - div(x['ca_cy'] + x['ppe_cy'], x['ta_cy'], ta_ok_cy), 0.0)
+    aq_py = pick(ta_ok_py, 1 - div(x['ca_py'] + x['ppe_py'], x['ta_py'], ta_ok_py), 0.0)
+    aqi = pick(aq_py != 0, div(aq_cy, aq_py, aq_py != 0), 1.0)
+
+    # 4. SGI
+    sgi = pick(x['rev_py'] != 0, div(x['rev_cy'], x['rev_py'], x['rev_py'] != 0), 1.0)
+
+    # 5. DEPI (no depreciation schedule in the basic feed)
+    depi = np.ones(n)
+
+    # 6. SGAI
+    cond = (x['rev_cy'] != 0) & (x['rev_py'] != 0) & (x['sga_py'] != 0)
+    sgai = pick(cond, div(div(x['sga_cy'], x['rev_cy'], cond), div(x['sga_py'], x['rev_py'], cond), cond), 1.0)
+
+    # 7. LVGI
+    lev_cy = pick(ta_ok_cy, div(x['cl_cy'] + x['ltd_cy'], x['ta_cy'], ta_ok_cy), 0.0)
+    lev_py = pick(ta_ok_py, div(x['cl_py'] + x['ltd_py'], x['ta_py'], ta_ok_py), 0.0)
+    lvgi = pick(lev_py != 0, div(lev_cy, lev_py, lev_py != 0), 1.0)
+
+    # 8. TATA
+    tata = pick(ta_ok_cy, div(x['net_income'] - x['cash'], x['ta_cy'], ta_ok_cy), 0.0)
+
+    m_score = -4.84 + (0.92*dsri) + (0.528*gmi) + (0.404*aqi) + (0.892*sgi) + \
+              (0.115*depi) - (0.172*sgai) + (4.679*tata) - (0.327*lvgi)
+
+    out = pd.DataFrame(dict(zip(BENEISH_INDICES, [dsri, gmi, aqi, sgi, depi, sgai, lvgi, tata])))
+    out['beneish_m_score'] = m_score
+    out.loc[~valid | failed, :] = np.nan
+    return out
+
+def calculate_m_scores(tickers):
+    """Batch M-Score with per-index breakdown for many tickers, read from the statement store."""
+    tickers = list(tickers)
+    frames = STATEMENTS.load_many(tickers, FORENSIC_REPORTS)
+    rows = [beneish_inputs(frames.get((t, 'bs')), frames.get((t, 'is'))) for t in tickers]
+    out = score_beneish_batch(rows)
+    out.insert(0, 'ticker', tickers)
+    return out
+
 def run_forensic_check():
     print("--- 🕵️ FORENSIC CHECK (BENEISH M-SCORE) ---")
     
@@ -142,17 +328,15 @@ def run_forensic_check():
         print("Missing target list.")
         return
 
-    df = pd.read_csv(TARGET_FILE)
-    m_scores = []
+    df = read_artifact(TARGET_FILE)
+    tickers = df['ticker'].tolist()
+    
+    prefetch_statements(tickers)
+    breakdown = calculate_m_scores(tickers)
     
-    for ticker in tqdm(df['ticker'], desc="Auditing Books"):
-        try:
-            score = calculate_m_score(ticker)
-            m_scores.append(score)
-        except Exception as e:
-            m_scores.append(np.nan)
-            
-    df['beneish_m_score'] = m_scores
+    # Per-index breakdown alongside the score (rows are aligned with the target list)
+    for col in BENEISH_INDICES + ['beneish_m_score']:
+        df[col] = breakdown[col].to_numpy()
     
     # RISK FLAG
     # M-Score > -2.22 suggests high risk of manipulation
@@ -160,8 +344,9 @@ def run_forensic_check():
     
     df['accounting_risk'] = np.where(df['beneish_m_score'] > -2.22, 'HIGH RISK', 'SAFE')
     
-    df.to_csv(OUTPUT_FILE, index=False)
+    write_artifact(df, OUTPUT_FILE)
     print(f"\n[SUCCESS] Forensics complete. Saved to {OUTPUT_FILE}")
+    DataProvider.report_health()
     
     risky = df[df['accounting_risk'] == 'HIGH RISK']
     if not risky.empty:
@@ -170,5 +355,28 @@ def run_forensic_check():
     else:
         print("\n✅ No high-risk accounting manipulation detected in the target list.")
 
+def run_universe_audit():
+    """Audits every listed company, not just the target list."""
+    print("--- 🕵️ FORENSIC CHECK: FULL UNIVERSE ---")
+    
+    if not os.path.exists(MASTER_FILE):
+        print(f"Missing {MASTER_FILE}. Run get_master_industry_list.py first.")
+        return
+
+    tickers = read_artifact(MASTER_FILE, columns=['ticker'])['ticker'].astype(str).unique().tolist()
+    prefetch_statements(tickers)
+    
+    df = calculate_m_scores(tickers)
+    df['accounting_risk'] = np.where(df['beneish_m_score'] > -2.22, 'HIGH RISK', 'SAFE')
+    write_artifact(df, UNIVERSE_OUTPUT_FILE)
+    
+    scored = df['beneish_m_score'].notna().sum()
+    print(f"\n[SUCCESS] Audited {scored}/{len(df)} companies. Saved to {UNIVERSE_OUTPUT_FILE}")
+    DataProvider.report_health()
+    print(f"High risk: {(df['accounting_risk'] == 'HIGH RISK').sum()}")
+
 if __name__ == "__main__":
-    run_forensic_check()
\ No newline at end of file
+    if '--universe' in sys.argv:
+        run_universe_audit()
+    else:
+        run_forensic_check()
\ No newline at end of file
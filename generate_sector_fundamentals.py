@@ -2,13 +2,14 @@ import pandas as pd
 from vnstock import Screener
 import numpy as np
 import os
+from quant_starting_stocks.artifacts import read_artifact, write_artifact
 
 def generate_sector_fundamentals():
     print("--- CALCULATING SECTOR FUNDAMENTALS ---")
     
     # 1. Load the Master List
     try:
-        master_df = pd.read_csv('data/company_master_list.csv')
+        master_df = read_artifact('data/company_master_list.csv', columns=['ticker', 'industry'])
     except FileNotFoundError:
         print("❌ Error: 'data/company_master_list.csv' not found.")
         print("Please run get_master_industry_list.py first.")
@@ -77,7 +78,7 @@ def generate_sector_fundamentals():
         os.makedirs('data')
         
     output_file = 'data/sector_fundamentals.csv'
-    sector_stats.to_csv(output_file, index=False)
+    write_artifact(sector_stats, output_file)
     
     print(f"\n✅ [SUCCESS] Sector analysis complete.")
     print(f"Saved sector metrics to {output_file}")
@@ -5,6 +5,7 @@ from tqdm import tqdm
 import os
 import time
 import json
+from quant_starting_stocks.artifacts import write_artifact
 
 # Cache file to avoid getting banned by Google Translate
 TRANSLATION_CACHE_FILE = 'data/industry_translation_cache.json'
@@ -75,12 +76,12 @@ def create_master_ticker_file():
         # Map the English translations back
         master_df['industry'] = master_df['industry'].map(translation_map)
         
-        # 3. Save to CSV
+        # 3. Save (typed Parquet + CSV copy)
         if not os.path.exists('data'):
             os.makedirs('data')
             
         output_file = 'data/company_master_list.csv'
-        master_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        write_artifact(master_df, output_file, encoding='utf-8-sig')
         
         print(f"\n--- SUCCESS ---")
         print(f"Saved {len(master_df)} companies to {output_file}")
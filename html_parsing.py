@@ -0,0 +1,194 @@
+import os
+
+# --- CONFIGURATION ---
+BACKENDS = ('bs4', 'lxml', 'selectolax')
+DEFAULT_BACKEND = os.environ.get('HTML_PARSER', 'lxml')   # bs4 = the original BeautifulSoup path
+
+
+def _has_class(name):
+    """XPath test for one class token (what bs4's class_= and CSS '.name' match)."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class Bs4Parser:
+    """BeautifulSoup over the whole document (the reference the faster backends must agree with)."""
+
+    def __init__(self, features='html.parser'):
+        from bs4 import BeautifulSoup
+        self.soup = lambda html: BeautifulSoup(html, features)
+
+    def forum_threads(self, html):
+        soup = self.soup(html)
+        titles = soup.find_all('h3', class_='title')
+        if not titles:
+            titles = soup.find_all('a', class_='PreviewTooltip')
+        if not titles:
+            return None
+
+        threads = []
+        for title_tag in titles:
+            link = title_tag.find('a') if title_tag.name == 'h3' else title_tag
+            if not link:
+                continue
+            item = title_tag.find_parent('li')
+            stamps = item.find_all(class_='DateTime') if item is not None else []
+            stamp = stamps[-1] if stamps else None
+            threads.append(_thread(
+                link.get_text(strip=True), link.get('href', ''),
+                item.get('id', '') if item is not None else '',
+                item.get('class') or [] if item is not None else [],
+                stamp is not None and (stamp.get('data-time') or stamp.get('title') or stamp.get_text(strip=True))))
+        return threads
+
+    def cafef_items(self, html):
+        soup = self.soup(html)
+        container = soup.find('ul', class_='News_Title_Link')
+        items = []
+        if container:
+            for item in container.find_all('li'):
+                date_tag = item.find('span', class_='timeTitle')
+                link = item.find('a', class_='docnhanhTitle')
+                if link and date_tag:
+                    items.append((date_tag.get_text(strip=True), link.get_text(strip=True)))
+        return items
+
+
+class LxmlParser:
+    """lxml.html with XPath straight to the title, link and timestamp nodes (no soup objects)."""
+
+    def __init__(self):
+        import lxml.html
+        self.fromstring = lxml.html.fromstring
+        self._titles = f"//h3[{_has_class('title')}]"
+        self._previews = f"//a[{_has_class('PreviewTooltip')}]"
+        self._stamps = f".//*[{_has_class('DateTime')}]"
+        self._cafef_list = f"//ul[{_has_class('News_Title_Link')}]"
+        self._cafef_date = f".//span[{_has_class('timeTitle')}]"
+        self._cafef_link = f".//a[{_has_class('docnhanhTitle')}]"
+
+    def forum_threads(self, html):
+        doc = self._document(html)
+        if doc is None:
+            return None
+        titles = doc.xpath(self._titles) or doc.xpath(self._previews)
+        if not titles:
+            return None
+
+        threads = []
+        for title_tag in titles:
+            link = title_tag.find('.//a') if title_tag.tag == 'h3' else title_tag
+            if link is None:
+                continue
+            item = next(title_tag.iterancestors('li'), None)
+            stamps = item.xpath(self._stamps) if item is not None else []
+            stamp = stamps[-1] if stamps else None
+            threads.append(_thread(
+                _text(link), link.get('href', ''),
+                item.get('id', '') if item is not None else '',
+                (item.get('class') or '').split() if item is not None else [],
+                stamp is not None and (stamp.get('data-time') or stamp.get('title') or _text(stamp))))
+        return threads
+
+    def cafef_items(self, html):
+        doc = self._document(html)
+        containers = doc.xpath(self._cafef_list) if doc is not None else []
+        items = []
+        if containers:
+            for item in containers[0].iter('li'):
+                date_tag = item.xpath(self._cafef_date)
+                link = item.xpath(self._cafef_link)
+                if link and date_tag:
+                    items.append((_text(date_tag[0]), _text(link[0])))
+        return items
+
+    def _document(self, html):
+        if not html or not html.strip():
+            return None
+        try:
+            return self.fromstring(html)
+        except ValueError:   # str with an XML encoding declaration
+            return self.fromstring(html.encode('utf-8'))
+
+
+class SelectolaxParser:
+    """selectolax (Lexbor engine) with CSS selectors. Optional: pip install selectolax."""
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError:
+            raise ImportError("The 'selectolax' HTML backend needs selectolax (pip install selectolax)")
+        self.parse = LexborHTMLParser
+
+    def forum_threads(self, html):
+        tree = self.parse(html)
+        titles = tree.css('h3.title') or tree.css('a.PreviewTooltip')
+        if not titles:
+            return None
+
+        threads = []
+        for title_tag in titles:
+            link = title_tag.css_first('a') if title_tag.tag == 'h3' else title_tag
+            if link is None:
+                continue
+            item = title_tag.parent
+            while item is not None and item.tag != 'li':
+                item = item.parent
+            stamps = item.css('.DateTime') if item is not None else []
+            stamp = stamps[-1] if stamps else None
+            attrs = item.attributes if item is not None else {}
+            threads.append(_thread(
+                link.text(separator='', strip=True), link.attributes.get('href') or '',
+                attrs.get('id') or '', (attrs.get('class') or '').split(),
+                stamp is not None and (stamp.attributes.get('data-time') or stamp.attributes.get('title')
+                                       or stamp.text(separator='', strip=True))))
+        return threads
+
+    def cafef_items(self, html):
+        container = self.parse(html).css_first('ul.News_Title_Link')
+        items = []
+        if container is not None:
+            for item in container.css('li'):
+                date_tag = item.css_first('span.timeTitle')
+                link = item.css_first('a.docnhanhTitle')
+                if link is not None and date_tag is not None:
+                    items.append((date_tag.text(separator='', strip=True), link.text(separator='', strip=True)))
+        return items
+
+
+# --- HELPERS ---
+def _text(node):
+    """bs4's get_text(strip=True): every text piece stripped, then joined with nothing in between."""
+    return ''.join(s.strip() for s in node.itertext())
+
+
+def _thread(title, href, item_id, item_classes, last_activity):
+    """One listing row in the shape f319_scraper works with."""
+    if item_id.startswith('thread-'):
+        thread_id = item_id[len('thread-'):]
+    else:
+        tail = href.split('#')[0].split('?')[0].rstrip('/').rsplit('.', 1)
+        thread_id = tail[1] if len(tail) == 2 and tail[1].isdigit() else f"title:{title}"
+    return {
+        'thread_id': thread_id,
+        'title': title,
+        'last_activity': last_activity or '',
+        'sticky': 'sticky' in item_classes,
+    }
+
+
+_parsers = {}
+
+def get_parser(name=None):
+    """One of BACKENDS, built once per process."""
+    name = name or DEFAULT_BACKEND
+    if name not in _parsers:
+        if name == 'bs4':
+            _parsers[name] = Bs4Parser()
+        elif name == 'lxml':
+            _parsers[name] = LxmlParser()
+        elif name == 'selectolax':
+            _parsers[name] = SelectolaxParser()
+        else:
+            raise ValueError(f"Unknown HTML parser '{name}' (choose from {', '.join(BACKENDS)})")
+    return _parsers[name]
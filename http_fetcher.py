@@ -0,0 +1,277 @@
+import asyncio
+import json
+import random
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InsecureRequestWarning
+
+# --- CONFIGURATION ---
+warnings.simplefilter('ignore', InsecureRequestWarning)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HostPolicy:
+    """Per-host limits: parallel connections, minimum gap between request starts, timeout, retries."""
+
+    def __init__(self, concurrency=2, min_interval=0.5, timeout=15, retries=2, backoff=1.0, verify=True):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.verify = verify
+
+
+# Limits we already respected by hand (3 HSX workers, ~0.5-1s gaps), now enforced in one place
+HOST_POLICIES = {
+    'api.hsx.vn': HostPolicy(concurrency=3, min_interval=0.3, timeout=30, verify=False),
+    'cafef.vn': HostPolicy(concurrency=4, min_interval=0.25, timeout=10, verify=False),
+    'f319.com': HostPolicy(concurrency=3, min_interval=0.4, timeout=10),
+}
+DEFAULT_POLICY = HostPolicy()
+
+
+class FetchResult:
+    def __init__(self, url, status=None, text='', headers=None, elapsed=0.0, error=None):
+        self.url = url
+        self.status = status
+        self.text = text
+        self.headers = headers or {}
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.status == 200
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.ok = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.latencies = []
+        self.first_start = None
+        self.last_end = None
+
+    def summary(self):
+        lat = np.array(self.latencies) if self.latencies else np.zeros(1)
+        span = (self.last_end - self.first_start) if self.first_start is not None else 0.0
+        return {
+            'requests': self.requests,
+            'ok': self.ok,
+            'errors': self.errors,
+            'retries': self.retries,
+            'mb': self.bytes / 1e6,
+            'p50_s': float(np.percentile(lat, 50)),
+            'p95_s': float(np.percentile(lat, 95)),
+            'req_per_s': self.requests / span if span > 0 else 0.0,
+        }
+
+
+class AsyncFetcher:
+    """
+    Shared asyncio fetch layer for the scrapers.
+    Each host gets its own keep-alive connection pool, a concurrency cap, a politeness gap
+    between request starts, a timeout and retries with backoff. Blocking `requests` calls
+    run on worker threads so many hosts and pages overlap without idle sleeps.
+    """
+
+    def __init__(self, policies=None, headers=None, max_threads=32):
+        self.policies = dict(HOST_POLICIES, **(policies or {}))
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.stats = {}
+        self._sessions = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix='fetch')
+        self._lock = threading.Lock()
+        self._gates = {}   # host -> _HostGate, shared by every fetch_all() call and thread
+
+    # --- Public API ---
+    def fetch_all(self, urls, headers=None):
+        """
+        Synchronous entry point: fetches every URL concurrently, results in input order.
+        `headers` is one dict for every request, or a list with one dict (or None) per URL,
+        e.g. conditional If-None-Match / If-Modified-Since headers per page.
+        """
+        return asyncio.run(self.gather(urls, headers=headers))
+
+    def fetch_each(self, urls, callback, headers=None):
+        """
+        Like fetch_all, but callback(index, result) runs as soon as each response arrives
+        (completion order, on this thread), so callers can stream results. Returns them in input order.
+        """
+        async def one(index, url, h):
+            result = await self.fetch(url, headers=h)
+            callback(index, result)
+            return result
+
+        async def run():
+            per_url = headers if isinstance(headers, (list, tuple)) else [headers] * len(urls)
+            return await asyncio.gather(*(one(i, url, h) for i, (url, h) in enumerate(zip(urls, per_url))))
+        return asyncio.run(run())
+
+    async def gather(self, urls, headers=None):
+        per_url = headers if isinstance(headers, (list, tuple)) else [headers] * len(urls)
+        return await asyncio.gather(*(self.fetch(url, headers=h) for url, h in zip(urls, per_url)))
+
+    async def fetch(self, url, headers=None):
+        host = urlsplit(url).hostname or ''
+        policy = self.policies.get(host, DEFAULT_POLICY)
+        gate = self._gate(host, policy)
+        stats = self._host_stats(host)
+
+        await gate.acquire()
+        try:
+            result = None
+            for attempt in range(policy.retries + 1):
+                await gate.wait_turn()
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._blocking_get, host, policy, url, headers)
+                self._record(stats, result, retry=attempt > 0)
+
+                if result.error is None and result.status not in RETRY_STATUSES:
+                    break
+                if attempt < policy.retries:
+                    await asyncio.sleep(self._backoff(policy, attempt, result))
+            return result
+        finally:
+            gate.release()
+
+    def report(self, title="HTTP"):
+        for host, stats in sorted(self.stats.items()):
+            s = stats.summary()
+            print(f"  [{title}] {host}: {s['requests']} req ({s['ok']} ok, {s['errors']} err, {s['retries']} retries) | "
+                  f"{s['mb']:.2f} MB | p50 {s['p50_s']:.2f}s p95 {s['p95_s']:.2f}s | {s['req_per_s']:.1f} req/s")
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        for session in self._sessions.values():
+            session.close()
+
+    # --- Internals ---
+    def _gate(self, host, policy):
+        with self._lock:
+            if host not in self._gates:
+                self._gates[host] = _HostGate(policy.concurrency, policy.min_interval)
+            return self._gates[host]
+
+    def _session(self, host, policy):
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                # The host gate caps requests in flight across all loops, so this pool is never outgrown
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=policy.concurrency)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(self.headers)
+                self._sessions[host] = session
+            return self._sessions[host]
+
+    def _host_stats(self, host):
+        with self._lock:
+            return self.stats.setdefault(host, HostStats())
+
+    def _blocking_get(self, host, policy, url, headers):
+        session = self._session(host, policy)
+        start = time.perf_counter()
+        try:
+            response = session.get(url, headers=headers, timeout=policy.timeout, verify=policy.verify)
+            return FetchResult(url, response.status_code, response.text, response.headers,
+                               time.perf_counter() - start)
+        except Exception as e:
+            return FetchResult(url, elapsed=time.perf_counter() - start, error=e)
+
+    def _record(self, stats, result, retry):
+        now = time.perf_counter()
+        with self._lock:
+            stats.requests += 1
+            stats.retries += 1 if retry else 0
+            if result.ok:
+                stats.ok += 1
+            elif result.error is not None or (result.status or 0) >= 400:
+                stats.errors += 1
+            stats.bytes += len(result.text or '')
+            stats.latencies.append(result.elapsed)
+            if stats.first_start is None:
+                stats.first_start = now - result.elapsed
+            stats.last_end = now
+
+    @staticmethod
+    def _backoff(policy, attempt, result):
+        retry_after = result.headers.get('Retry-After') if result.headers else None
+        if retry_after and str(retry_after).isdigit():
+            return float(retry_after)
+        return policy.backoff * (2 ** attempt) + random.uniform(0, 0.5)
+
+
+class _HostGate:
+    """
+    Request slots and start spacing for one host, shared by every event loop using the fetcher
+    (asyncio primitives are bound to one loop; concurrent fetch_all() calls each run their own).
+    A freed slot is handed to the oldest waiter on whichever loop it waits. The politeness clock
+    outlives each call, so consecutive waves keep their gap too.
+    """
+
+    def __init__(self, concurrency, interval):
+        self.interval = interval
+        self._free = concurrency
+        self._next = 0.0
+        self._waiters = deque()   # (loop, future) in arrival order
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free > 0 and not self._waiters:
+                self._free -= 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)   # Otherwise the handed-over slot is released by _hand_over
+            raise
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(self._hand_over, future)
+                    return
+            self._free += 1
+
+    def _hand_over(self, future):
+        if future.done():   # Cancelled while the slot was on its way
+            self.release()
+        else:
+            future.set_result(None)
+
+    async def wait_turn(self):
+        """Spaces out request starts to one per `interval` seconds."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import os
 import sys
+from quant_starting_stocks.artifacts import read_artifact, write_artifact
 
 # --- CONFIGURATION ---
 ALPHA_FILE = 'Final_Investment_Report.csv'       # From Step 5
@@ -48,16 +49,15 @@ def merge_signals():
         print("❌ Missing input files. Make sure you ran final_ranking.py AND technical_analysis.py")
         return
 
-    alpha_df = pd.read_csv(ALPHA_FILE)
-    tech_df = pd.read_csv(TECH_FILE)
-    
-    print(f"Loaded Alpha Report ({len(alpha_df)} stocks) and Technical/Risk Report ({len(tech_df)} stocks).")
-
-    # 2. Merge
     # We strip tech_df down to just the columns we need to avoid duplicates
     cols_to_use = ['ticker', 'accounting_risk', 'beneish_m_score', 
                    'technical_signal', 'RSI_14', 'current_price', 'SMA_200']
+    alpha_df = read_artifact(ALPHA_FILE)
+    tech_df = read_artifact(TECH_FILE, columns=cols_to_use)
     
+    print(f"Loaded Alpha Report ({len(alpha_df)} stocks) and Technical/Risk Report ({len(tech_df)} stocks).")
+
+    # 2. Merge
     # Left merge onto Alpha (Rank) to preserve the order
     master_df = pd.merge(alpha_df, tech_df[cols_to_use], on='ticker', how='left')
     
@@ -93,7 +93,7 @@ def merge_signals():
     master_df = master_df[final_cols]
     
     # 5. Save
-    master_df.to_csv(OUTPUT_FILE, index=False)
+    write_artifact(master_df, OUTPUT_FILE)
     print(f"\n✅ DASHBOARD GENERATED: {OUTPUT_FILE}")
     
     # 6. Display the Winners
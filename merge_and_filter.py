@@ -1,5 +1,6 @@
 import pandas as pd
 import os
+from quant_starting_stocks.artifacts import read_artifact, write_artifact
 
 # --- CONFIGURATION ---
 TOP_N = 50            # We will select the top 50 from your 73 survivors
@@ -11,9 +12,10 @@ def merge_and_filter_targets():
     
     # 1. Load Data
     try:
-        stocks_df = pd.read_csv('data/top_quality_value_stocks.csv')
-        sector_df = pd.read_csv('data/sector_fundamentals.csv')
-        master_df = pd.read_csv('data/company_master_list.csv')
+        # Only the columns the scoring below uses
+        stocks_df = read_artifact('data/top_quality_value_stocks.csv', columns=['ticker', 'pe', 'piotroski_f_score'])
+        sector_df = read_artifact('data/sector_fundamentals.csv', columns=['industry', 'sector_pe', 'sector_roe'])
+        master_df = read_artifact('data/company_master_list.csv', columns=['ticker', 'industry'])
     except FileNotFoundError as e:
         print(f"❌ Missing file: {e}")
         return
@@ -59,7 +61,7 @@ def merge_and_filter_targets():
     output_cols = ['ticker', 'industry', 'pe', 'sector_pe', 'piotroski_f_score', 'final_conviction_score']
     
     output_file = 'data/target_list_for_scrapers.csv'
-    top_targets[output_cols].to_csv(output_file, index=False)
+    write_artifact(top_targets[output_cols], output_file)
     
     print(f"\n✅ [SUCCESS] Generated target list of {len(top_targets)} stocks.")
     print(f"Saved to {output_file}")
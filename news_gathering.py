@@ -177,7 +177,7 @@
 #         pass 
 #     return all_articles
 
-# def run_data_gathering():
+# def run_data_gathering(all_tickers=False):
 #     INPUT_FILE = 'top_value_stocks.csv'
 #     OUTPUT_FILE = 'data/raw_news_data.csv'
 
@@ -253,17 +253,22 @@
 #     run_data_gathering()
 
 import pandas as pd
-import requests
 import os
+import sys
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 import warnings
 from urllib3.exceptions import InsecureRequestWarning
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 from vnstock import Company 
-import random 
-import concurrent.futures
+from http_fetcher import AsyncFetcher
+from html_parsing import get_parser
+from ticker_extractor import TickerExtractor
+from news_store import NewsStore, normalize_dates
+from quant_starting_stocks.rate_limiter import VNSTOCK
+from quant_starting_stocks.artifacts import read_artifact
 
 # --- 1. SETUP ---
 warnings.simplefilter('ignore', InsecureRequestWarning)
@@ -272,142 +277,293 @@ http_headers = {
     'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8' 
 }
 
-# --- 2. HELPER: SMART DATE CONVERSION ---
-def clean_date(raw_date):
-    """Converts timestamp (seconds OR ms) or string to DD/MM/YYYY"""
-    if pd.isna(raw_date):
-        return 'N/A'
-    
+# Shared fetch layer: per-host pools, concurrency/politeness limits, retries (see http_fetcher.py).
+# HSX gets its own instance so it can run on its own thread next to CafeF.
+FETCHER = AsyncFetcher(headers=http_headers)
+HSX_FETCHER = AsyncFetcher(headers=http_headers)
+VNSTOCK_WORKERS = VNSTOCK.max_concurrency   # Threads only; the shared vnstock limiter sets the in-flight cap
+
+# Every article ever gathered, deduplicated, with per-source / per-ticker watermarks (see news_store.py)
+STORE = NewsStore()
+NEWS_DAYS = 90          # HSX look-back on the first run, and the window exported for the sentiment stage
+REFRESH_HOURS = 20      # CafeF / vnstock only return their latest items: ask each ticker at most once per run-day
+HSX_SCAN = 'HOSE_API_SCAN'   # Per-ticker coverage: the HSX feed has been scanned without gaps up to this time
+HSX_PAGE_SIZE = 50
+HSX_WINDOW_DAYS = 15    # The HSX date range is split into windows that are paged in parallel
+HSX_WAVE = 3            # Pages per window per round while a window's size is unknown
+HSX_MAX_PAGES = 100     # Safety cap per window
+
+# --- 2. SCRAPER FUNCTIONS ---
+
+def hsx_page_url(page, start_date_str, end_date_str):
+    return f"https://api.hsx.vn/n/api/v1/1/news/securitiesType/1?pageIndex={page}&pageSize={HSX_PAGE_SIZE}&startDate={start_date_str}&endDate={end_date_str}"
+
+def parse_hsx_payload(result):
+    """(articles, total count or None) from one HSX API response; (None, None) if the request failed."""
+    if not result.ok:
+        return None, None
     try:
-        str_date = str(raw_date)
-        if str_date.isdigit():
-            ts = int(str_date)
-            # If > 1 trillion, it's ms. Else seconds.
-            if ts > 1000000000000: 
-                ts = ts / 1000 
-            
-            dt_obj = datetime.fromtimestamp(ts)
-            return dt_obj.strftime('%d/%m/%Y')
-        return str_date
+        data = result.json().get('data', {}) or {}
     except Exception:
-        return str(raw_date)
-
-# --- 3. SCRAPER FUNCTIONS ---
-
-def fetch_hsx_page(session, page, start_date_str, end_date_str):
-    """Helper function to fetch a single page safely."""
+        return None, None
+    total = next((data[k] for k in ('total', 'totalCount', 'totalRecord', 'totalItems') if k in data), None)
     try:
-        time.sleep(random.uniform(0.5, 1.5))
-        api_url = f"https://api.hsx.vn/n/api/v1/1/news/securitiesType/1?pageIndex={page}&pageSize=50&startDate={start_date_str}&endDate={end_date_str}"
-        response = session.get(api_url, headers=http_headers, verify=False, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data.get('data', {}).get('list', [])
-    except Exception:
-        pass
-    return []
-
-def get_hsx_news_general(target_tickers):
-    """Fetches HOSE news using GENTLE PARALLEL PROCESSING."""
+        total = int(total) if total is not None else None
+    except (TypeError, ValueError):
+        total = None
+    return data.get('list', []) or [], total
+
+def plan_hsx_windows(start_date, end_date, days=HSX_WINDOW_DAYS):
+    """Splits [start_date, end_date] into non-overlapping day ranges of `days`, newest first."""
+    windows = []
+    end = end_date
+    while end.date() >= start_date.date():
+        start = max(start_date, end - timedelta(days=days - 1))
+        windows.append({'start': start.strftime('%Y-%m-%d'), 'end': end.strftime('%Y-%m-%d'),
+                        'next': 1, 'last': None, 'done': False, 'failed': False})
+        end = start - timedelta(days=1)
+    return windows
+
+def next_hsx_pages(window):
+    """Pages to request for one window this round: the probe, everything left once the total is known, else a wave."""
+    if window['done']:
+        return []
+    if window['last'] is not None:
+        last = window['last']
+    elif window['next'] == 1:
+        last = 1
+    else:
+        last = window['next'] + HSX_WAVE - 1
+    pages = list(range(window['next'], min(last, HSX_MAX_PAGES) + 1))
+    window['next'] = (pages[-1] if pages else last) + 1
+    if not pages:
+        window['done'] = True
+    return pages
+
+def hsx_articles(page_articles, extractor):
+    """Output rows for the HSX articles whose title starts with a target ticker."""
+    rows = []
+    for article in page_articles:
+        original_title = article.get('title', '')
+        # Exchange titles are "HPG: ...". Matching anywhere (or ignoring case) turns words into tickers
+        ticker = extractor.leading(original_title)
+        if ticker is not None:
+            rows.append({
+                'ticker': ticker,
+                'date': article.get('postedDate'),   # Raw; normalized column-wise by the store
+                'news_title': original_title,
+                'source': 'HOSE_API'
+            })
+    return rows
+
+def get_hsx_news_general(target_tickers, on_page=None, since=None, on_plan=None):
+    """
+    Fetches HOSE news through its own async fetcher (HSX host limits apply).
+    The date range is split into windows fetched side by side. Each window starts with a one-page
+    probe; if it reports a total, the remaining pages go out together, otherwise in waves. A window
+    stops on a short page, at its total, or at news older than `since` (see hsx_resume_point).
+    on_page(rows), if given, receives each page's relevant articles as soon as it arrives;
+    on_plan(n) is told how many pages each round adds.
+    Afterwards every target ticker is marked as covered up to the newest article, but never past
+    the start of a window that lost a page, so the next run asks for that window again.
+    """
     filtered_articles = []
     print(f"Fetching general HOSE news stream (Safe Parallel Scan)...")
     
     start_time = time.time()
-    total_found = 0
     
     end_date = datetime.now()
-    start_date = end_date - timedelta(days=90)
+    start_date = end_date - timedelta(days=NEWS_DAYS)
+    if since is not None:
+        # The API filters by day: re-ask the watermark's day, the store drops what we already have
+        start_date = max(start_date, since.to_pydatetime().replace(hour=0, minute=0, second=0, microsecond=0))
     start_str = start_date.strftime('%Y-%m-%d')
     end_str = end_date.strftime('%Y-%m-%d')
     
-    # Create a SET for faster lookup
-    target_set = set(target_tickers)
-
-    with requests.Session() as session:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            future_to_page = {
-                executor.submit(fetch_hsx_page, session, page, start_str, end_str): page 
-                for page in range(1, 101)
-            }
-            
-            pbar = tqdm(concurrent.futures.as_completed(future_to_page), total=100, desc="Scanning HSX Pages")
-            
-            for future in pbar:
-                page_articles = future.result()
-                if not page_articles: continue
-                    
-                for article in page_articles:
-                    original_title = article.get('title', '')
-                    extracted_ticker = "UNKNOWN"
-                    if ':' in original_title:
-                        extracted_ticker = original_title.split(':')[0].strip()
-                    
-                    if extracted_ticker in target_set:
-                        filtered_articles.append({
-                            'ticker': extracted_ticker,
-                            'date': clean_date(article.get('postedDate')),
-                            'news_title': original_title,
-                            'source': 'HOSE_API'
-                        })
-                        total_found += 1
-                        pbar.set_description(f"Scanning HSX Pages (Found {total_found} relevant)")
+    # Built once; finds every target ticker in a title in one pass
+    extractor = TickerExtractor(target_tickers)
+    posted = []
+    windows = plan_hsx_windows(start_date, end_date)
+    counts = {'requests': 0, 'rounds': 0, 'failed': 0}
+
+    while True:
+        batch = [(w, page) for w in windows for page in next_hsx_pages(w)]
+        if not batch:
+            break
+        counts['requests'] += len(batch)
+        counts['rounds'] += 1
+        if on_plan is not None:
+            on_plan(len(batch))
+
+        def handle(index, result):
+            window, page = batch[index]
+            page_articles, total = parse_hsx_payload(result)
+            if page_articles is None:
+                counts['failed'] += 1   # Already retried by the fetcher; the rest of the window still runs
+                window['failed'] = True
+                page_articles = []
+            else:
+                if page == 1 and total is not None:
+                    window['last'] = min(HSX_MAX_PAGES, -(-total // HSX_PAGE_SIZE))
+                if len(page_articles) < HSX_PAGE_SIZE:
+                    window['done'] = True   # Short or empty page: this window is exhausted
+                times = normalize_dates([a.get('postedDate') for a in page_articles])
+                if since is not None and times.notna().any() and times.min() < since:
+                    window['done'] = True   # Newest first: everything after this page is already stored
+            posted.extend(a.get('postedDate') for a in page_articles)
+            rows = hsx_articles(page_articles, extractor)
+            filtered_articles.extend(rows)
+            if on_page is not None:
+                on_page(rows)
+
+        HSX_FETCHER.fetch_each([hsx_page_url(page, w['start'], w['end']) for w, page in batch], handle)
+        for w in windows:
+            if w['last'] is not None and w['next'] > w['last']:
+                w['done'] = True
+
+    # Coverage mark per target ticker: newest article in the stream, held back to a failed window's start
+    covered = normalize_dates(posted).max() if posted else None
+    failed_starts = [pd.Timestamp(w['start']) for w in windows if w['failed']]
+    if covered is not None and not pd.isna(covered):
+        if failed_starts:
+            covered = min(covered, min(failed_starts))
+        STORE.mark_scanned(HSX_SCAN, target_tickers, covered)
 
     end_time = time.time()
     duration = end_time - start_time
-    print(f"  [HSX] Finished in {duration:.2f} seconds.")
+    print(f"  [HSX] {start_str} to {end_str}: {counts['requests']} requests in {counts['rounds']} rounds over "
+          f"{len(windows)} windows ({counts['failed']} failed), finished in {duration:.2f} seconds.")
     print(f"  [HSX] Total relevant articles found: {len(filtered_articles)}")
     return filtered_articles
 
-def get_cafef_news(ticker):
-    """Scrapes HNX/UPCoM news from CafeF Ajax API."""
+def cafef_url(ticker):
+    return f"https://cafef.vn/du-lieu//Ajax/Events_RelatedNews_New.aspx?symbol={ticker}&floorID=0&configID=0&PageIndex=1&PageSize=10&Type=2"
+
+def parse_cafef_news(ticker, html):
+    """Extracts (date, title) items from a CafeF related-news fragment."""
     all_articles = []
     try:
-        api_url = f"https://cafef.vn/du-lieu//Ajax/Events_RelatedNews_New.aspx?symbol={ticker}&floorID=0&configID=0&PageIndex=1&PageSize=10&Type=2"
-        response = requests.get(api_url, headers=http_headers, verify=False, timeout=10)
-        
-        soup = BeautifulSoup(response.text, 'lxml')
-        news_list_container = soup.find('ul', class_='News_Title_Link')
-        
-        if news_list_container:
-            news_items = news_list_container.find_all('li')
-            for item in news_items:
-                date_tag = item.find('span', class_='timeTitle')
-                link = item.find('a', class_='docnhanhTitle')
-                if link and date_tag:
-                    all_articles.append({
-                        'ticker': ticker,
-                        'date': date_tag.get_text(strip=True),
-                        'news_title': link.get_text(strip=True),
-                        'source': 'CAFEF_AJAX'
-                    })
-        time.sleep(0.5)
+        for date, title in get_parser().cafef_items(html):
+            all_articles.append({
+                'ticker': ticker,
+                'date': date,
+                'news_title': title,
+                'source': 'CAFEF_AJAX'
+            })
     except Exception:
         pass 
     return all_articles
 
+def get_cafef_news_batch(tickers, on_ticker=None):
+    """
+    Scrapes HNX/UPCoM news from CafeF for many tickers concurrently. Returns {ticker: articles}.
+    on_ticker(ticker, articles), if given, runs as each response arrives.
+    """
+    news = {}
+
+    def handle(index, result):
+        ticker = tickers[index]
+        news[ticker] = parse_cafef_news(ticker, result.text) if result.text else []
+        if result.ok:
+            STORE.mark_run('CAFEF_AJAX', ticker)
+        if on_ticker is not None:
+            on_ticker(ticker, news[ticker])
+
+    FETCHER.fetch_each([cafef_url(t) for t in tickers], handle)
+    return {t: news[t] for t in tickers}
+
+def fetch_vnstock_news(ticker):
+    """News for one ticker from the vnstock library (TCBS). Errors are raised, so the limiter sees 429s."""
+    news_df = VNSTOCK.call(Company(symbol=ticker).news, page=1, page_size=10)
+    all_articles = []
+    if news_df is not None and not news_df.empty:
+        for index, row in news_df.iterrows():
+            original_title = row.get('news_title', row.get('title', 'N/A'))
+            all_articles.append({
+                'ticker': ticker,
+                'date': row.get('public_date'),   # Raw epoch ms; normalized column-wise by the store
+                'news_title': original_title,
+                'source': 'VNSTOCK_TCBS'
+            })
+    STORE.mark_run('VNSTOCK_TCBS', ticker)
+    return all_articles
+
 def get_vnstock_news(ticker):
     """Scrapes news using the vnstock library."""
-    all_articles = []
     try:
-        company_news = Company(symbol=ticker)
-        news_df = company_news.news(page=1, page_size=10) 
-
-        if not news_df.empty:
-            for index, row in news_df.iterrows():
-                formatted_date = clean_date(row.get('public_date'))
-                original_title = row.get('news_title', row.get('title', 'N/A'))
-                all_articles.append({
-                    'ticker': ticker,
-                    'date': formatted_date, 
-                    'news_title': original_title,
-                    'source': 'VNSTOCK_TCBS'
-                })
+        return fetch_vnstock_news(ticker)
     except Exception:
-        pass 
-    return all_articles
-
-def run_data_gathering():
+        return []
+
+# --- 3. SCHEDULER: every source on its own pool, results streamed into the store ---
+
+class NewsSink:
+    """
+    Adds articles to the news store as sources deliver them (thread-safe), so a long or
+    interrupted run keeps everything fetched so far. One progress bar for all sources.
+    """
+
+    def __init__(self, store, total):
+        self.store = store
+        self.counts = {}
+        self.new = {}
+        self._lock = threading.Lock()
+        self._pbar = tqdm(total=total, desc="Fetching news")
+
+    def expect(self, n):
+        """More work was scheduled (sources that plan as they go, like HSX paging)."""
+        with self._lock:
+            self._pbar.total += n
+            self._pbar.refresh()
+
+    def write(self, source, articles, done=1):
+        new = self.store.add(articles) if articles else 0
+        with self._lock:
+            self.counts[source] = self.counts.get(source, 0) + len(articles)
+            self.new[source] = self.new.get(source, 0) + new
+            self._pbar.update(done)
+            self._pbar.set_postfix(self.new)
+
+    def close(self):
+        self._pbar.close()
+
+def run_sources(sources):
+    """
+    Runs {name: fn} concurrently, one thread per source. Each fn brings its own bounded pool and
+    rate limit and writes to the sink itself; one failing source does not stop the others.
+    """
+    with ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='source') as pool:
+        futures = {pool.submit(fn): name for name, fn in sources.items()}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                tqdm.write(f"  [{futures[future]}] Source failed: {e}")
+
+def hsx_resume_point(tickers):
+    """
+    Where the HSX scan can start: the oldest coverage mark among `tickers`, or None (full NEWS_DAYS
+    look-back) if any of them has never been covered, e.g. a ticker new to the target list.
+    """
+    marks = STORE.watermarks(HSX_SCAN)
+    if not tickers or any(str(t).upper() not in marks for t in tickers):
+        return None
+    return min(marks[str(t).upper()] for t in tickers)
+
+def due_tickers(source, tickers):
+    """Tickers whose latest-items source was not asked within REFRESH_HOURS."""
+    last_runs = STORE.last_runs(source)
+    cutoff = time.time() - REFRESH_HOURS * 3600
+    return [t for t in tickers if last_runs.get(str(t).upper(), 0) < cutoff]
+
+def stream_vnstock_news(tickers, sink):
+    """vnstock/TCBS news on VNSTOCK_WORKERS threads; the shared limiter paces the requests."""
+    with ThreadPoolExecutor(max_workers=VNSTOCK_WORKERS, thread_name_prefix='vnstock') as pool:
+        futures = {pool.submit(get_vnstock_news, t): t for t in tickers}
+        for future in as_completed(futures):
+            sink.write('Vnstock', future.result())
+
+def run_data_gathering(all_tickers=False):
     # --- CHANGED: Point to the new Target List ---
     TARGET_FILE = 'data/target_list_for_scrapers.csv'
     # We use the old file just to look up the 'Exchange' info (HOSE vs HNX)
@@ -420,12 +576,12 @@ def run_data_gathering():
             return
 
         print(f"Loading targets from {TARGET_FILE}...")
-        targets_df = pd.read_csv(TARGET_FILE)
+        targets_df = read_artifact(TARGET_FILE)
         
         # --- RESTORE EXCHANGE INFO ---
         # The target list might check missing 'exchange', so we merge with the metadata file
         if os.path.exists(METADATA_FILE):
-            meta_df = pd.read_csv(METADATA_FILE)
+            meta_df = read_artifact(METADATA_FILE)
             # Keep only ticker and exchange from metadata
             if 'exchange' in meta_df.columns:
                 targets_df = pd.merge(targets_df, meta_df[['ticker', 'exchange']], on='ticker', how='left')
@@ -434,65 +590,66 @@ def run_data_gathering():
         if 'exchange' not in targets_df.columns:
             targets_df['exchange'] = 'Unknown'
 
-        # Get list of all tickers for HSX filtering
+        # Get list of all tickers for HSX filtering (the whole market with --all-tickers;
+        # CafeF and vnstock stay per-target, they cost one request per ticker)
         all_target_tickers = targets_df['ticker'].tolist()
+        universe = TickerExtractor.from_universe() if all_tickers else None
+        if universe is not None:
+            all_target_tickers = sorted(universe.tickers)
+            print(f"Tracking all {len(all_target_tickers)} listed tickers in the HSX feed.")
 
         print(f"Loaded {len(targets_df)} targets. Starting news scrape...")
-        
-        master_news_list = []
-
-        # --- 1. GET HOSE NEWS (Bulk Fetch) ---
-        # Only run this once. It scans the whole HSX news feed and picks out ANY of our tickers.
-        hsx_news = get_hsx_news_general(all_target_tickers)
-        master_news_list.extend(hsx_news)
-        
-        # --- 2. LOOP FOR CAFEF & VNSTOCK ---
-        print("Starting ticker-specific scrape (CafeF & Vnstock)...")
-        
-        cafef_count = 0
-        vnstock_count = 0
-        
-        for index, row in tqdm(targets_df.iterrows(), total=targets_df.shape[0]):
-            ticker = row['ticker']
-            exchange = row['exchange']
-            
-            # Smart Logic: Only scrape CafeF if it's NOT on HOSE (HSX covers HOSE)
-            # If exchange is unknown, we scrape CafeF just to be safe.
-            if exchange in ['HNX', 'UPCOM', 'Unknown']:
-                new_cafef = get_cafef_news(ticker)
-                master_news_list.extend(new_cafef)
-                cafef_count += len(new_cafef)
-            
-            # VNSTOCK (Scrape for everyone as a backup/second source)
-            new_vnstock = get_vnstock_news(ticker)
-            master_news_list.extend(new_vnstock)
-            vnstock_count += len(new_vnstock)
-            
-            time.sleep(1.0) 
-            
-        print(f"\n[SUMMARY] HSX Articles: {len(hsx_news)} | CafeF Articles: {cafef_count} | Vnstock Articles: {vnstock_count}")
 
-        if not master_news_list:
+        # Smart Logic: Only scrape CafeF if it's NOT on HOSE (HSX covers HOSE)
+        # If exchange is unknown, we scrape CafeF just to be safe.
+        cafef_tickers = targets_df.loc[targets_df['exchange'].isin(['HNX', 'UPCOM', 'Unknown']), 'ticker'].tolist()
+        # VNSTOCK (Scrape for everyone as a backup/second source)
+        vnstock_tickers = targets_df['ticker'].tolist()
+
+        # --- DELTAS ONLY ---
+        # HSX is asked from the oldest per-ticker coverage mark on; CafeF/vnstock have no "since" parameter, so
+        # tickers asked within REFRESH_HOURS are skipped and the store drops repeated items.
+        hsx_since = hsx_resume_point(all_target_tickers)
+        cafef_due = due_tickers('CAFEF_AJAX', cafef_tickers)
+        vnstock_due = due_tickers('VNSTOCK_TCBS', vnstock_tickers)
+        print(f"HSX since: {hsx_since.date() if hsx_since is not None else f'{NEWS_DAYS} days back'} | "
+              f"CafeF due: {len(cafef_due)}/{len(cafef_tickers)} | Vnstock due: {len(vnstock_due)}/{len(vnstock_tickers)}")
+
+        # --- ALL SOURCES AT ONCE ---
+        # HSX pages, CafeF fragments and vnstock calls interleave, each under its own limits,
+        # and every result is added to the store as soon as it arrives.
+        start_time = time.time()
+        sink = NewsSink(STORE, total=len(cafef_due) + len(vnstock_due))   # HSX adds its pages as it plans them
+        try:
+            run_sources({
+                'HSX': lambda: get_hsx_news_general(all_target_tickers, since=hsx_since, on_plan=sink.expect,
+                                                    on_page=lambda rows: sink.write('HSX', rows)),
+                'CafeF': lambda: get_cafef_news_batch(cafef_due, on_ticker=lambda t, rows: sink.write('CafeF', rows)),
+                'Vnstock': lambda: stream_vnstock_news(vnstock_due, sink),
+            })
+        finally:
+            sink.close()
+
+        counts, new = sink.counts, sink.new
+        print(f"\n[SUMMARY] HSX Articles: {counts.get('HSX', 0)} ({new.get('HSX', 0)} new) | "
+              f"CafeF Articles: {counts.get('CafeF', 0)} ({new.get('CafeF', 0)} new) | "
+              f"Vnstock Articles: {counts.get('Vnstock', 0)} ({new.get('Vnstock', 0)} new) | {time.time() - start_time:.1f}s")
+        HSX_FETCHER.report("HSX")
+        FETCHER.report("CafeF")
+        VNSTOCK.report()
+        STORE.report()
+
+        # The sentiment stage reads the last NEWS_DAYS of the store (deduplicated, newest first)
+        saved = STORE.export(OUTPUT_FILE, days=NEWS_DAYS)
+        if not saved:
             print("\nFATAL: No news was found.")
             return
-
-        # Clean up duplicates
-        news_df = pd.DataFrame(master_news_list)
-        before_dedupe = len(news_df)
-        news_df = news_df.drop_duplicates(subset=['ticker', 'news_title'])
-        after_dedupe = len(news_df)
-        
-        if not os.path.exists('data'):
-            os.makedirs('data')
-            
-        news_df.to_csv(OUTPUT_FILE, index=False, encoding='utf-8-sig')
         
         print(f"\n--- SUCCESS ---")
-        print(f"Dropped {before_dedupe - after_dedupe} duplicates.")
-        print(f"Saved {after_dedupe} unique news items to {OUTPUT_FILE}")
+        print(f"Saved {saved} unique news items to {OUTPUT_FILE}")
 
     except Exception as e:
         print(f"An error occurred: {e}")
 
 if __name__ == "__main__":
-    run_data_gathering()
\ No newline at end of file
+    run_data_gathering(all_tickers='--all-tickers' in sys.argv)
@@ -0,0 +1,180 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import pandas as pd
+from sentiment_cache import normalize_text
+from quant_starting_stocks.artifacts import write_artifact
+
+# --- CONFIGURATION ---
+STORE_FILE = 'data/news_store.sqlite'
+LOCAL_TZ = 'Asia/Ho_Chi_Minh'   # Epoch timestamps from HSX / vnstock are shown in exchange time
+FEED = '*'                      # Watermark "ticker" for whole-feed sources (the HSX news stream)
+NEWS_COLUMNS = ['ticker', 'date', 'news_title', 'source']
+
+
+def article_key(ticker, title, source):
+    """Uniqueness key: the same headline from the same source about the same ticker is stored once."""
+    text = f"{str(ticker).upper()}|{normalize_text(title).casefold()}|{source}"
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def normalize_dates(values):
+    """
+    Column-wise date parsing for every source: epoch seconds (HSX), epoch milliseconds
+    (vnstock), 'DD/MM/YYYY[ HH:MM]' strings (CafeF) or ISO dates -> naive local datetimes (NaT if unknown).
+    """
+    raw = pd.Series(values, dtype=object).reset_index(drop=True)
+    numbers = pd.to_numeric(raw, errors='coerce')
+    seconds = numbers.where(numbers <= 1e12, numbers / 1000)   # > 1 trillion = milliseconds
+    out = pd.to_datetime(seconds, unit='s', errors='coerce', utc=True).dt.tz_convert(LOCAL_TZ).dt.tz_localize(None)
+
+    text = raw[numbers.isna()].astype(str).str.strip()
+    if not text.empty:
+        parsed = pd.to_datetime(text, format='%d/%m/%Y %H:%M', errors='coerce')
+        parsed = parsed.fillna(pd.to_datetime(text.str[:10], format='%d/%m/%Y', errors='coerce'))
+        parsed = parsed.fillna(pd.to_datetime(text.str[:10], format='%Y-%m-%d', errors='coerce'))
+        out = out.fillna(parsed)   # Aligned on the index: only the non-numeric rows are filled
+    return out
+
+
+class NewsStore:
+    """
+    Append-only SQLite store for gathered news.
+    - articles: one row per article_key (INSERT OR IGNORE), with the normalized publish time
+    - watermarks: (source, ticker) -> newest publish time stored and when the source was last asked,
+      so a run can request only what is newer
+    Rows written in a run are counted, and the CSV the sentiment stage reads is exported from here.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self.stats = {'received': 0, 'new': 0}
+        self._conn = None
+        self._lock = threading.Lock()
+
+    # --- Writes ---
+    def add(self, articles):
+        """articles: rows with ticker, date (raw), news_title, source. Returns how many were new."""
+        df = pd.DataFrame(articles, columns=NEWS_COLUMNS)
+        if df.empty:
+            return 0
+        df['published'] = normalize_dates(df['date']).to_numpy()
+        df['key'] = [article_key(t, n, s) for t, n, s in zip(df['ticker'], df['news_title'], df['source'])]
+        df = df.drop_duplicates('key')
+        now = time.time()
+        rows = list(zip(df['key'], df['ticker'].astype(str).str.upper(), df['source'],
+                        _iso(df['published']), df['news_title'].astype(str), [now] * len(df)))
+
+        with self._lock:
+            db = self._db()
+            before = db.total_changes
+            db.executemany("INSERT OR IGNORE INTO articles (key, ticker, source, published, news_title, first_seen) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", rows)
+            new = db.total_changes - before
+            # Newest item per (source, ticker); watermarks only move forward
+            newest = df.dropna(subset=['published']).groupby(['source', 'ticker'])['published'].max()
+            db.executemany("""INSERT INTO watermarks (source, ticker, published, last_run) VALUES (?, ?, ?, ?)
+                              ON CONFLICT (source, ticker) DO UPDATE SET
+                              published = MAX(COALESCE(published, ''), excluded.published), last_run = excluded.last_run""",
+                           [(s, str(t).upper(), p, now) for (s, t), p in zip(newest.index, _iso(newest))])
+            db.commit()
+            self.stats['received'] += len(articles)
+            self.stats['new'] += new
+        return new
+
+    def mark_run(self, source, ticker=FEED, published=None):
+        """Records that a source was asked (even if it returned nothing), optionally with a watermark."""
+        with self._lock:
+            db = self._db()
+            db.execute("""INSERT INTO watermarks (source, ticker, published, last_run) VALUES (?, ?, ?, ?)
+                          ON CONFLICT (source, ticker) DO UPDATE SET
+                          published = MAX(COALESCE(published, ''), COALESCE(excluded.published, '')),
+                          last_run = excluded.last_run""",
+                       (source, str(ticker).upper(), _iso_one(published), time.time()))
+            db.commit()
+
+    def mark_scanned(self, source, tickers, published):
+        """mark_run for many tickers in one transaction (coverage marks after a feed scan)."""
+        now, stamp = time.time(), _iso_one(published)
+        with self._lock:
+            db = self._db()
+            db.executemany("""INSERT INTO watermarks (source, ticker, published, last_run) VALUES (?, ?, ?, ?)
+                              ON CONFLICT (source, ticker) DO UPDATE SET
+                              published = MAX(COALESCE(published, ''), COALESCE(excluded.published, '')),
+                              last_run = excluded.last_run""",
+                           [(source, t, stamp, now) for t in dict.fromkeys(str(t).upper() for t in tickers)])
+            db.commit()
+
+    # --- Lookups ---
+    def watermark(self, source, ticker=FEED):
+        """Newest publish time seen for (source, ticker), or None."""
+        return self.watermarks(source).get(str(ticker).upper())
+
+    def watermarks(self, source):
+        """{ticker: newest publish time} for one source."""
+        with self._lock:
+            rows = self._db().execute("SELECT ticker, published FROM watermarks WHERE source = ? AND published != ''",
+                                      (source,)).fetchall()
+        return {t: pd.Timestamp(p) for t, p in rows if p}
+
+    def last_runs(self, source):
+        """{ticker: unix time the source was last asked about it}."""
+        with self._lock:
+            return dict(self._db().execute("SELECT ticker, last_run FROM watermarks WHERE source = ?", (source,)).fetchall())
+
+    def export(self, path, days=90):
+        """
+        Writes the sentiment stage's CSV (ticker, date DD/MM/YYYY, news_title, source), newest first,
+        for the last `days` days. Returns the number of rows written.
+        """
+        since = (pd.Timestamp.now() - pd.Timedelta(days=days)).strftime('%Y-%m-%d') if days else ''
+        with self._lock:
+            df = pd.read_sql_query("SELECT ticker, published, news_title, source FROM articles "
+                                   "WHERE published >= ? OR published IS NULL ORDER BY published DESC, first_seen DESC",
+                                   self._db(), params=(since,))
+        df['date'] = pd.to_datetime(df.pop('published'), errors='coerce').dt.strftime('%d/%m/%Y').fillna('N/A')
+        df = df.drop_duplicates(subset=['ticker', 'news_title'])   # Same headline from two sources: keep one
+        write_artifact(df[NEWS_COLUMNS], path, encoding='utf-8-sig')
+        return len(df)
+
+    def report(self, title="News store"):
+        with self._lock:
+            total = self._db().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        s = self.stats
+        print(f"  [{title}] {s['new']} new of {s['received']} received | {total} articles stored")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- Internals ---
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS articles (
+                key TEXT PRIMARY KEY, ticker TEXT, source TEXT, published TEXT, news_title TEXT, first_seen REAL)""")
+            conn.execute("CREATE INDEX IF NOT EXISTS articles_published ON articles (published)")
+            conn.execute("""CREATE TABLE IF NOT EXISTS watermarks (
+                source TEXT, ticker TEXT, published TEXT, last_run REAL, PRIMARY KEY (source, ticker))""")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+
+# --- HELPERS ---
+def _iso(series):
+    """Datetimes -> sortable 'YYYY-MM-DD HH:MM:SS' strings (None for NaT)."""
+    text = pd.Series(series).dt.strftime('%Y-%m-%d %H:%M:%S')
+    return [None if pd.isna(v) else v for v in text.to_numpy(dtype=object)]
+
+
+def _iso_one(value):
+    if value is None or pd.isna(value):
+        return None
+    return pd.Timestamp(value).strftime('%Y-%m-%d %H:%M:%S')
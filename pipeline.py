@@ -0,0 +1,315 @@
+import os
+import ast
+import sys
+import json
+import time
+import hashlib
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# --- CONFIGURATION ---
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = 'data/pipeline_state.json'
+LOG_DIR = 'data/logs'
+MAX_WORKERS = int(os.environ.get('PIPELINE_WORKERS', 4))   # vnstock calls stay capped by the shared rate limiter
+
+
+class Stage:
+    """
+    One script in the pipeline and the files that link it to the others.
+    - inputs / outputs: paths relative to the repo root; a stage depends on whichever stage outputs its inputs
+    - refresh_hours: for stages that pull live data, rerun once the last run is this old even if nothing
+      local changed (None = rerun only when inputs or code change)
+    """
+
+    def __init__(self, name, script, inputs=(), outputs=(), args=(), refresh_hours=None):
+        self.name = name
+        self.script = script
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.args = list(args)
+        self.refresh_hours = refresh_hours
+
+    def __repr__(self):
+        return f"Stage({self.name})"
+
+
+# Step order of the manual run, now with the file links spelled out
+STAGES = [
+    Stage('master_list', 'get_master_industry_list.py',
+          outputs=['data/company_master_list.csv'], refresh_hours=24 * 7),
+    Stage('sector_fundamentals', 'generate_sector_fundamentals.py',
+          inputs=['data/company_master_list.csv'],
+          outputs=['data/sector_fundamentals.csv'], refresh_hours=24),
+    Stage('top_value', 'quant_starting_stocks/generate_top_value_stocks.py',
+          outputs=['data/top_quality_value_stocks.csv'], refresh_hours=24),
+    Stage('merge_and_filter', 'merge_and_filter.py',
+          inputs=['data/top_quality_value_stocks.csv', 'data/sector_fundamentals.csv', 'data/company_master_list.csv'],
+          outputs=['data/target_list_for_scrapers.csv']),
+    Stage('news', 'news_gathering.py',
+          inputs=['data/target_list_for_scrapers.csv', 'data/top_quality_value_stocks.csv'],
+          outputs=['data/raw_news_data.csv'], refresh_hours=20),
+    Stage('f319', 'f319_scraper.py',
+          inputs=['data/target_list_for_scrapers.csv'],
+          outputs=['data/f319_smart_filtered.csv'], refresh_hours=20),
+    Stage('sentiment', 'sentiment_engine.py',
+          inputs=['data/raw_news_data.csv', 'data/f319_smart_filtered.csv'],
+          outputs=['data/processed_sentiment.csv']),
+    Stage('final_ranking', 'final_ranking.py',
+          inputs=['data/target_list_for_scrapers.csv', 'data/processed_sentiment.csv'],
+          outputs=['Final_Investment_Report.csv']),
+    Stage('forensics', 'forensic_check.py',
+          inputs=['data/target_list_for_scrapers.csv'],
+          outputs=['data/target_list_with_forensics.csv'], refresh_hours=24),
+    Stage('technicals', 'technical_analysis.py',
+          inputs=['data/target_list_with_forensics.csv'],
+          outputs=['data/final_target_list.csv'], refresh_hours=20),
+    Stage('merge_all_signals', 'merge_all_signals.py',
+          inputs=['Final_Investment_Report.csv', 'data/final_target_list.csv'],
+          outputs=['MASTER_INVESTMENT_DASHBOARD.csv']),
+]
+
+
+# --- FINGERPRINTS ---
+def file_digest(path):
+    """sha1 of a file's bytes, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def code_files(script, root=ROOT):
+    """The script plus every repo module it imports, directly or not (its 'code version')."""
+    found, todo = set(), [os.path.join(root, script)]
+    while todo:
+        path = todo.pop()
+        if path in found or not os.path.exists(path):
+            continue
+        found.add(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        names = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.extend(a.name for a in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names.append(node.module)
+        # Root modules, package modules (quant_starting_stocks.x) and siblings of the importing file
+        for name in names:
+            rel = name.replace('.', os.sep) + '.py'
+            todo.extend(p for p in (os.path.join(root, rel), os.path.join(os.path.dirname(path), rel))
+                        if os.path.exists(p))
+    return sorted(found)
+
+
+def fingerprint(stage, root=ROOT):
+    """Digest of the stage's arguments, code and input files: unchanged fingerprint = same result."""
+    h = hashlib.sha1(json.dumps(stage.args).encode('utf-8'))
+    for path in code_files(stage.script, root):
+        h.update(f"code:{os.path.relpath(path, root)}:{file_digest(path)}\n".encode('utf-8'))
+    for path in stage.inputs:
+        h.update(f"input:{path}:{file_digest(os.path.join(root, path))}\n".encode('utf-8'))
+    return h.hexdigest()
+
+
+# --- RUNNER ---
+class Pipeline:
+    """
+    Runs STAGES as a DAG: each stage starts as soon as the stages producing its inputs have finished,
+    up to `workers` at a time, each in its own Python process (the scripts keep module-level state).
+    A stage is skipped when its fingerprint matches the last successful run, its outputs exist and it
+    is not due for a refresh. Output goes to data/logs/<stage>.log; wall times are reported at the end.
+    """
+
+    def __init__(self, stages=STAGES, root=ROOT, workers=MAX_WORKERS, state_file=STATE_FILE, log_dir=LOG_DIR):
+        self.stages = {s.name: s for s in stages}
+        self.root = root
+        self.workers = workers
+        self.state_path = os.path.join(root, state_file)
+        self.log_dir = os.path.join(root, log_dir)
+        self.deps = self._dependencies()
+        self.results = {}
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+
+    # --- Planning ---
+    def _dependencies(self):
+        producers = {}
+        for s in self.stages.values():
+            for path in s.outputs:
+                if path in producers:
+                    raise ValueError(f"'{path}' is written by both {producers[path]} and {s.name}")
+                producers[path] = s.name
+        deps = {s.name: sorted({producers[p] for p in s.inputs if p in producers} - {s.name})
+                for s in self.stages.values()}
+        self._order(deps)
+        return deps
+
+    @staticmethod
+    def _order(deps):
+        """Topological order (raises on a cycle)."""
+        order, visiting = [], set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline cycle through '{name}'")
+            visiting.add(name)
+            for dep in deps[name]:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in deps:
+            visit(name)
+        return order
+
+    def select(self, targets=None):
+        """The named stages plus everything upstream of them (all stages if none are named)."""
+        if not targets:
+            return set(self.stages)
+        unknown = [t for t in targets if t not in self.stages]
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (choose from {', '.join(self.stages)})")
+        selected, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in selected:
+                selected.add(name)
+                todo.extend(self.deps[name])
+        return selected
+
+    def is_fresh(self, stage):
+        """(up to date?, fingerprint)"""
+        fp = fingerprint(stage, self.root)
+        last = self._state.get(stage.name)
+        if not last or last.get('fingerprint') != fp:
+            return False, fp
+        if not all(os.path.exists(os.path.join(self.root, p)) for p in stage.outputs):
+            return False, fp
+        if stage.refresh_hours is not None and time.time() - last.get('finished', 0) > stage.refresh_hours * 3600:
+            return False, fp
+        return True, fp
+
+    # --- Execution ---
+    def run(self, targets=None, force=()):
+        """
+        Runs the selected stages. force: stage names to rerun even if up to date.
+        Returns {stage: result dict with status ran/skipped/failed/blocked and seconds}.
+        """
+        selected = self.select(targets)
+        pending = [n for n in self._order(self.deps) if n in selected]
+        running = {}
+        start = time.perf_counter()
+        print(f"--- PIPELINE: {len(pending)} stages, up to {self.workers} at a time ---")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                for name in list(pending):
+                    states = [self.results.get(d, {}).get('status') for d in self.deps[name] if d in selected]
+                    if any(s in ('failed', 'blocked') for s in states):
+                        pending.remove(name)
+                        self.results[name] = {'status': 'blocked', 'seconds': 0.0}
+                        print(f"   ⛔ {name}: blocked by a failed upstream stage")
+                    elif all(s in ('ran', 'skipped') for s in states) and len(running) < self.workers:
+                        pending.remove(name)
+                        running[pool.submit(self._run_stage, self.stages[name], name in force)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self.results[name] = future.result()
+
+        self.report(time.perf_counter() - start)
+        return self.results
+
+    def _run_stage(self, stage, force=False):
+        fresh, fp = self.is_fresh(stage)
+        if fresh and not force:
+            print(f"   ⏭️  {stage.name}: unchanged, skipped")
+            return {'status': 'skipped', 'seconds': 0.0}
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        log_path = os.path.join(self.log_dir, f"{stage.name}.log")
+        print(f"   ▶️  {stage.name}: python {stage.script} {' '.join(stage.args)}".rstrip())
+        env = dict(os.environ, PYTHONIOENCODING='utf-8')   # The scripts print emoji into a log file
+        started = time.perf_counter()
+        with open(log_path, 'w', encoding='utf-8') as log:
+            code = subprocess.call([sys.executable, stage.script] + stage.args, cwd=self.root,
+                                   stdout=log, stderr=subprocess.STDOUT, env=env)
+        seconds = time.perf_counter() - started
+
+        # Several scripts print an error and return normally, so a missing output also counts as a failure
+        missing = [p for p in stage.outputs if not os.path.exists(os.path.join(self.root, p))]
+        if code != 0 or missing:
+            reason = f"exit code {code}" if code != 0 else f"no {', '.join(missing)}"
+            print(f"   ❌ {stage.name}: failed ({reason}) after {seconds:.1f}s, see {log_path}")
+            with open(log_path, 'r', encoding='utf-8', errors='replace') as log:
+                for line in log.read().splitlines()[-10:]:
+                    print(f"      | {line}")
+            return {'status': 'failed', 'seconds': seconds}
+
+        with self._lock:
+            # Inputs are fingerprinted before the run: a stage that rewrites one of them reruns next time
+            self._state[stage.name] = {'fingerprint': fp, 'finished': time.time(), 'seconds': round(seconds, 2)}
+            self._save_state()
+        print(f"   ✅ {stage.name}: done in {seconds:.1f}s")
+        return {'status': 'ran', 'seconds': seconds}
+
+    def report(self, wall):
+        total = sum(r['seconds'] for r in self.results.values())
+        print(f"\n   {'Stage':<20} {'Status':<8} {'Wall time':>10}")
+        for name in self._order(self.deps):
+            if name in self.results:
+                r = self.results[name]
+                print(f"   {name:<20} {r['status']:<8} {r['seconds']:9.1f}s")
+        counts = {s: sum(r['status'] == s for r in self.results.values()) for s in ('ran', 'skipped', 'failed', 'blocked')}
+        print(f"\n[SUMMARY] {counts['ran']} ran, {counts['skipped']} skipped, {counts['failed']} failed, "
+              f"{counts['blocked']} blocked | stage time {total:.1f}s in {wall:.1f}s wall")
+
+    # --- State ---
+    def _load_state(self):
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.state_path)
+
+
+def print_plan(pipeline, targets=None):
+    """--dry-run: stage order, upstream stages and whether each would be skipped right now."""
+    selected = pipeline.select(targets)
+    for name in pipeline._order(pipeline.deps):
+        if name in selected:
+            fresh, _ = pipeline.is_fresh(pipeline.stages[name])
+            after = ', '.join(pipeline.deps[name]) or '-'
+            print(f"   {name:<20} {'up to date' if fresh else 'will run':<11} after: {after}")
+
+
+if __name__ == "__main__":
+    # python pipeline.py [stage ...] [--force] [--dry-run]
+    # Named stages run with whatever they depend on; --force reruns the named stages (all if none named)
+    names = [a for a in sys.argv[1:] if not a.startswith('--')]
+    pipeline = Pipeline()
+    if '--dry-run' in sys.argv:
+        print_plan(pipeline, names)
+    else:
+        force = (names or list(pipeline.stages)) if '--force' in sys.argv else ()
+        results = pipeline.run(names, force=force)
+        sys.exit(1 if any(r['status'] in ('failed', 'blocked') for r in results.values()) else 0)
@@ -1,13 +1,20 @@
 import pandas as pd
 import numpy as np
-import os
-import time
 from vnstock import Vnstock
 
+try:
+    from statement_store import StatementStore
+    from field_resolver import FieldResolver, find_column
+    from data_adapter import DataProvider
+except ImportError:  # Imported as a package module (e.g. from the repo root)
+    from quant_starting_stocks.statement_store import StatementStore
+    from quant_starting_stocks.field_resolver import FieldResolver, find_column
+    from quant_starting_stocks.data_adapter import DataProvider
+
 # --- CACHE CONFIGURATION ---
-CACHE_DIR = 'data/cache'
-if not os.path.exists(CACHE_DIR):
-    os.makedirs(CACHE_DIR)
+# Financial reports live in the shared Parquet statement store (data/statements).
+# Old data/cache/*.json files are migrated into it on first read.
+STATEMENTS = StatementStore()
 
 class AnalysisEngine:
     
@@ -45,54 +52,56 @@ class AnalysisEngine:
         return df_clean.sort_values('initial_rank').head(top_n).copy()
 
     @staticmethod
-    def get_piotroski_score(symbol):
+    def load_statements(symbol):
         """
-        Calculates the Piotroski F-Score (0-9) for a given stock.
-        Handles its own caching of financial reports.
+        Returns (balance sheet, income statement, cash flow) for a stock.
+        Statement store first, then the VCI API (results are written back to the store).
         """
         # --- Internal Cache Helpers ---
         def _get_cached(sym, r_type):
-            path = os.path.join(CACHE_DIR, f"{sym}_{r_type}.json")
-            if os.path.exists(path):
-                try:
-                    with open(path, 'r') as f: return pd.read_json(f)
-                except ValueError: return None
-            return None
+            return STATEMENTS.load(sym, r_type)
 
         def _save_cache(sym, r_type, data):
-            path = os.path.join(CACHE_DIR, f"{sym}_{r_type}.json")
-            data.to_json(path)
+            STATEMENTS.save(sym, r_type, data)
+
+        # 1. Load Data (Cache First, then API)
+        bs = _get_cached(symbol, 'bs')
+        is_ = _get_cached(symbol, 'is')
+        cf = _get_cached(symbol, 'cf')
+        
+        if bs is None or is_ is None or cf is None:
+            stock = Vnstock().stock(symbol=symbol, source='VCI')
+            # Retries, error classification and fail-fast breakers live in the shared API wrapper
+            call = DataProvider._safe_api_call
+            if bs is None:
+                bs = call(stock.finance.balance_sheet, period='year', lang='en', dropna=True,
+                          endpoint='finance.balance_sheet')
+                if bs is not None: _save_cache(symbol, 'bs', bs)
+            if is_ is None:
+                is_ = call(stock.finance.income_statement, period='year', lang='en', dropna=True,
+                           endpoint='finance.income_statement')
+                if is_ is not None: _save_cache(symbol, 'is', is_)
+            if cf is None:
+                cf = call(stock.finance.cash_flow, period='year', dropna=True, endpoint='finance.cash_flow')
+                if cf is not None: _save_cache(symbol, 'cf', cf)
+        return bs, is_, cf
 
-        def _get_val(df, idx, keywords):
-            for col in df.columns:
-                if any(k.lower() in col.lower() for k in keywords):
-                    return df.iloc[idx][col]
+    @staticmethod
+    def get_piotroski_score(symbol):
+        """
+        Calculates the Piotroski F-Score (0-9) for a given stock.
+        Reports come from the shared statement store (fetched and stored on a miss, see load_statements).
+        """
+        try:
+            bs, is_, cf = AnalysisEngine.load_statements(symbol)
+            return AnalysisEngine.piotroski_from_statements(bs, is_, cf)
+        except Exception:
             return 0
 
+    @staticmethod
+    def piotroski_from_statements(bs, is_, cf):
+        """Scalar F-Score for one stock. This is the reference the batch path must match."""
         try:
-            # 1. Load Data (Cache First, then API)
-            bs = _get_cached(symbol, 'bs')
-            is_ = _get_cached(symbol, 'is')
-            cf = _get_cached(symbol, 'cf')
-            
-            if bs is None or is_ is None or cf is None:
-                stock = Vnstock().stock(symbol=symbol, source='VCI')
-                # Retry logic for fetching
-                for attempt in range(3):
-                    try:
-                        if bs is None:
-                            bs = stock.finance.balance_sheet(period='year', lang='en', dropna=True)
-                            if bs is not None: _save_cache(symbol, 'bs', bs)
-                        if is_ is None:
-                            is_ = stock.finance.income_statement(period='year', lang='en', dropna=True)
-                            if is_ is not None: _save_cache(symbol, 'is', is_)
-                        if cf is None:
-                            cf = stock.finance.cash_flow(period='year', dropna=True)
-                            if cf is not None: _save_cache(symbol, 'cf', cf)
-                        break
-                    except Exception:
-                        time.sleep(1)
-            
             if bs is None or is_ is None or cf is None or len(bs) < 2:
                 return 0 # Fail safe
 
@@ -148,4 +157,157 @@ class AnalysisEngine:
             
             return score
         except Exception:
-            return 0
\ No newline at end of file
+            return 0
+
+    @staticmethod
+    def get_piotroski_scores(symbols):
+        """
+        Batch F-Score for many stocks from the statement store.
+        Returns a DataFrame: ticker, the nine F_* components and piotroski_f_score.
+        Stocks without stored statements score 0, like the scalar path.
+        """
+        symbols = list(symbols)
+        frames = STATEMENTS.load_many(symbols)
+        rows = [piotroski_inputs(frames.get((s, 'bs')), frames.get((s, 'is')), frames.get((s, 'cf')))
+                for s in symbols]
+        components = score_piotroski_batch(stack_inputs(rows))
+        out = pd.DataFrame(components)
+        out.insert(0, 'ticker', symbols)
+        return out
+
+
+# --- FIELD LOOKUP ---
+def _get_val(df, idx, keywords):
+    pos = find_column(df.columns, keywords)
+    if pos < 0:
+        return 0
+    return df.iloc[idx, pos]
+
+
+# --- VECTORIZED PIOTROSKI ---
+# Canonical fields per statement. Keyword lists mirror piotroski_from_statements exactly.
+PIOTROSKI_FIELDS = {
+    'bs': FieldResolver('piotroski/bs', {
+        'total_assets': ['Total Assets'],
+        'lt_debt': ['Long-term', 'Non-current liabilities'],
+        'current_assets': ['Current assets'],
+        'current_liabilities': ['Current liabilities'],
+        'share_capital': ['Share capital'],
+    }),
+    'is': FieldResolver('piotroski/is', {
+        'net_income': ['Net Profit', 'Net Income', 'Profit after tax'],
+        'net_profit': ['Net Profit'],
+        'revenue': ['Revenue'],
+        'cogs': ['Cost of Goods'],
+    }),
+    'cf': FieldResolver('piotroski/cf', {
+        'cfo': ['Net Cash Flows'],
+    }),
+}
+
+# (input name, statement, canonical field, row). Row 0 = current year, 1 = prior year.
+PIOTROSKI_INPUTS = [
+    ('net_income', 'is', 'net_income', 0),
+    ('net_income_py', 'is', 'net_profit', 1),
+    ('assets_cy', 'bs', 'total_assets', 0),
+    ('assets_py', 'bs', 'total_assets', 1),
+    ('cfo', 'cf', 'cfo', 0),
+    ('lt_debt_cy', 'bs', 'lt_debt', 0),
+    ('lt_debt_py', 'bs', 'lt_debt', 1),
+    ('curr_assets_cy', 'bs', 'current_assets', 0),
+    ('curr_assets_py', 'bs', 'current_assets', 1),
+    ('curr_liab_cy', 'bs', 'current_liabilities', 0),
+    ('curr_liab_py', 'bs', 'current_liabilities', 1),
+    ('shares_cy', 'bs', 'share_capital', 0),
+    ('shares_py', 'bs', 'share_capital', 1),
+    ('rev_cy', 'is', 'revenue', 0),
+    ('rev_py', 'is', 'revenue', 1),
+    ('cogs_cy', 'is', 'cogs', 0),
+    ('cogs_py', 'is', 'cogs', 1),
+]
+
+PIOTROSKI_COMPONENTS = [
+    'F_ROA', 'F_CFO', 'F_DELTA_ROA', 'F_ACCRUAL',
+    'F_DELTA_LEVERAGE', 'F_DELTA_LIQUIDITY', 'F_NO_DILUTION',
+    'F_DELTA_MARGIN', 'F_DELTA_TURNOVER',
+]
+
+
+def piotroski_inputs(bs, is_, cf):
+    """
+    Pulls the raw F-Score inputs of one stock into a dict of floats.
+    Returns None wherever the scalar path would fail safe to 0.
+    """
+    if bs is None or is_ is None or cf is None or len(bs) < 2:
+        return None
+    statements = {'bs': bs, 'is': is_, 'cf': cf}
+    positions = {stmt: PIOTROSKI_FIELDS[stmt].resolve(df.columns) for stmt, df in statements.items()}
+    values = {}
+    for name, stmt, field, row in PIOTROSKI_INPUTS:
+        pos = positions[stmt][field]
+        if pos < 0:
+            values[name] = 0.0   # Missing field reads as 0 (reported once per schema)
+            continue
+        if row >= len(statements[stmt]):
+            return None
+        v = statements[stmt].iat[row, pos]
+        # Text cells make the scalar arithmetic raise, so they must fail here too
+        if v is None or isinstance(v, str):
+            return None
+        try:
+            values[name] = float(v)
+        except (TypeError, ValueError):
+            return None
+    return values
+
+
+def stack_inputs(rows):
+    """List of piotroski_inputs() results -> dict of aligned (N,) arrays plus a 'valid' mask."""
+    valid = np.array([r is not None for r in rows], dtype=bool)
+    arrays = {name: np.array([r[name] if r is not None else 0.0 for r in rows], dtype=np.float64)
+              for name, _, _, _ in PIOTROSKI_INPUTS}
+    arrays['valid'] = valid
+    return arrays
+
+
+def _safe_div(num, den):
+    # Same rule as the scalar "x / y if y else 0": only an exact zero is guarded (NaN passes through)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(den != 0, num / np.where(den != 0, den, 1.0), 0.0)
+
+
+def score_piotroski_batch(x):
+    """
+    All nine F-Score criteria for N stocks in one pass.
+    `x` maps every PIOTROSKI_INPUTS name to an (N,) float array; optional 'valid' mask.
+    Returns {component: (N,) int array} plus 'piotroski_f_score'.
+    """
+    avg_assets = (x['assets_cy'] + x['assets_py']) / 2
+    assets_py = x['assets_py']
+
+    roa = _safe_div(x['net_income'], avg_assets)
+    roa_py = _safe_div(x['net_income_py'], assets_py)
+    lev_cy = _safe_div(x['lt_debt_cy'], avg_assets)
+    lev_py = _safe_div(x['lt_debt_py'], assets_py)
+    cr_cy = _safe_div(x['curr_assets_cy'], x['curr_liab_cy'])
+    cr_py = _safe_div(x['curr_assets_py'], x['curr_liab_py'])
+    gm_cy = _safe_div(x['rev_cy'] - np.abs(x['cogs_cy']), x['rev_cy'])
+    gm_py = _safe_div(x['rev_py'] - np.abs(x['cogs_py']), x['rev_py'])
+    at_cy = _safe_div(x['rev_cy'], avg_assets)
+    at_py = _safe_div(x['rev_py'], assets_py)
+
+    checks = {
+        'F_ROA': roa > 0,
+        'F_CFO': x['cfo'] > 0,
+        'F_DELTA_ROA': roa > roa_py,
+        'F_ACCRUAL': x['cfo'] > x['net_income'],
+        'F_DELTA_LEVERAGE': lev_cy < lev_py,
+        'F_DELTA_LIQUIDITY': cr_cy > cr_py,
+        'F_NO_DILUTION': x['shares_cy'] <= x['shares_py'],
+        'F_DELTA_MARGIN': gm_cy > gm_py,
+        'F_DELTA_TURNOVER': at_cy > at_py,
+    }
+    valid = x.get('valid', np.ones(len(roa), dtype=bool))
+    out = {name: (checks[name] & valid).astype(np.int64) for name in PIOTROSKI_COMPONENTS}
+    out['piotroski_f_score'] = sum(out[name] for name in PIOTROSKI_COMPONENTS)
+    return out
@@ -0,0 +1,127 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# --- CONFIGURATION ---
+# Declared columns per stage output (keyed by file name without extension). Declared columns must be
+# present and are cast to these types; any other column is kept with the type Arrow infers for it.
+STRING, FLOAT, INT = pa.string(), pa.float64(), pa.int64()
+CSV_MTIME_KEY = b'csv_mtime_ns'   # Parquet metadata: mtime of the CSV copy written alongside
+SCHEMAS = {
+    'company_master_list': [('ticker', STRING), ('company_name', STRING), ('industry', STRING)],
+    'sector_fundamentals': [('industry', STRING), ('sector_pe', FLOAT), ('sector_pb', FLOAT),
+                            ('sector_roe', FLOAT), ('total_sector_mcap', FLOAT), ('stock_count', INT)],
+    'market_fundamentals_base': [('ticker', STRING), ('eps', FLOAT), ('bvps', FLOAT), ('roe', FLOAT)],
+    'market_piotroski_scores': [('ticker', STRING), ('piotroski_f_score', FLOAT)],
+    'top_quality_value_stocks': [('ticker', STRING), ('eps', FLOAT), ('bvps', FLOAT), ('roe', FLOAT),
+                                 ('price', FLOAT), ('pe', FLOAT), ('pb', FLOAT),
+                                 ('composite_rank_score', FLOAT), ('initial_rank', FLOAT),
+                                 ('piotroski_f_score', FLOAT)],
+    'target_list_for_scrapers': [('ticker', STRING), ('industry', STRING), ('pe', FLOAT), ('sector_pe', FLOAT),
+                                 ('piotroski_f_score', FLOAT), ('final_conviction_score', FLOAT)],
+    'raw_news_data': [('ticker', STRING), ('date', STRING), ('news_title', STRING), ('source', STRING)],
+    'f319_smart_filtered': [('ticker', STRING), ('original_title', STRING), ('page', INT),
+                            ('source', STRING), ('thread_id', STRING), ('scraped_at', STRING)],
+    'processed_sentiment': [('ticker', STRING), ('sentiment_score', FLOAT), ('type', STRING), ('date', STRING)],
+    'Final_Investment_Report': [('ticker', STRING), ('industry', STRING), ('ALPHA_SCORE', FLOAT), ('pe', FLOAT),
+                                ('sector_pe', FLOAT), ('piotroski_f_score', FLOAT), ('news_count', INT),
+                                ('forum_count', INT), ('final_sentiment', FLOAT)],
+    'target_list_with_forensics': [('ticker', STRING), ('beneish_m_score', FLOAT), ('accounting_risk', STRING)],
+    'market_forensics': [('ticker', STRING), ('beneish_m_score', FLOAT), ('accounting_risk', STRING)],
+    'final_target_list': [('ticker', STRING), ('beneish_m_score', FLOAT), ('accounting_risk', STRING),
+                          ('current_price', FLOAT), ('RSI_14', FLOAT), ('SMA_50', FLOAT), ('SMA_200', FLOAT),
+                          ('technical_signal', STRING)],
+    'market_technicals': [('ticker', STRING), ('technical_signal', STRING)],
+    'MASTER_INVESTMENT_DASHBOARD': [('ticker', STRING), ('FINAL_ACTION', STRING), ('action_rank', FLOAT),
+                                    ('ALPHA_SCORE', FLOAT), ('current_price', FLOAT), ('technical_signal', STRING),
+                                    ('accounting_risk', STRING), ('RSI_14', FLOAT), ('pe', FLOAT),
+                                    ('sector_pe', FLOAT), ('final_sentiment', FLOAT)],
+}
+
+
+def parquet_path(path):
+    """'data/x.csv' -> 'data/x.parquet' (stages keep naming their outputs by the CSV path)."""
+    return os.path.splitext(path)[0] + '.parquet'
+
+
+def schema_for(path):
+    fields = SCHEMAS.get(os.path.splitext(os.path.basename(path))[0])
+    return pa.schema(fields) if fields else None
+
+
+def to_table(df, schema=None):
+    """DataFrame -> Arrow table: declared columns cast to the schema, the rest inferred, column order kept."""
+    df = df.reset_index(drop=True)
+    declared = {f.name: f.type for f in schema} if schema is not None else {}
+    missing = [c for c in declared if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing declared column(s): {', '.join(missing)}")
+
+    arrays, fields = [], []
+    for col in df.columns:
+        values = df[col]
+        kind = declared.get(col)
+        if kind == STRING:
+            values = values.astype(object).where(values.notna(), None).map(lambda v: v if v is None else str(v))
+        elif kind in (FLOAT, INT):
+            values = pd.to_numeric(values, errors='coerce')
+            if kind == INT:
+                values = values.astype('Int64')   # Raises on fractional values instead of truncating them
+        try:
+            array = pa.array(values, type=kind, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Undeclared object column holding mixed types: store its text form
+            array = pa.array(values.astype(object).where(values.notna(), None).map(
+                lambda v: v if v is None else str(v)), type=STRING, from_pandas=True)
+        arrays.append(array)
+        fields.append(pa.field(str(col), array.type))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def write_artifact(df, path, csv=True, **csv_kwargs):
+    """
+    Writes a stage output as typed Parquet next to `path` (same name, .parquet), plus the CSV at
+    `path` for people and spreadsheets (csv=False skips it). csv_kwargs go to DataFrame.to_csv.
+    The CSV goes first; the Parquet file records that CSV's modification time and is then renamed
+    into place, so a reader only falls back to the CSV once someone has changed it since.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    table = to_table(df, schema_for(path))
+    if csv:
+        df.to_csv(path, index=False, **csv_kwargs)
+        table = table.replace_schema_metadata({CSV_MTIME_KEY: str(os.stat(path).st_mtime_ns)})
+    target = parquet_path(path)
+    tmp = f"{target}.tmp"
+    pq.write_table(table, tmp, compression='zstd')
+    os.replace(tmp, target)
+    return target
+
+
+def _parquet_is_current(target, path):
+    """True if the Parquet file still matches the CSV written with it (or there is no CSV)."""
+    if not os.path.exists(path):
+        return True
+    recorded = (pq.read_schema(target).metadata or {}).get(CSV_MTIME_KEY)
+    if recorded is not None:
+        return int(recorded) == os.stat(path).st_mtime_ns
+    return os.path.getmtime(target) >= os.path.getmtime(path)   # Written with csv=False, CSV from elsewhere
+
+
+def read_artifact(path, columns=None):
+    """
+    Reads a stage output by its CSV path, only the `columns` asked for (all if None).
+    The Parquet file is used unless the CSV was changed after it was written (edited by hand, or
+    written by an older version of the stage); then the CSV is parsed with the declared string
+    columns kept as text. Raises FileNotFoundError if neither exists.
+    """
+    target = parquet_path(path)
+    if os.path.exists(target) and _parquet_is_current(target, path):
+        return pq.read_table(target, columns=list(columns) if columns is not None else None).to_pandas()
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No such artifact: '{path}' (or {target})")
+
+    schema = schema_for(path)
+    dtype = {f.name: str for f in schema if f.type == STRING} if schema is not None else None
+    df = pd.read_csv(path, usecols=list(columns) if columns is not None else None, dtype=dtype)
+    return df[list(columns)] if columns is not None else df
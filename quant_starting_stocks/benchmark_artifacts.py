@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from artifacts import read_artifact, write_artifact, parquet_path
+
+print("--- BENCHMARK: PARQUET ARTIFACTS vs CSV HAND-OFF ---\n")
+
+# ---------------------------------------------------------
+# SETUP: Full-universe stage outputs (synthetic, shaped like the real files)
+# ---------------------------------------------------------
+N_TICKERS = int(sys.argv[1]) if len(sys.argv) > 1 else 1600
+NEWS_PER_TICKER = 60
+REPEATS = 5
+
+rng = np.random.default_rng(42)
+tickers = [f"T{i:03d}" if i % 7 else f"{i:03d}" for i in range(N_TICKERS)]   # Some tickers look numeric
+industries = [f"Industry {i}" for i in range(60)]
+vocab = [f"{w}{i}" for i, w in enumerate(['tăng', 'giảm', 'lợi nhuận', 'cổ tức', 'quý', 'doanh thu', 'nợ', 'vốn'] * 40)]
+
+n = N_TICKERS * NEWS_PER_TICKER
+frames = {
+    'market_fundamentals_base.csv': pd.DataFrame({
+        'ticker': tickers, 'eps': rng.normal(2500, 900, N_TICKERS),
+        'bvps': rng.normal(15000, 4000, N_TICKERS), 'roe': rng.normal(0.12, 0.05, N_TICKERS)}),
+    'market_technicals.csv': pd.DataFrame({
+        'ticker': tickers, 'current_price': rng.uniform(2e3, 2e5, N_TICKERS),
+        'RSI_14': rng.uniform(0, 100, N_TICKERS), 'SMA_50': rng.uniform(2e3, 2e5, N_TICKERS),
+        'SMA_200': rng.uniform(2e3, 2e5, N_TICKERS),
+        'technical_signal': rng.choice(['UPTREND (BUY)', 'DOWNTREND (AVOID)', 'NEUTRAL'], N_TICKERS)}),
+    'company_master_list.csv': pd.DataFrame({
+        'ticker': tickers, 'company_name': [f"Công ty Cổ phần {t}" for t in tickers],
+        'industry': rng.choice(industries, N_TICKERS)}),
+    'raw_news_data.csv': pd.DataFrame({
+        'ticker': np.repeat(tickers, NEWS_PER_TICKER),
+        'date': pd.to_datetime(rng.integers(1.69e9, 1.73e9, n), unit='s').strftime('%d/%m/%Y'),
+        'news_title': [' '.join(rng.choice(vocab, rng.integers(8, 15))) for _ in range(n)],
+        'source': rng.choice(['HOSE_API', 'CAFEF_AJAX', 'VNSTOCK_API'], n)}),
+}
+projections = {
+    'market_fundamentals_base.csv': ['ticker', 'eps'],
+    'market_technicals.csv': ['ticker', 'technical_signal'],
+    'company_master_list.csv': ['ticker'],
+    'raw_news_data.csv': ['ticker', 'date'],
+}
+
+work_dir = tempfile.mkdtemp(prefix='artifact_bench_')
+for name, df in frames.items():
+    path = os.path.join(work_dir, name)
+    write_artifact(df, path)
+
+# ---------------------------------------------------------
+# TIMINGS
+# ---------------------------------------------------------
+def timed(fn):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+print(f"{N_TICKERS} tickers, {n} news rows. Best of {REPEATS} reads.\n")
+print(f"   {'Artifact':<30} {'CSV MB':>7} {'PQ MB':>7} {'CSV read':>9} {'PQ read':>8} {'CSV cols':>9} {'PQ cols':>8}")
+mismatched = []
+for name, df in frames.items():
+    path = os.path.join(work_dir, name)
+    cols = projections[name]
+    csv_full = timed(lambda: pd.read_csv(path, dtype={'ticker': str}))
+    pq_full = timed(lambda: read_artifact(path))
+    csv_cols = timed(lambda: pd.read_csv(path, usecols=cols, dtype={'ticker': str}))
+    pq_cols = timed(lambda: read_artifact(path, columns=cols))
+    print(f"   {name:<30} {os.path.getsize(path) / 1e6:7.2f} {os.path.getsize(parquet_path(path)) / 1e6:7.2f} "
+          f"{csv_full * 1e3:7.1f}ms {pq_full * 1e3:6.1f}ms {csv_cols * 1e3:7.1f}ms {pq_cols * 1e3:6.1f}ms")
+
+    # CORRECTNESS: same values, and tickers like '007' stay text (a plain read_csv turns them into 7)
+    back = read_artifact(path)
+    if not back.equals(df):
+        mismatched.append(name)
+
+print()
+if not mismatched:
+    print(f"   ✅ PASS: {len(frames)} artifacts round-trip unchanged.")
+else:
+    print(f"   ❌ FAIL: {', '.join(mismatched)} differ after the round trip.")
+
+shutil.rmtree(work_dir)
+print("\n--- BENCHMARK COMPLETE ---")
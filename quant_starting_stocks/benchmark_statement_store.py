@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from statement_store import StatementStore, REPORT_TYPES
+
+print("--- BENCHMARK: PARQUET STATEMENT STORE vs JSON CACHE ---\n")
+
+# ---------------------------------------------------------
+# SETUP: Synthetic universe shaped like VCI yearly reports
+# ---------------------------------------------------------
+N_TICKERS = int(sys.argv[1]) if len(sys.argv) > 1 else 1600
+N_YEARS = 10
+N_FIELDS = {'bs': 90, 'is': 35, 'cf': 45}
+
+rng = np.random.default_rng(42)
+tickers = [f"T{i:04d}" for i in range(N_TICKERS)]
+
+def make_statement(ticker, r_type):
+    cols = {'ticker': [ticker] * N_YEARS, 'yearReport': list(range(2024, 2024 - N_YEARS, -1))}
+    for j in range(N_FIELDS[r_type]):
+        cols[f"{r_type.upper()} FIELD {j} (Bn. VND)"] = rng.normal(1e12, 3e11, N_YEARS)
+    return pd.DataFrame(cols)
+
+work_dir = tempfile.mkdtemp(prefix='stmt_bench_')
+json_dir = os.path.join(work_dir, 'cache')
+store_dir = os.path.join(work_dir, 'statements')
+os.makedirs(json_dir)
+
+print(f"Generating {N_TICKERS} tickers x {len(REPORT_TYPES)} reports...")
+frames = {(t, r): make_statement(t, r) for t in tickers for r in REPORT_TYPES}
+
+for (t, r), df in frames.items():
+    df.to_json(os.path.join(json_dir, f"{t}_{r}.json"))
+
+store = StatementStore(root=store_dir, legacy_dir=os.path.join(work_dir, 'no_legacy'))
+store.save_many(frames)
+store.compact()
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+print(f"   JSON cache:      {dir_size(json_dir) / 1e6:8.1f} MB in {len(frames)} files")
+print(f"   Parquet store:   {dir_size(store_dir) / 1e6:8.1f} MB in {len(REPORT_TYPES)} files")
+print("-" * 30)
+
+# ---------------------------------------------------------
+# TIMINGS
+# ---------------------------------------------------------
+def load_json_layout():
+    out = {}
+    for t in tickers:
+        for r in REPORT_TYPES:
+            with open(os.path.join(json_dir, f"{t}_{r}.json"), 'r') as f:
+                out[(t, r)] = pd.read_json(f)
+    return out
+
+def load_store_bulk():
+    return StatementStore(root=store_dir).load_many(tickers)
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<34} {elapsed:7.2f}s  ({len(result)} statements)")
+    return result
+
+# Cold = first pass in this process (the OS page cache is not dropped).
+# Warm = repeat pass over the same files.
+print("1. Cold load (first pass)")
+json_frames = timed("JSON, one file per report", load_json_layout)
+store_frames = timed("Parquet store, bulk load_many", load_store_bulk)
+
+print("\n2. Warm load (repeat pass)")
+timed("JSON, one file per report", load_json_layout)
+timed("Parquet store, bulk load_many", load_store_bulk)
+timed("Parquet store, in-process memo", lambda: {k: store.load(*k) for k in frames})
+
+# ---------------------------------------------------------
+# CORRECTNESS: Round trip must preserve values and column order
+# ---------------------------------------------------------
+print("\n3. Round-trip check")
+sample = tickers[:: max(1, N_TICKERS // 50)]
+mismatched = [
+    (t, r) for t in sample for r in REPORT_TYPES
+    if list(store_frames[(t, r)].columns) != list(json_frames[(t, r)].columns)
+    or not np.allclose(store_frames[(t, r)].iloc[:, 2:].to_numpy(), json_frames[(t, r)].iloc[:, 2:].to_numpy())
+]
+if not mismatched:
+    print(f"   ✅ PASS: {len(sample) * len(REPORT_TYPES)} sampled statements identical to the JSON layout.")
+else:
+    print(f"   ❌ FAIL: {len(mismatched)} statements differ, e.g. {mismatched[:3]}")
+
+shutil.rmtree(work_dir)
+print("\n--- BENCHMARK COMPLETE ---")
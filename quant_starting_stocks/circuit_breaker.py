@@ -0,0 +1,163 @@
+import re
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# --- ERROR CLASSES ---
+TRANSIENT = 'transient'       # 429/5xx, timeouts, dropped connections: worth retrying later
+SCHEMA = 'schema_broken'      # Response came back in a shape the parser no longer understands
+NOT_FOUND = 'not_found'       # The endpoint works, this ticker simply has no data
+OTHER = 'other'
+
+_TRANSIENT_MARKERS = ("quá nhiều request", "timed out", "timeout", "connection", "bad gateway",
+                      "service unavailable")
+_SCHEMA_MARKERS = ("are in the [columns]", "not in index", "keyerror", "no columns to parse",
+                   "expecting value", "unexpected response")
+_NOT_FOUND_MARKERS = ("not found", "không tìm thấy", "no data")
+# A status code in HTTP context: "502 - Bad Gateway" (vnstock), "503 Server Error" (requests),
+# "status 429" / "HTTP 504". A bare number ("500 shares", "row 15003") is not a status.
+_STATUS_CODE = re.compile(r'(?:\bstatus(?: code)?|\bhttp(?:/[\d.]+)?)[\s:=]*([1-5]\d\d)\b'
+                          r'|(?<![\w.,])([1-5]\d\d) (?:- |(?:client|server) error)', re.IGNORECASE)
+_TRANSIENT_CODES = {429, 500, 502, 503, 504}
+
+
+def status_code(error):
+    """HTTP status of a failed call: the exception's own attribute if it has one, else a code in its message."""
+    for holder in (error, getattr(error, 'response', None)):
+        code = getattr(holder, 'status_code', None) or getattr(holder, 'status', None)
+        if isinstance(code, int):
+            return code
+    match = _STATUS_CODE.search(str(error))
+    return int(match.group(1) or match.group(2)) if match else None
+
+
+def classify_error(error):
+    """Buckets an exception from a vnstock call into TRANSIENT, SCHEMA, NOT_FOUND or OTHER."""
+    msg = f"{type(error).__name__}: {error}".lower()
+    code = status_code(error)
+    if code == 404 or any(m in msg for m in _NOT_FOUND_MARKERS):
+        return NOT_FOUND
+    if isinstance(error, (KeyError, IndexError)) or any(m in msg for m in _SCHEMA_MARKERS):
+        return SCHEMA
+    if (code in _TRANSIENT_CODES or isinstance(error, (TimeoutError, ConnectionError))
+            or any(m in msg for m in _TRANSIENT_MARKERS)):
+        return TRANSIENT
+    return OTHER
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint breaker: closed -> open after a run of endpoint-level failures -> half-open probe.
+    Transient errors trip it quickly with a short cooldown. Schema errors need a longer run
+    (some tickers legitimately return odd frames) but keep it open much longer.
+    Not-found answers prove the endpoint is alive and reset the failure run.
+    """
+
+    def __init__(self, name, transient_threshold=5, schema_threshold=10,
+                 cooldown=30.0, schema_cooldown=600.0, max_cooldown=900.0):
+        self.name = name
+        self.thresholds = {TRANSIENT: transient_threshold, SCHEMA: schema_threshold}
+        self.cooldowns = {TRANSIENT: cooldown, SCHEMA: schema_cooldown}
+        self.max_cooldown = max_cooldown
+        self.state = 'closed'
+        self.counts = {TRANSIENT: 0, SCHEMA: 0, NOT_FOUND: 0, OTHER: 0, 'ok': 0, 'rejected': 0}
+        self.trips = 0
+        self._run = {TRANSIENT: 0, SCHEMA: 0}
+        self._open_until = 0.0
+        self._cooldown = cooldown
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """False while open (callers should fail fast or use cached data)."""
+        with self._lock:
+            if self.state == 'open' and time.monotonic() >= self._open_until:
+                self.state = 'half_open'
+                self._probing = False
+            if self.state == 'closed':
+                return True
+            if self.state == 'half_open' and not self._probing:
+                self._probing = True   # Exactly one probe call goes through
+                return True
+            self.counts['rejected'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.counts['ok'] += 1
+            self._reset()
+
+    def record_failure(self, kind):
+        with self._lock:
+            self.counts[kind] += 1
+            if kind == NOT_FOUND:
+                self._reset()
+                return
+            if kind == OTHER:
+                # Says nothing about the endpoint: free the half-open probe slot so the next call probes
+                self._probing = False
+                return
+            self._run[kind] += 1
+            if self.state == 'half_open':
+                self._trip(kind, min(self.max_cooldown, self._cooldown * 2))
+            elif self.state == 'closed' and self._run[kind] >= self.thresholds[kind]:
+                self._trip(kind, self.cooldowns[kind])
+
+    def _reset(self):
+        if self.state != 'closed':
+            logger.info(f"[{self.name}] circuit closed again")
+        self.state = 'closed'
+        self._probing = False
+        self._run = {TRANSIENT: 0, SCHEMA: 0}
+
+    def _trip(self, kind, cooldown):
+        self.state = 'open'
+        self.trips += 1
+        self._cooldown = cooldown
+        self._open_until = time.monotonic() + cooldown
+        self._probing = False
+        logger.warning(f"[{self.name}] circuit OPEN after repeated {kind} errors; failing fast for {cooldown:.0f}s")
+
+
+class RetryBudget:
+    """A fixed number of retries shared by every call in the run, so a dead endpoint cannot eat hours."""
+
+    def __init__(self, retries=300):
+        self.total = retries
+        self.remaining = retries
+        self._lock = threading.Lock()
+
+    def spend(self):
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+class BreakerRegistry:
+    def __init__(self, **breaker_kwargs):
+        self.breaker_kwargs = breaker_kwargs
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint):
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(endpoint, **self.breaker_kwargs)
+            return self._breakers[endpoint]
+
+    def report(self, budget=None):
+        for name, b in sorted(self._breakers.items()):
+            c = b.counts
+            print(f"  [{name}] {b.state} | ok {c['ok']} | transient {c[TRANSIENT]} | schema {c[SCHEMA]} | "
+                  f"not-found {c[NOT_FOUND]} | other {c[OTHER]} | fail-fast {c['rejected']} | trips {b.trips}")
+        if budget is not None:
+            print(f"  Retry budget used: {budget.total - budget.remaining}/{budget.total}")
+
+
+# One set of breakers and one retry budget per run (process)
+BREAKERS = BreakerRegistry()
+RETRY_BUDGET = RetryBudget()
@@ -1,11 +1,21 @@
+import time
+import random
 import pandas as pd
 from vnstock import Listing, Vnstock
 import logging
-import time
-import random
-from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+try:
+    from rate_limiter import VNSTOCK, is_throttled
+    from circuit_breaker import BREAKERS, RETRY_BUDGET, TRANSIENT, classify_error
+    from price_store import PriceStore
+except ImportError:  # Imported as a package module (e.g. from the repo root)
+    from quant_starting_stocks.rate_limiter import VNSTOCK, is_throttled
+    from quant_starting_stocks.circuit_breaker import BREAKERS, RETRY_BUDGET, TRANSIENT, classify_error
+    from quant_starting_stocks.price_store import PriceStore
+
+logger = logging.getLogger(__name__)
+
 # --- CONFIGURATION ---
 METRIC_MAP = {
     'pe': ('Chỉ tiêu định giá', 'P/E'),
@@ -16,30 +26,54 @@ METRIC_MAP = {
     'bvps': ('Chỉ tiêu định giá', 'BVPS (VND)')
 }
 
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0   # Seconds before the first retry of a transient error, doubled per attempt, plus jitter
+
+# Local daily-bar history shared by the live price update and the technical analysis step
+PRICES = PriceStore()
+
 class DataProvider:
     
     @staticmethod
-    def _safe_api_call(func, *args, **kwargs):
-        """Retries API calls if server is busy."""
-        max_retries = 3
-        base_wait = 2 
-        for attempt in range(max_retries):
+    def _safe_api_call(func, *args, endpoint=None, **kwargs):
+        """
+        Calls the API through the shared limiter and the endpoint's circuit breaker.
+        Only transient errors are retried, after a jittered exponential backoff, and each retry
+        is paid from the run-wide budget. Schema-broken and not-found errors return immediately.
+        While the breaker is open the call fails fast. Every failure returns None; callers then
+        serve what the statement or price store already holds.
+        """
+        breaker = BREAKERS.get(endpoint or getattr(func, '__name__', 'vnstock'))
+        for attempt in range(MAX_RETRIES):
+            if not breaker.allow():
+                break
             try:
-                return func(*args, **kwargs)
+                result = VNSTOCK.call(func, *args, **kwargs)
+                breaker.record_success()
+                return result
             except Exception as e:
-                error_msg = str(e)
-                if "429" in error_msg or "502" in error_msg or "quá nhiều request" in error_msg:
-                    wait_time = base_wait * (2 ** attempt) + random.uniform(0, 1)
-                    time.sleep(wait_time)
-                else:
-                    return None
+                kind = classify_error(e)
+                breaker.record_failure(kind)
+                logger.debug(f"[{breaker.name}] {kind}: {e}")
+                if kind != TRANSIENT or attempt == MAX_RETRIES - 1 or not RETRY_BUDGET.spend():
+                    break
+                # A throttled call has already cut the limiter's rate and set a shared cooldown
+                if not is_throttled(e):
+                    time.sleep(RETRY_BACKOFF * 2 ** attempt + random.uniform(0, RETRY_BACKOFF))
         return None
 
+    @staticmethod
+    def report_health():
+        """Per-endpoint error breakdown, breaker state and limiter stats for the run."""
+        BREAKERS.report(RETRY_BUDGET)
+        VNSTOCK.report()
+
     @staticmethod
     def get_all_tickers(limit=None):
         try:
             listing = Listing(source='VCI') 
-            universe = listing.all_symbols()
+            universe = DataProvider._safe_api_call(listing.all_symbols, endpoint='listing.all_symbols')
+            if universe is None: return []
             if isinstance(universe, pd.DataFrame):
                 if 'ticker' in universe.columns: tickers = universe['ticker'].tolist()
                 elif 'symbol' in universe.columns: tickers = universe['symbol'].tolist()
@@ -66,52 +100,71 @@ class DataProvider:
                 }
             except Exception: return None
 
-        time.sleep(random.uniform(0.5, 1.0))
-        return DataProvider._safe_api_call(_work)
+        return DataProvider._safe_api_call(_work, endpoint='finance.ratio')
 
-    # --- NEW: Helper for individual price fetching ---
+    # --- PRICE HISTORY (delta-synced local store) ---
     @staticmethod
-    def _fetch_single_price_history(symbol):
-        """Fetches the latest closing price using the History API."""
+    def fetch_price_bars(symbol, start, end):
+        """Daily bars for [start, end] from the History API, or None if the call failed."""
         try:
             stock = Vnstock().stock(symbol=symbol, source='VCI')
-            
-            # Get last 7 days to ensure we find a trading day
-            end_date = datetime.now().strftime('%Y-%m-%d')
-            start_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-            
-            df = stock.quote.history(start=start_date, end=end_date)
-            
-            if df is not None and not df.empty:
-                latest = df.iloc[-1]
-                # 'close' is standard, but we use .get just in case
-                price = latest.get('close') or latest.get('Close')
-                if price and price > 0:
-                    return {'ticker': symbol, 'price': float(price)}
-            return None
         except Exception:
             return None
+        return DataProvider._safe_api_call(stock.quote.history, start=start, end=end, interval='1D',
+                                           endpoint='quote.history')
 
     @staticmethod
-    def fetch_live_price_batch(tickers):
+    def sync_price_history(tickers, days=365):
         """
-        Phase 2: Live Price Update.
-        Since the 'Batch' API is blocked, we simulate it by running 
-        parallel requests to the 'History' API.
+        Brings the price store up to date for the last `days` calendar days, fetching only the
+        missing bars (usually one or two per ticker), then returns {ticker: bars} from the store.
         """
         if isinstance(tickers, str): tickers = tickers.split(',')
-        
-        results = []
-        # We use a mini-threadpool here to keep it fast
-        # 10 workers is safe for the History endpoint
-        with ThreadPoolExecutor(max_workers=4) as executor:
+        plan = PRICES.plan(tickers, days)
+        adjusted = DataProvider._fetch_and_record(plan) if plan else []
+        if adjusted:
+            # Split or stock dividend since the last sync: refetch those tickers' whole window now
+            logger.info(f"Adjusted price history, backfilling: {', '.join(adjusted)}")
+            DataProvider._fetch_and_record(PRICES.plan(adjusted, days))
+        return PRICES.load_many(tickers, days)
+
+    @staticmethod
+    def _fetch_and_record(plan):
+        bars = {}
+        # The pool only bounds threads; the shared limiter decides how many requests are in flight
+        with ThreadPoolExecutor(max_workers=VNSTOCK.max_concurrency) as executor:
             future_to_ticker = {
-                executor.submit(DataProvider._fetch_single_price_history, t): t 
-                for t in tickers
+                executor.submit(DataProvider.fetch_price_bars, t, start, end): t
+                for t, (start, end) in plan.items()
             }
-            
             for future in as_completed(future_to_ticker):
-                res = future.result()
-                if res: results.append(res)
-        
-        return results
\ No newline at end of file
+                df = future.result()
+                if df is not None: bars[future_to_ticker[future]] = df
+        return PRICES.record(bars, plan)
+
+    @staticmethod
+    def _latest_price(symbol, bars):
+        if bars is None or bars.empty:
+            return None
+        price = bars['close'].iloc[-1]
+        if price and price > 0:
+            return {'ticker': symbol, 'price': float(price)}
+        return None
+
+    @staticmethod
+    def _fetch_single_price_history(symbol):
+        """Latest closing price from the last 7 days of the price store."""
+        history = DataProvider.sync_price_history([symbol], days=7)
+        return DataProvider._latest_price(symbol, history.get(symbol))
+
+    @staticmethod
+    def fetch_live_price_batch(tickers):
+        """
+        Phase 2: Live Price Update.
+        Since the 'Batch' API is blocked, we delta-sync the History API into the
+        local price store (in parallel) and read each ticker's latest close.
+        """
+        if isinstance(tickers, str): tickers = tickers.split(',')
+        history = DataProvider.sync_price_history(tickers, days=7)
+        results = [DataProvider._latest_price(t, history.get(t)) for t in tickers]
+        return [r for r in results if r]
@@ -0,0 +1,77 @@
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def schema_fingerprint(columns):
+    """Short, stable id for a statement schema (its ordered column set)."""
+    return hashlib.sha1('\x1f'.join(str(c) for c in columns).encode('utf-8')).hexdigest()[:12]
+
+
+def _match_positions(lowered, keywords):
+    return [j for j, col in enumerate(lowered) if any(k in col for k in keywords)]
+
+
+class FieldResolver:
+    """
+    Maps canonical field names to column positions, once per statement schema.
+    A field resolves to the first column containing any of its keywords (case-insensitive),
+    the same rule the old per-call lookups used. Unresolved fields come back as -1.
+    Unresolved and ambiguous fields are logged once per schema instead of silently reading 0.
+    """
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = {field: [k.lower() for k in keywords] for field, keywords in fields.items()}
+        self.issues = {}       # fingerprint -> {'unresolved': [...], 'ambiguous': {field: [columns]}}
+        self._schemas = {}     # tuple(columns) -> {field: position}
+        self._lock = threading.Lock()
+
+    def resolve(self, columns):
+        key = tuple(columns)
+        mapping = self._schemas.get(key)
+        if mapping is None:
+            mapping = self._compile(key)
+            with self._lock:
+                self._schemas[key] = mapping
+        return mapping
+
+    def _compile(self, columns):
+        lowered = [str(c).lower() for c in columns]
+        mapping, unresolved, ambiguous = {}, [], {}
+        for field, keywords in self.fields.items():
+            matches = _match_positions(lowered, keywords)
+            mapping[field] = matches[0] if matches else -1
+            if not matches:
+                unresolved.append(field)
+            elif len(matches) > 1:
+                ambiguous[field] = [columns[j] for j in matches]
+
+        if unresolved or ambiguous:
+            fingerprint = schema_fingerprint(columns)
+            with self._lock:
+                first_time = fingerprint not in self.issues
+                self.issues[fingerprint] = {'unresolved': unresolved, 'ambiguous': ambiguous}
+            if first_time:
+                if unresolved:
+                    logger.warning(f"[{self.name}] schema {fingerprint}: unresolved fields {unresolved} (read as 0)")
+                for field, cols in ambiguous.items():
+                    logger.warning(f"[{self.name}] schema {fingerprint}: '{field}' matches {len(cols)} columns, using '{cols[0]}'")
+        return mapping
+
+
+# --- AD-HOC KEYWORD LOOKUP ---
+_KEYWORD_MEMO = {}
+
+
+def find_column(columns, keywords):
+    """Position of the first column containing any keyword, or -1. Memoized per (schema, keywords)."""
+    key = (tuple(columns), tuple(keywords))
+    pos = _KEYWORD_MEMO.get(key)
+    if pos is None:
+        matches = _match_positions([str(c).lower() for c in key[0]], [k.lower() for k in keywords])
+        pos = matches[0] if matches else -1
+        _KEYWORD_MEMO[key] = pos
+    return pos
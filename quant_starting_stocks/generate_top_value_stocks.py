@@ -9,8 +9,11 @@ import numpy as np
 from datetime import datetime
 
 # --- IMPORTS ---
-from data_adapter import DataProvider
-from analysis_engine import AnalysisEngine
+from data_adapter import DataProvider, PRICES
+from analysis_engine import AnalysisEngine, STATEMENTS
+from statement_store import REPORT_TYPES
+from rate_limiter import VNSTOCK
+from artifacts import read_artifact, write_artifact
 import warnings
 
 # SILENCE PANDAS WARNINGS
@@ -30,12 +33,17 @@ logging.basicConfig(
 # --- CONFIGURATION ---
 BASE_FILE = 'data/market_fundamentals_base.csv'
 BATCH_SIZE = 10 
+SCORE_FULL_UNIVERSE = False  # True = F-Score every stock in the base scan, not just the shortlist
+UNIVERSE_SCORES_FILE = 'data/market_piotroski_scores.csv'
 
 # --- HELPER: WRAPPER FOR THREADING ---
-def calculate_piotroski_parallel(ticker):
-    # Now we just call the Engine
-    score = AnalysisEngine.get_piotroski_score(ticker)
-    return {'ticker': ticker, 'piotroski_f_score': score} 
+def fetch_statements_parallel(ticker):
+    # Fills the statement store for one ticker; scoring happens later in one batch
+    try:
+        AnalysisEngine.load_statements(ticker)
+    except Exception:
+        pass
+    return ticker
 
 def get_latest_deadline():
     """Returns the most recent official financial reporting deadline."""
@@ -70,7 +78,7 @@ def main():
             need_scan = True 
         else:
             print("✅ FILE VALID. Loading base data...")
-            base_df = pd.read_csv(BASE_FILE, dtype={'ticker': str})
+            base_df = read_artifact(BASE_FILE)
             
             all_tickers = DataProvider.get_all_tickers()
             existing_tickers = base_df['ticker'].tolist()
@@ -88,7 +96,7 @@ def main():
 
     if need_scan:
         new_results = []
-        with ThreadPoolExecutor(max_workers=2) as executor:
+        with ThreadPoolExecutor(max_workers=VNSTOCK.max_concurrency) as executor:
             future_to_ticker = {
                 executor.submit(DataProvider.fetch_single_stock_fundamentals, t): t 
                 for t in tickers_to_scan
@@ -106,7 +114,8 @@ def main():
                     new_results = []
         
         print("\n📥 Reloading base data...")
-        base_df = pd.read_csv(BASE_FILE, dtype={'ticker': str})
+        base_df = read_artifact(BASE_FILE)   # The appended CSV is newer: read it, then store it typed
+        write_artifact(base_df, BASE_FILE)
 
     if base_df.empty:
         print("CRITICAL: No base data available.")
@@ -123,7 +132,7 @@ def main():
         chunk = tickers[i:i+40]
         prices = DataProvider.fetch_live_price_batch(chunk)
         if prices: price_data.extend(prices)
-        time.sleep(0.2) 
+    PRICES.compact()
 
     price_df = pd.DataFrame(price_data)
     print(f"Got prices for {len(price_df)} stocks.")
@@ -146,25 +155,38 @@ def main():
     # ---------------------------------------------------------
     # PHASE 4: DEEP DIVE
     # ---------------------------------------------------------
-    print(f"\nPhase 4: Deep Dive (Piotroski) on {len(target_tickers)} Candidates...")
+    score_tickers = final_df['ticker'].tolist() if SCORE_FULL_UNIVERSE else target_tickers
+    print(f"\nPhase 4: Deep Dive (Piotroski) on {len(score_tickers)} Stocks...")
     
-    piotroski_results = []
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        future_to_ticker = {executor.submit(calculate_piotroski_parallel, t): t for t in target_tickers}
-        for future in tqdm(as_completed(future_to_ticker), total=len(target_tickers), desc="Calculating F-Scores"):
-            result = future.result()
-            piotroski_results.append(result)
-
-    scores_df = pd.DataFrame(piotroski_results)
+    # Bulk-load every cached statement in one scan, then only hit the API for the gaps
+    cached = STATEMENTS.load_many(score_tickers)
+    to_fetch = [t for t in score_tickers if any((t, r) not in cached for r in REPORT_TYPES)]
+    
+    if to_fetch:
+        with ThreadPoolExecutor(max_workers=VNSTOCK.max_concurrency) as executor:
+            futures = [executor.submit(fetch_statements_parallel, t) for t in to_fetch]
+            for future in tqdm(as_completed(futures), total=len(to_fetch), desc="Fetching Statements"):
+                future.result()
+
+        # Fold this run's newly fetched statements into one file per report type
+        STATEMENTS.compact()
+
+    # One vectorized pass over all tickers (components + total)
+    scores_df = AnalysisEngine.get_piotroski_scores(score_tickers)
+    if SCORE_FULL_UNIVERSE:
+        write_artifact(scores_df, UNIVERSE_SCORES_FILE)
+        print(f"Saved F-Scores for {len(scores_df)} stocks to {UNIVERSE_SCORES_FILE}")
+
     candidates = pd.merge(candidates, scores_df, on='ticker', how='left')
     
     high_quality_value = candidates[candidates['piotroski_f_score'] >= 5].copy()
     high_quality_value['final_rank'] = high_quality_value['composite_rank_score'].rank(ascending=True)
     
     output_file = 'data/top_quality_value_stocks.csv'
-    candidates.to_csv(output_file, index=False)
+    write_artifact(candidates, output_file)
     
     elapsed = time.time() - start_time
+    DataProvider.report_health()
     print(f"\n✅ DONE! Saved results to {output_file}")
     print(f"⏱️ Session Runtime: {elapsed/60:.2f} minutes")
 
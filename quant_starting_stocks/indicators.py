@@ -0,0 +1,231 @@
+import os
+import json
+import math
+import uuid
+import threading
+from collections import deque
+
+# --- CONFIGURATION ---
+# Next to the price store in the repository's data/ folder, whatever directory the script runs from
+STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'prices',
+                          'indicator_state.json')
+
+
+class WilderRSI:
+    """
+    Streaming RSI with O(1) updates. Matches pandas' ewm(com=window-1, min_periods=window).mean()
+    (adjust=True): each average is a decayed sum of observations over a decayed sum of weights.
+    Like the pandas path, the first bar (and any bar next to a missing close) counts as gain = loss = 0.
+    """
+
+    def __init__(self, window=14):
+        self.window = window
+        self.decay = 1.0 - 1.0 / window
+        self.prev = None
+        self.s_gain = 0.0
+        self.s_loss = 0.0
+        self.weight = 0.0
+        self.count = 0
+
+    def _moves(self, close):
+        if self.prev is None or math.isnan(self.prev) or math.isnan(close):
+            return 0.0, 0.0
+        delta = close - self.prev
+        return (delta if delta > 0 else 0.0), (-delta if delta < 0 else 0.0)
+
+    def update(self, close):
+        gain, loss = self._moves(close)
+        self.s_gain = gain + self.decay * self.s_gain
+        self.s_loss = loss + self.decay * self.s_loss
+        self.weight = 1.0 + self.decay * self.weight
+        self.count += 1
+        self.prev = close
+
+    def peek(self, close):
+        """RSI after one more bar, without changing the state."""
+        gain, loss = self._moves(close)
+        return self._rsi(gain + self.decay * self.s_gain, loss + self.decay * self.s_loss,
+                         1.0 + self.decay * self.weight, self.count + 1)
+
+    @property
+    def value(self):
+        return self._rsi(self.s_gain, self.s_loss, self.weight, self.count)
+
+    def _rsi(self, s_gain, s_loss, weight, count):
+        if count < self.window:
+            return math.nan
+        avg_gain, avg_loss = s_gain / weight, s_loss / weight
+        if avg_loss == 0:
+            return math.nan if avg_gain == 0 else 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    def to_dict(self):
+        return {'prev': self.prev, 's_gain': self.s_gain, 's_loss': self.s_loss,
+                'weight': self.weight, 'count': self.count}
+
+    def load(self, d):
+        self.prev, self.s_gain, self.s_loss = d['prev'], d['s_gain'], d['s_loss']
+        self.weight, self.count = d['weight'], d['count']
+
+
+class RollingSMA:
+    """
+    Streaming simple moving average over a ring buffer. Like rolling(window).mean(), the value is NaN
+    until the window is full or while it holds a missing close. The running sum is re-summed from the
+    buffer once per window so float drift stays bounded (amortised O(1)).
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = deque(maxlen=window)
+        self.total = 0.0
+        self.missing = 0
+        self._since_resum = 0
+
+    def update(self, x):
+        if len(self.buffer) == self.window:
+            old = self.buffer[0]
+            if math.isnan(old):
+                self.missing -= 1
+            else:
+                self.total -= old
+        self.buffer.append(x)
+        if math.isnan(x):
+            self.missing += 1
+        else:
+            self.total += x
+        self._since_resum += 1
+        if self._since_resum >= self.window:
+            self.total = math.fsum(v for v in self.buffer if not math.isnan(v))
+            self._since_resum = 0
+
+    def peek(self, x):
+        """SMA after one more bar, without changing the state."""
+        n = len(self.buffer) + 1
+        total, missing = self.total, self.missing + math.isnan(x)
+        if n > self.window:
+            old = self.buffer[0]
+            n -= 1
+            if math.isnan(old):
+                missing -= 1
+            else:
+                total -= old
+        if n < self.window or missing:
+            return math.nan
+        return (total + x) / self.window
+
+    @property
+    def value(self):
+        if len(self.buffer) < self.window or self.missing:
+            return math.nan
+        return self.total / self.window
+
+    def to_dict(self):
+        return {'buffer': list(self.buffer)}
+
+    def load(self, d):
+        self.buffer.clear()
+        self.total, self.missing, self._since_resum = 0.0, 0, 0
+        for v in d['buffer']:
+            self.update(v)
+
+
+class TickerIndicators:
+    """RSI-14, SMA-50 and SMA-200 state for one ticker, plus the last bar folded into it."""
+
+    def __init__(self):
+        self.rsi = WilderRSI(14)
+        self.sma_50 = RollingSMA(50)
+        self.sma_200 = RollingSMA(200)
+        self.last_time = None
+        self.last_close = None
+
+    def update(self, close, time):
+        for ind in (self.rsi, self.sma_50, self.sma_200):
+            ind.update(close)
+        self.last_time, self.last_close = time, close
+
+    def matches(self, close):
+        """True if `close` is still the close folded in at last_time (NaN gaps match NaN)."""
+        if self.last_close is None:
+            return False   # State from before last_close was kept: cannot tell, rebuild once
+        if math.isnan(close) or math.isnan(self.last_close):
+            return math.isnan(close) and math.isnan(self.last_close)
+        return close == self.last_close
+
+    def peek(self, close):
+        return {'RSI': self.rsi.peek(close), 'SMA_50': self.sma_50.peek(close), 'SMA_200': self.sma_200.peek(close)}
+
+    def to_dict(self):
+        return {'last_time': self.last_time, 'last_close': self.last_close, 'rsi': self.rsi.to_dict(),
+                'sma_50': self.sma_50.to_dict(), 'sma_200': self.sma_200.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d):
+        obj = cls()
+        obj.last_time = d['last_time']
+        obj.last_close = d.get('last_close')
+        obj.rsi.load(d['rsi'])
+        obj.sma_50.load(d['sma_50'])
+        obj.sma_200.load(d['sma_200'])
+        return obj
+
+
+class IndicatorBook:
+    """
+    Persisted per-ticker indicator state.
+    Every bar except the newest is folded into the state. The newest bar is only peeked,
+    because today's bar can still be revised by the next price sync.
+    """
+
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self._states = None
+        self._lock = threading.Lock()
+
+    def latest(self, ticker, times, closes):
+        """
+        Indicator values at the last bar of (times, closes), oldest first.
+        Only bars newer than the stored state are processed. The state is rebuilt if the
+        history no longer contains the last bar it saw (a gap, or a rewritten history), or that
+        bar's close changed (history adjusted for a split or stock dividend).
+        """
+        times = [str(t)[:10] for t in times]
+        closes = [float(c) for c in closes]
+        if not closes:
+            return None
+        states = self._load()
+        with self._lock:
+            state = states.get(ticker)
+            seen = times.index(state.last_time) if state is not None and state.last_time in times[:-1] else None
+            if seen is None or not state.matches(closes[seen]):
+                state, start = TickerIndicators(), 0
+            else:
+                start = seen + 1
+            for t, c in zip(times[start:-1], closes[start:-1]):
+                state.update(c, t)
+            states[ticker] = state
+        values = state.peek(closes[-1])
+        values['close'] = closes[-1]
+        return values
+
+    def save(self):
+        if self._states is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        with self._lock:
+            payload = {t: s.to_dict() for t, s in self._states.items()}
+        with open(tmp, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp, self.path)
+
+    def _load(self):
+        with self._lock:
+            if self._states is None:
+                try:
+                    with open(self.path, 'r') as f:
+                        self._states = {t: TickerIndicators.from_dict(d) for t, d in json.load(f).items()}
+                except (OSError, ValueError, KeyError):
+                    self._states = {}
+            return self._states
@@ -0,0 +1,225 @@
+import os
+import glob
+import json
+import time
+import uuid
+import threading
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.dataset as ds
+
+# --- CONFIGURATION ---
+# Anchored to the repository's data/ folder, so every script shares one store whatever directory it runs from
+PRICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'prices')
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+FRESH_SECONDS = 3600   # A ticker synced this recently is not re-checked at all
+OVERLAP_DAYS = 10      # A delta sync re-reads this many days of final bars to catch adjusted history
+ADJUST_TOLERANCE = 0.005   # Relative close difference on a re-read bar that means the history was adjusted
+
+SCHEMA = pa.schema([
+    ('ticker', pa.string()),
+    ('time', pa.timestamp('ms')),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('volume', pa.float64()),
+    ('written_at', pa.int64()),
+])
+
+
+class PriceStore:
+    """
+    Parquet store for daily OHLCV bars with a per-ticker sync record.
+    Layout: {root}/bars/part-*.parquet plus {root}/sync.json ({ticker: {'first', 'last', 'synced_at'}}).
+    'first'..'last' is the date range already requested from the API, so a run only asks for what is missing.
+    Re-fetched bars for the same (ticker, day) replace older ones (today's bar may have been partial).
+    VCI history is adjusted for splits and stock dividends: when a re-read bar no longer matches the
+    stored close, the ticker's older bars are hidden ('reset_at' in its sync record) and it is backfilled.
+    """
+
+    def __init__(self, root=PRICE_DIR):
+        self.root = root
+        self._frames = {}
+        self._sync = None
+        self._lock = threading.Lock()
+
+    # --- Sync planning ---
+    def plan(self, tickers, days, now=None):
+        """
+        Returns {ticker: (start, end)} date strings still to fetch so that each ticker covers
+        the last `days` calendar days. Tickers synced within FRESH_SECONDS are skipped.
+        """
+        now = now or datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        want_from = (now - timedelta(days=days)).strftime('%Y-%m-%d')
+        sync = self._sync_state()
+        plan = {}
+        for ticker in dict.fromkeys(tickers):
+            rec = sync.get(ticker)
+            if rec is None or 'first' not in rec or want_from < rec['first']:
+                plan[ticker] = (want_from, today)           # Nothing stored, reset, or the window grew: full backfill
+            elif time.time() - rec['synced_at'] > FRESH_SECONDS:
+                # Delta: re-read the last few final bars (to check for adjustments) and append newer ones
+                overlap = (datetime.strptime(rec['last'], '%Y-%m-%d') - timedelta(days=OVERLAP_DAYS)).strftime('%Y-%m-%d')
+                plan[ticker] = (max(rec['first'], overlap), today)
+        return plan
+
+    def record(self, bars, plan):
+        """
+        Appends fetched bars ({ticker: DataFrame or None}) and marks the planned ranges as synced.
+        Returns the tickers whose stored history turned out to be adjusted since: their old bars are
+        dropped and the next plan() backfills them in full.
+        """
+        if not any(t in bars for t in plan):
+            return []   # Nothing came back: no bars to add and no sync record to move
+        fetched = {t: _normalize(t, df) for t, df in bars.items() if df is not None and not df.empty}
+        fetched = {t: p for t, p in fetched.items() if not p.empty}
+        adjusted = self._adjusted(fetched, plan)
+        if fetched:
+            table = pa.Table.from_pandas(pd.concat(fetched.values(), ignore_index=True), schema=SCHEMA,
+                                         preserve_index=False)
+            os.makedirs(self._bars_dir(), exist_ok=True)
+            pq.write_table(table, os.path.join(self._bars_dir(), f"part-{uuid.uuid4().hex}.parquet"),
+                           compression='zstd')
+
+        with self._lock:
+            sync = self._sync_state()
+            now = time.time()
+            for ticker, (start, end) in plan.items():
+                if ticker not in bars:
+                    continue   # Fetch failed: leave the record alone so the next run retries
+                rec = sync.get(ticker) or {}
+                if ticker in adjusted:
+                    # Bars written before the adjusted ones are stale; 'first' is gone, so plan() backfills
+                    sync[ticker] = {'reset_at': int(fetched[ticker]['written_at'].min())}
+                else:
+                    first = min(rec.get('first', start), start)
+                    sync[ticker] = {**rec, 'first': first, 'last': end, 'synced_at': now}
+                self._frames.pop(ticker, None)
+            self._write_sync(sync)
+        return adjusted
+
+    # --- Reads ---
+    def history(self, ticker, days=None):
+        return self.load_many([ticker], days).get(ticker)
+
+    def load_many(self, tickers, days=None):
+        """Returns {ticker: DataFrame(time, open, high, low, close, volume)}, oldest bar first."""
+        tickers = list(dict.fromkeys(tickers))
+        with self._lock:
+            missing = [t for t in tickers if t not in self._frames]
+        if missing:
+            loaded = self._read(missing)
+            with self._lock:
+                self._frames.update(loaded)
+
+        cutoff = pd.Timestamp(datetime.now() - timedelta(days=days)).normalize() if days else None
+        out = {}
+        with self._lock:
+            for t in tickers:
+                df = self._frames.get(t)
+                if df is None:
+                    continue
+                out[t] = df[df['time'] >= cutoff].reset_index(drop=True) if cutoff is not None else df
+        return out
+
+    def compact(self):
+        """Folds all parts into one ticker/time-sorted file, dropping superseded bars."""
+        old_files = glob.glob(os.path.join(self._bars_dir(), '*.parquet'))
+        if len(old_files) <= 1:
+            return
+        df = ds.dataset(old_files, format='parquet', schema=SCHEMA).to_table().to_pandas()
+        df = _keep_latest(self._drop_reset(df)).sort_values(['ticker', 'time'], kind='stable')
+        table = pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+        pq.write_table(table, os.path.join(self._bars_dir(), f"part-{uuid.uuid4().hex}.parquet"),
+                       compression='zstd', row_group_size=256_000)
+        for path in old_files:
+            os.remove(path)
+
+    # --- Internals ---
+    def _adjusted(self, fetched, plan):
+        """Delta-synced tickers whose re-read final bars disagree with the stored closes."""
+        sync = self._sync_state()
+        delta = [t for t in fetched if t in plan and 'last' in sync.get(t, {})]
+        stored = self.load_many(delta) if delta else {}
+        adjusted = []
+        for ticker in delta:
+            old = stored.get(ticker)
+            if old is None:
+                continue
+            # Bars from before the last sync day were final when stored; that day's own bar may have been partial
+            final = old[old['time'] < pd.Timestamp(sync[ticker]['last'])]
+            both = final.merge(fetched[ticker][['time', 'close']], on='time', suffixes=('_old', '_new'))
+            if both.empty:
+                continue
+            change = (both['close_new'] - both['close_old']).abs() / both['close_old'].abs().clip(lower=1e-9)
+            if (change > ADJUST_TOLERANCE).any():
+                adjusted.append(ticker)
+        return adjusted
+
+    def _drop_reset(self, df):
+        """Drops bars written before their ticker's history was last found adjusted."""
+        resets = {t: rec['reset_at'] for t, rec in self._sync_state().items() if 'reset_at' in rec}
+        if not resets or df.empty:
+            return df
+        cutoff = df['ticker'].map(resets)
+        return df[cutoff.isna() | (df['written_at'] >= cutoff)]
+
+    def _bars_dir(self):
+        return os.path.join(self.root, 'bars')
+
+    def _sync_path(self):
+        return os.path.join(self.root, 'sync.json')
+
+    def _sync_state(self):
+        if self._sync is None:
+            try:
+                with open(self._sync_path(), 'r') as f:
+                    self._sync = json.load(f)
+            except (OSError, ValueError):
+                self._sync = {}
+        return self._sync
+
+    def _write_sync(self, sync):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self._sync_path() + f".{uuid.uuid4().hex}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(sync, f)
+        os.replace(tmp, self._sync_path())
+
+    def _read(self, tickers):
+        files = glob.glob(os.path.join(self._bars_dir(), '*.parquet'))
+        if not files:
+            return {}
+        table = ds.dataset(files, format='parquet', schema=SCHEMA).to_table(
+            filter=ds.field('ticker').isin(tickers))
+        if table.num_rows == 0:
+            return {}
+        df = _keep_latest(self._drop_reset(table.to_pandas())).sort_values(['ticker', 'time'], kind='stable')
+        if df.empty:
+            return {}
+        return {t: g[['time', *BAR_COLUMNS]].reset_index(drop=True) for t, g in df.groupby('ticker', sort=False)}
+
+
+# --- FORMAT HELPERS ---
+def _normalize(ticker, df):
+    """API frame -> store rows. Accepts 'time'/'Time'/'date' and lower or capitalised OHLCV names."""
+    cols = {str(c).lower(): c for c in df.columns}
+    time_col = next((cols[c] for c in ('time', 'date', 'tradingdate') if c in cols), None)
+    if time_col is None or 'close' not in cols:
+        return pd.DataFrame(columns=SCHEMA.names)
+    out = pd.DataFrame({'ticker': ticker, 'time': pd.to_datetime(df[time_col]).dt.normalize()})
+    for c in BAR_COLUMNS:
+        out[c] = pd.to_numeric(df[cols[c]], errors='coerce').to_numpy() if c in cols else np.nan
+    out['written_at'] = time.time_ns()
+    return out.dropna(subset=['close'])
+
+
+def _keep_latest(df):
+    """Only the most recent write of each (ticker, day) survives."""
+    df = df.sort_values('written_at', kind='stable')
+    return df.drop_duplicates(['ticker', 'time'], keep='last')
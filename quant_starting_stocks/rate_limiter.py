@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import random
+import tempfile
+import threading
+
+try:
+    import fcntl  # POSIX file locks for cross-process state
+except ImportError:
+    fcntl = None
+
+# --- CONFIGURATION ---
+STATE_DIR = tempfile.gettempdir()   # Shared by every local process, whatever its working directory
+STATE_TTL = 600                     # Shared state older than this is from a previous session and is reset
+THROTTLE_MARKERS = ("429", "502", "quá nhiều request")
+
+
+def is_throttled(error):
+    """True when an exception means the endpoint is pushing back (rate limit / overloaded gateway)."""
+    msg = str(error)
+    return any(marker in msg for marker in THROTTLE_MARKERS)
+
+
+class AdaptiveLimiter:
+    """
+    Process-wide pacing for one API.
+    - Token bucket: request starts per second, shared with other local processes through a locked state file.
+    - AIMD: the bucket rate and the in-flight cap grow additively on success and are cut
+      multiplicatively on 429/502 (rate and cap) or when latency drifts above target (cap only).
+    A throttle also sets a shared cooldown, so every thread and process pauses together.
+    """
+
+    def __init__(self, name, rate=4.0, min_rate=0.5, max_rate=20.0, burst=4,
+                 concurrency=2, max_concurrency=8, latency_target=3.0, state_dir=STATE_DIR):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self._bucket = _SharedBucket(os.path.join(state_dir, f"{name}_ratelimit.json"),
+                                     rate, min_rate, max_rate, burst)
+        self._limit = float(concurrency)
+        self._in_flight = 0
+        self._latency = None
+        self._last_decrease = 0.0
+        self._streak = 0
+        self._cond = threading.Condition()
+        self.stats = {'calls': 0, 'throttled': 0, 'errors': 0, 'slow_cuts': 0}
+
+    # --- Public API ---
+    def call(self, func, *args, **kwargs):
+        """Runs func under the limiter. Exceptions are recorded, then re-raised to the caller."""
+        self.acquire()
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.release(time.perf_counter() - start, throttled=is_throttled(e), failed=True)
+            raise
+        self.release(time.perf_counter() - start)
+        return result
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+        while True:
+            wait = self._bucket.take()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def release(self, latency, throttled=False, failed=False):
+        now = time.monotonic()
+        with self._cond:
+            self._in_flight -= 1
+            self.stats['calls'] += 1
+            self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+
+            if throttled:
+                self.stats['throttled'] += 1
+                self._streak += 1
+                self._decrease(now, 0.5)
+                self._bucket.throttle(min(30.0, 2 ** self._streak + random.uniform(0, 1)))
+            elif failed:
+                self.stats['errors'] += 1
+            elif self._latency > self.latency_target:
+                if self._decrease(now, 0.8):
+                    self.stats['slow_cuts'] += 1
+            else:
+                self._streak = 0
+                self._limit = min(self.max_concurrency, self._limit + 1.0 / self._limit)
+                self._bucket.grow()
+            self._cond.notify_all()
+
+    @property
+    def concurrency(self):
+        return int(self._limit)
+
+    def report(self):
+        s = self.stats
+        print(f"  [{self.name}] {s['calls']} calls ({s['throttled']} throttled, {s['errors']} errors) | "
+              f"rate {self._bucket.rate:.1f}/s | in-flight cap {self.concurrency}/{self.max_concurrency}")
+
+    # --- Internals ---
+    def _decrease(self, now, factor):
+        # At most one cut per second: a burst of 429s from one overload is one congestion event
+        if now - self._last_decrease < 1.0:
+            return False
+        self._last_decrease = now
+        self._limit = max(1.0, self._limit * factor)
+        return True
+
+
+class _SharedBucket:
+    """Token bucket whose state lives in a small JSON file guarded by an exclusive lock."""
+
+    def __init__(self, path, rate, min_rate, max_rate, burst):
+        self.path = path
+        self.initial = {'rate': rate, 'tokens': float(burst), 'updated': 0.0, 'cooldown_until': 0.0}
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.rate = rate
+        self._local = dict(self.initial)   # Used when file locks are unavailable
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Consumes one token. Returns 0 on success, else seconds to wait before retrying."""
+        def _take(state, now):
+            if now < state['cooldown_until']:
+                return state['cooldown_until'] - now
+            if state['tokens'] >= 1:
+                state['tokens'] -= 1
+                return 0.0
+            return (1 - state['tokens']) / state['rate']
+        return self._update(_take)
+
+    def grow(self):
+        def _grow(state, now):
+            state['rate'] = min(self.max_rate, state['rate'] + 0.1)
+        self._update(_grow)
+
+    def throttle(self, cooldown):
+        def _throttle(state, now):
+            state['rate'] = max(self.min_rate, state['rate'] * 0.5)
+            state['tokens'] = 0.0
+            state['cooldown_until'] = max(state['cooldown_until'], now + cooldown)
+        self._update(_throttle)
+
+    def _update(self, fn):
+        with self._lock:
+            if fcntl is None:
+                return self._apply(self._local, fn)
+            with open(self.path, 'a+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or '{}')
+                    except ValueError:
+                        state = {}
+                    result = self._apply(state, fn)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+            return result
+
+    def _apply(self, state, fn):
+        now = time.time()
+        if now - state.get('updated', 0.0) > STATE_TTL:
+            state.clear()
+            state.update(self.initial)
+            state['updated'] = now
+        state['tokens'] = min(self.burst, state['tokens'] + (now - state['updated']) * state['rate'])
+        state['updated'] = now
+        result = fn(state, now)
+        self.rate = state['rate']
+        return result
+
+
+# One limiter for every VCI/vnstock call in this process (and, via the state file, on this machine)
+VNSTOCK = AdaptiveLimiter('vnstock')
@@ -0,0 +1,246 @@
+import os
+import glob
+import time
+import uuid
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.dataset as ds
+
+# --- CONFIGURATION ---
+# Anchored to the repository's data/ folder, so every script shares one store whatever directory it runs from
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+STORE_DIR = os.path.join(DATA_DIR, 'statements')
+LEGACY_CACHE_DIR = os.path.join(DATA_DIR, 'cache')   # Old layout: one {symbol}_{bs|is|cf}.json per report
+REPORT_TYPES = ('bs', 'is', 'cf')
+PERIOD_COLUMNS = ('yearReport', 'Năm')
+
+# One row per statement cell. Long format keeps each ticker's own column order
+# (banks and non-banks have different schemas) and compresses very well.
+SCHEMA = pa.schema([
+    ('ticker', pa.string()),
+    ('period', pa.string()),
+    ('row', pa.int32()),
+    ('col', pa.int32()),
+    ('field', pa.string()),
+    ('kind', pa.string()),      # 'f' float, 'i' integer, 's' text
+    ('value', pa.float64()),
+    ('text', pa.string()),
+    ('written_at', pa.int64()),
+])
+
+
+class StatementStore:
+    """
+    Compressed, partitioned Parquet store for yearly financial statements.
+    Layout: {root}/report_type={bs|is|cf}/part-*.parquet, keyed by (ticker, report type, period).
+    Later writes for the same ticker win; compact() folds the parts into one file per report type.
+    """
+
+    def __init__(self, root=STORE_DIR, legacy_dir=LEGACY_CACHE_DIR):
+        self.root = root
+        self.legacy_dir = legacy_dir
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    # --- Public API ---
+    def load(self, ticker, report_type):
+        """Returns one statement as a DataFrame (latest row first), or None."""
+        key = (ticker, report_type)
+        with self._lock:
+            if key in self._frames:
+                return self._frames[key]
+        return self.load_many([ticker], [report_type]).get(key)
+
+    def load_many(self, tickers, report_types=REPORT_TYPES):
+        """
+        Bulk load: one dataset scan per report type for all requested tickers.
+        Returns {(ticker, report_type): DataFrame} for every statement found.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        result = {}
+        for r_type in report_types:
+            frames = self._read_partition(r_type, tickers)
+            missing = [t for t in tickers if (t, r_type) not in frames]
+            frames.update(self._import_legacy(missing, r_type))
+            result.update(frames)
+
+        with self._lock:
+            self._frames.update(result)
+        return result
+
+    def save(self, ticker, report_type, df):
+        self.save_many({(ticker, report_type): df})
+
+    def save_many(self, frames):
+        """Persists {(ticker, report_type): DataFrame}, one Parquet file per report type."""
+        by_type = {}
+        for (ticker, r_type), df in frames.items():
+            if df is None or df.empty:
+                continue
+            by_type.setdefault(r_type, []).append(_to_long(ticker, df))
+
+        for r_type, parts in by_type.items():
+            table = pa.Table.from_pandas(pd.concat(parts, ignore_index=True), schema=SCHEMA, preserve_index=False)
+            part_dir = self._partition_dir(r_type)
+            os.makedirs(part_dir, exist_ok=True)
+            pq.write_table(table, os.path.join(part_dir, f"part-{uuid.uuid4().hex}.parquet"), compression='zstd')
+
+        with self._lock:
+            for key, df in frames.items():
+                if df is not None and not df.empty:
+                    self._frames[key] = df
+
+    def tickers(self, report_type):
+        """Tickers that have a stored statement of this type."""
+        part_dir = self._partition_dir(report_type)
+        if not glob.glob(os.path.join(part_dir, '*.parquet')):
+            return []
+        table = ds.dataset(part_dir, format='parquet').to_table(columns=['ticker'])
+        return sorted(set(table.column('ticker').to_pylist()))
+
+    def compact(self):
+        """Rewrites each report type as a single ticker-sorted file, dropping superseded writes."""
+        for r_type in REPORT_TYPES:
+            part_dir = self._partition_dir(r_type)
+            old_files = glob.glob(os.path.join(part_dir, '*.parquet'))
+            if len(old_files) <= 1:
+                continue
+
+            df = ds.dataset(old_files, format='parquet').to_table().to_pandas()
+            df = _keep_latest(df).sort_values(['ticker', 'row', 'col'], kind='stable')
+            table = pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+            pq.write_table(table, os.path.join(part_dir, f"part-{uuid.uuid4().hex}.parquet"),
+                           compression='zstd', row_group_size=256_000)
+            for path in old_files:
+                os.remove(path)
+
+    def import_legacy_cache(self):
+        """One-off migration of every {symbol}_{type}.json in the legacy cache directory."""
+        pattern = os.path.join(self.legacy_dir, '*_*.json')
+        by_type = {}
+        for path in glob.glob(pattern):
+            symbol, r_type = os.path.basename(path)[:-len('.json')].rsplit('_', 1)
+            if r_type in REPORT_TYPES:
+                by_type.setdefault(r_type, []).append(symbol)
+        for r_type, symbols in by_type.items():
+            self._import_legacy(symbols, r_type)
+        self.compact()
+
+    # --- Internals ---
+    def _partition_dir(self, report_type):
+        return os.path.join(self.root, f"report_type={report_type}")
+
+    def _read_partition(self, report_type, tickers):
+        part_dir = self._partition_dir(report_type)
+        files = glob.glob(os.path.join(part_dir, '*.parquet'))
+        if not files or not tickers:
+            return {}
+
+        dataset = ds.dataset(files, format='parquet', schema=SCHEMA)
+        table = dataset.to_table(filter=ds.field('ticker').isin(tickers))
+        if table.num_rows == 0:
+            return {}
+
+        df = _keep_latest(table.to_pandas())
+        return {(ticker, report_type): wide for ticker, wide in _split_wide(df)}
+
+    def _import_legacy(self, tickers, report_type):
+        """Reads old JSON cache files and writes them into the store in one batch."""
+        found = {}
+        for ticker in tickers:
+            path = os.path.join(self.legacy_dir, f"{ticker}_{report_type}.json")
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r') as f:
+                    df = pd.read_json(f)
+            except ValueError:
+                continue
+            if df is not None and not df.empty:
+                found[(ticker, report_type)] = df
+        if found:
+            self.save_many(found)
+        return found
+
+
+# --- FORMAT HELPERS ---
+def _column_kind(series):
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return 'i'
+    if pd.api.types.is_numeric_dtype(series):
+        return 'f'
+    return 's'
+
+
+def _to_long(ticker, df):
+    """Wide statement (rows = periods, columns = fields) -> one row per cell."""
+    n_rows, n_cols = df.shape
+    period_col = next((c for c in PERIOD_COLUMNS if c in df.columns), None)
+    periods = df[period_col].astype(str).tolist() if period_col else [str(i) for i in range(n_rows)]
+
+    kinds = [_column_kind(df.iloc[:, j]) for j in range(n_cols)]
+    values = np.full((n_rows, n_cols), np.nan)
+    texts = np.full((n_rows, n_cols), None, dtype=object)
+    for j, kind in enumerate(kinds):
+        col = df.iloc[:, j]
+        if kind == 's':
+            texts[:, j] = [None if pd.isna(v) else str(v) for v in col]
+        else:
+            values[:, j] = col.to_numpy(dtype=float, na_value=np.nan)
+
+    return pd.DataFrame({
+        'ticker': ticker,
+        'period': np.repeat(periods, n_cols),
+        'row': np.repeat(np.arange(n_rows, dtype=np.int32), n_cols),
+        'col': np.tile(np.arange(n_cols, dtype=np.int32), n_rows),
+        'field': np.tile(np.asarray([str(c) for c in df.columns], dtype=object), n_rows),
+        'kind': np.tile(np.asarray(kinds, dtype=object), n_rows),
+        'value': values.ravel(),
+        'text': texts.ravel(),
+        'written_at': time.time_ns(),
+    })
+
+
+def _keep_latest(df):
+    """Only the most recent write of each ticker survives."""
+    latest = df.groupby('ticker')['written_at'].transform('max')
+    return df[df['written_at'] == latest]
+
+
+def _split_wide(df):
+    """Yields (ticker, wide DataFrame) for every ticker in a long-format frame."""
+    order = np.argsort(df['ticker'].to_numpy(), kind='stable')
+    arr = {c: df[c].to_numpy()[order] for c in ('ticker', 'row', 'col', 'field', 'kind', 'value', 'text')}
+    bounds = np.flatnonzero(arr['ticker'][1:] != arr['ticker'][:-1]) + 1
+    for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(order)]):
+        part = {c: a[start:end] for c, a in arr.items()}
+        yield part['ticker'][0], _to_wide(part)
+
+
+def _to_wide(part):
+    """Inverse of _to_long for a single ticker (dict of aligned arrays)."""
+    rows, cols = part['row'], part['col']
+    n_rows, n_cols = rows.max() + 1, cols.max() + 1
+
+    names = np.empty(n_cols, dtype=object)
+    kinds = np.empty(n_cols, dtype=object)
+    names[cols] = part['field']
+    kinds[cols] = part['kind']
+    values = np.full((n_rows, n_cols), np.nan)
+    values[rows, cols] = part['value']
+
+    # One float block for the numeric cells, then patch in the few text/integer columns
+    out = pd.DataFrame(values, columns=list(names))
+    texts = None
+    for j in np.flatnonzero(kinds != 'f'):
+        if kinds[j] == 's':
+            if texts is None:
+                texts = np.full((n_rows, n_cols), None, dtype=object)
+                texts[rows, cols] = part['text']
+            out.isetitem(j, texts[:, j])
+        elif not np.isnan(values[:, j]).any():
+            out.isetitem(j, values[:, j].astype(np.int64))
+    return out
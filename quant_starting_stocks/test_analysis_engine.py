@@ -1,5 +1,6 @@
 import pandas as pd
-from analysis_engine import AnalysisEngine
+import numpy as np
+from analysis_engine import AnalysisEngine, piotroski_inputs, stack_inputs, score_piotroski_batch
 import time
 
 print("--- TESTING ANALYSIS ENGINE (THE BRAIN) ---\n")
@@ -70,4 +71,53 @@ try:
 except Exception as e:
     print(f"❌ CRITICAL ERROR IN PIOTROSKI: {e}")
 
+print("-" * 30)
+
+# ---------------------------------------------------------
+# TEST 3: BATCH F-SCORE == SCALAR F-SCORE (Using Fake Data)
+# ---------------------------------------------------------
+print("3. Testing Vectorized Piotroski against the Scalar Path...")
+print("   (Random statements incl. zeros, NaNs, missing columns and 1-year histories)")
+
+rng = np.random.default_rng(7)
+
+def fake_value():
+    roll = rng.random()
+    if roll < 0.05: return 0.0
+    if roll < 0.08: return np.nan
+    return float(rng.normal(1000, 600))
+
+def fake_statement(columns, years):
+    cols = [c for c in columns if rng.random() > 0.05]  # Sometimes a field is missing
+    data = {'ticker': ['FAKE'] * years, 'yearReport': list(range(2024, 2024 - years, -1))}
+    for c in cols:
+        data[c] = [fake_value() for _ in range(years)]
+    return pd.DataFrame(data)
+
+BS_COLS = ['TOTAL ASSETS (Bn. VND)', 'CURRENT ASSETS (Bn. VND)', 'Current liabilities (Bn. VND)',
+           'Long-term liabilities (Bn. VND)', 'Share capital (Bn. VND)']
+IS_COLS = ['Revenue (Bn. VND)', 'Cost of Goods Sold', 'Net Profit For the Year']
+CF_COLS = ['Net Cash Flows from Operating Activities']
+
+try:
+    cases = []
+    for _ in range(2000):
+        years = 1 if rng.random() < 0.05 else 5
+        cases.append((fake_statement(BS_COLS, years), fake_statement(IS_COLS, years), fake_statement(CF_COLS, years)))
+
+    scalar = np.array([AnalysisEngine.piotroski_from_statements(bs, is_, cf) for bs, is_, cf in cases])
+    batch = score_piotroski_batch(stack_inputs([piotroski_inputs(bs, is_, cf) for bs, is_, cf in cases]))
+
+    mismatches = int((scalar != batch['piotroski_f_score']).sum())
+    print(f"   Compared {len(cases)} stocks. Score distribution: {np.bincount(scalar, minlength=10).tolist()}")
+
+    if mismatches == 0:
+        print("   ✅ PASS: Batch scores match the scalar path exactly.")
+    else:
+        print(f"   ❌ FAIL: {mismatches} stocks scored differently.")
+    assert mismatches == 0
+
+except Exception as e:
+    print(f"❌ CRITICAL ERROR IN BATCH PIOTROSKI: {e}")
+
 print("\n--- TEST COMPLETE ---")
\ No newline at end of file
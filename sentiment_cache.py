@@ -0,0 +1,123 @@
+import os
+import re
+import math
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+
+# --- CONFIGURATION ---
+CACHE_FILE = 'data/sentiment_cache.sqlite'
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    """Unicode NFC + collapsed whitespace, so the same headline scraped twice maps to one key."""
+    return _SPACES.sub(' ', unicodedata.normalize('NFC', str(text))).strip()
+
+
+def text_key(text):
+    """Cache key of a title, or None for a missing (None/NaN) or blank one: those are never looked up."""
+    if text is None or (isinstance(text, float) and math.isnan(text)):
+        return None
+    text = normalize_text(text)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest() if text else None
+
+
+class SentimentCache:
+    """
+    Durable SQLite cache for the sentiment stage.
+    - translations: source-text hash -> English (independent of the model)
+    - scores: (source-text hash, model version) -> FinBERT score, so a model change re-scores everything
+    Hits and misses are counted per run.
+    """
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self.stats = {'score_hits': 0, 'score_misses': 0, 'translation_hits': 0, 'translation_misses': 0}
+        self._conn = None
+        self._lock = threading.Lock()
+
+    # --- Lookups ---
+    def get_scores(self, keys, model_version):
+        rows = self._select("SELECT key, score FROM scores WHERE model_version = ? AND key IN ({})",
+                            keys, prefix=(model_version,))
+        self._count('score', len(rows), len(set(keys)) - len(rows))
+        return rows
+
+    def get_translations(self, keys):
+        rows = self._select("SELECT key, english FROM translations WHERE key IN ({})", keys)
+        self._count('translation', len(rows), len(set(keys)) - len(rows))
+        return rows
+
+    # --- Writes ---
+    def put_translations(self, items):
+        """items: {key: (source_text, english)}"""
+        now = time.time()
+        self._write("INSERT OR REPLACE INTO translations (key, source_text, english, created_at) VALUES (?, ?, ?, ?)",
+                    [(k, normalize_text(src), eng, now) for k, (src, eng) in items.items()])
+
+    def put_scores(self, scores, model_version):
+        """scores: {key: score}"""
+        now = time.time()
+        self._write("INSERT OR REPLACE INTO scores (key, model_version, score, created_at) VALUES (?, ?, ?, ?)",
+                    [(k, model_version, float(v), now) for k, v in scores.items()])
+
+    def english_corpus(self, limit=None):
+        """Stored English headlines (the translation cache doubles as a benchmark corpus)."""
+        if not os.path.exists(self.path):
+            return []
+        with self._lock:
+            sql = "SELECT english FROM translations WHERE english IS NOT NULL ORDER BY created_at"
+            rows = self._db().execute(sql + (f" LIMIT {int(limit)}" if limit else "")).fetchall()
+        return [r[0] for r in rows]
+
+    def report(self, title="Cache"):
+        s = self.stats
+        print(f"  [{title}] scores: {s['score_hits']} hit / {s['score_misses']} miss | "
+              f"translations: {s['translation_hits']} hit / {s['translation_misses']} miss")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- Internals ---
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY, source_text TEXT, english TEXT, created_at REAL)""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS scores (
+                key TEXT, model_version TEXT, score REAL, created_at REAL,
+                PRIMARY KEY (key, model_version))""")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _select(self, sql, keys, prefix=()):
+        keys = list(dict.fromkeys(keys))
+        out = {}
+        with self._lock:
+            db = self._db()
+            for i in range(0, len(keys), 500):   # Stay under SQLite's bound-parameter limit
+                chunk = keys[i:i + 500]
+                out.update(db.execute(sql.format(','.join('?' * len(chunk))), (*prefix, *chunk)).fetchall())
+        return out
+
+    def _write(self, sql, rows):
+        if not rows:
+            return
+        with self._lock:
+            db = self._db()
+            db.executemany(sql, rows)
+            db.commit()
+
+    def _count(self, kind, hits, misses):
+        with self._lock:
+            self.stats[f'{kind}_hits'] += hits
+            self.stats[f'{kind}_misses'] += misses
@@ -1,70 +1,295 @@
 import pandas as pd
-from transformers import pipeline
-from deep_translator import GoogleTranslator
-from tqdm import tqdm
-import torch
 import os
+import sys
 import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from tqdm import tqdm
+from sentiment_cache import SentimentCache, text_key
+from translation import GoogleBatchTranslator, MAX_CHARS, pack_chunks
+from quant_starting_stocks.artifacts import read_artifact, write_artifact
 
 # --- CONFIGURATION ---
 NEWS_FILE = 'data/raw_news_data.csv'
 FORUM_FILE = 'data/f319_smart_filtered.csv'
 OUTPUT_FILE = 'data/processed_sentiment.csv'
+BATCH_SIZE = int(os.environ.get('FINBERT_BATCH_SIZE', 32))
+TORCH_THREADS = int(os.environ.get('FINBERT_THREADS', 0))   # 0 = leave torch's default
+MAX_TOKENS = 128   # Headlines are short; longer inputs are truncated
+TRANSLATE_WORKERS = int(os.environ.get('TRANSLATE_WORKERS', 2))   # Concurrent translation requests
+QUEUE_SIZE = 4 * BATCH_SIZE   # Translated headlines waiting for the model (backpressure beyond this)
+FLUSH_SECONDS = 0.5           # Score a partial batch if the translator keeps the model waiting this long
+SCORE_WORKERS = int(os.environ.get('FINBERT_WORKERS', 1))   # >1 = one model per process, batches sharded across them
+MODEL_NAME = 'ProsusAI/finbert'
+MODEL_REVISION = os.environ.get('FINBERT_REVISION', 'main')
+BACKEND = os.environ.get('FINBERT_BACKEND', 'torch')   # torch (fp32) | int8 | onnx, see finbert_backends
+# Cached scores are only reused for the same model (and the same backend: int8/ONNX scores differ slightly)
+MODEL_VERSION = f"{MODEL_NAME}@{MODEL_REVISION}" + ("" if BACKEND == 'torch' else f"+{BACKEND}")
+
+# Translations and scores survive between runs; only unseen headlines hit the translator and the model
+CACHE = SentimentCache()
+TRANSLATOR = GoogleBatchTranslator(source='auto', target='en')   # Any translation.Translator works here
+
+# --- MODEL (loaded on first use) ---
+# torch/transformers are only imported when something actually needs scoring, so reading or
+# aggregating cached scores (and importing this module in tests) never pays for the model.
+_classifier = None
+_classifier_lock = threading.Lock()
+_backends = {}
+
+def get_classifier():
+    """The FinBERT pipeline, built once per process (thread-safe)."""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                # Setup FinBERT (The Financial Brain)
+                print("Loading FinBERT Model (this might take a moment)...")
+                import torch
+                from transformers import pipeline
+                if TORCH_THREADS > 0:
+                    torch.set_num_threads(TORCH_THREADS)
+                device = 0 if torch.cuda.is_available() else -1
+                _classifier = pipeline('sentiment-analysis', model=MODEL_NAME, revision=MODEL_REVISION, device=device)
+    return _classifier
 
-# Setup FinBERT (The Financial Brain)
-print("Loading FinBERT Model (this might take a moment)...")
-device = 0 if torch.cuda.is_available() else -1
-classifier = pipeline('sentiment-analysis', model='ProsusAI/finbert', device=device)
+def get_backend(name=None):
+    """Batched inference backend around the loaded model, built once per process and name."""
+    name = name or BACKEND
+    if name not in _backends:
+        classifier = get_classifier()
+        with _classifier_lock:
+            if name not in _backends:
+                from finbert_backends import load_backend
+                _backends[name] = load_backend(name, classifier.tokenizer, classifier.model,
+                                               revision=MODEL_REVISION, threads=TORCH_THREADS)
+    return _backends[name]
 
-def translate_and_score(text_list, source_type):
+def warm_up():
+    """Loads (and if needed downloads) the model and runs one batch, so the first real call is fast."""
+    start = time.perf_counter()
+    get_backend()
+    loaded = time.perf_counter() - start
+    score_texts(["Company reports record quarterly profit", "Shares fall after earnings miss"])
+    print(f"✅ FinBERT ready: loaded in {loaded:.1f}s, first batch in {time.perf_counter() - start - loaded:.2f}s")
+
+def label_to_score(label, confidence):
+    """FinBERT label -> number: positive = +confidence, negative = -confidence, neutral = 0."""
+    if label == 'positive':
+        return 1 * confidence
+    elif label == 'negative':
+        return -1 * confidence
+    return 0
+
+def score_text(eng_text):
+    """Per-headline path: one pipeline call per text (reference for the batched path)."""
+    result = get_classifier()(eng_text)[0]
+    return label_to_score(result['label'], result['score'])
+
+def score_texts(texts, batch_size=BATCH_SIZE, backend=None):
+    """
+    Batched path: same labels and confidences as score_text, many headlines per forward pass.
+    Texts are sorted by token length and cut into buckets, so each batch pads only to its own
+    longest headline. Results come back in input order. `backend` overrides FINBERT_BACKEND.
+    """
+    if not texts:
+        return []
+    engine = get_backend(backend)
+    tokenizer, id2label = engine.tokenizer, engine.id2label
+    lengths = [len(ids) for ids in tokenizer(texts, truncation=True, max_length=MAX_TOKENS)['input_ids']]
+    order = np.argsort(lengths, kind='stable')
+
+    scores = [0] * len(texts)
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        enc = tokenizer([texts[i] for i in bucket], padding=True, truncation=True,
+                        max_length=MAX_TOKENS, return_tensors=engine.tensors)
+        probs = engine.probabilities(enc)
+        for i, row in zip(bucket, probs):
+            label_id = int(row.argmax())
+            scores[i] = label_to_score(id2label[label_id], float(row[label_id]))
+    return scores
+
+# --- PROCESS POOL (multi-core CPU scoring) ---
+# One torch process tops out well below the core count on small batches, so with SCORE_WORKERS > 1
+# each worker process loads its own model and scores whole batches. Threads are split between
+# workers (cores // workers each) so the pool never runs more compute threads than there are cores.
+_pool = None
+_pool_workers = 0
+
+def threads_per_worker(workers):
+    return TORCH_THREADS if TORCH_THREADS > 0 else max(1, (os.cpu_count() or 1) // workers)
+
+def _init_score_worker(threads, backend):
+    global TORCH_THREADS
+    TORCH_THREADS = threads
+    os.environ['OMP_NUM_THREADS'] = str(threads)   # Before torch is imported in this process
+    get_backend(backend)
+
+def _score_shard(texts, backend=None):
+    return score_texts(texts, backend=backend)
+
+def get_score_pool(workers=None):
+    """The worker pool (started once, models loaded up front), or None for in-process scoring."""
+    global _pool, _pool_workers
+    workers = SCORE_WORKERS if workers is None else workers
+    if workers <= 1:
+        return None
+    if _pool is None or _pool_workers != workers:
+        shutdown_score_pool()
+        threads = threads_per_worker(workers)
+        print(f"Starting {workers} FinBERT worker processes ({threads} torch threads each)...")
+        # spawn: each worker imports torch itself instead of inheriting a forked copy of this process
+        _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                                    initializer=_init_score_worker, initargs=(threads, BACKEND))
+        _pool_workers = workers
+    return _pool
+
+def shutdown_score_pool():
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+        _pool, _pool_workers = None, 0
+
+def score_texts_parallel(texts, workers=None, batch_size=BATCH_SIZE):
+    """score_texts sharded over the worker pool in batch-sized pieces. Results come back in input order."""
+    pool = get_score_pool(workers)
+    if pool is None:
+        return score_texts(texts, batch_size=batch_size)
+    # Sort by length first so each shard is a tight length bucket, then restore the input order
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    shards = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+    scores = [0] * len(texts)
+    for shard, values in zip(shards, pool.map(_score_shard, [[texts[i] for i in shard] for shard in shards])):
+        for i, value in zip(shard, values):
+            scores[i] = value
+    return scores
+
+def cached_scores_for(text_list):
+    """Scores already in the cache for this model version (NaN where unseen, 0 for blank titles). Never loads the model."""
+    keys = [text_key(t) for t in text_list]
+    found = CACHE.get_scores([k for k in keys if k is not None], MODEL_VERSION)
+    return [0 if k is None else found.get(k, np.nan) for k in keys]
+
+def _translate_worker(chunks, translated):
+    """Producer: translates one chunk at a time and hands each title to the model queue."""
+    while True:
+        try:
+            keys, texts = chunks.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            results = TRANSLATOR.translate_batch(texts)
+        except Exception:
+            results = [None] * len(texts)
+        for key, eng in zip(keys, results):
+            translated.put((key, eng))   # Blocks while the model is behind (backpressure)
+
+def stream_translate_score(to_translate, ready, source_type):
+    """
+    Producer/consumer pipeline: translation workers fill a bounded queue while this thread
+    drains it in model batches, so network waits and inference overlap. `to_translate` is
+    {key: Vietnamese title} and `ready` is {key: English} (already translated). Translations
+    and scores are written to the cache batch by batch. With SCORE_WORKERS > 1 batches go to the
+    process pool without blocking. Returns {key: score}; results are keyed, so arrival order
+    does not matter.
+    """
+    if not to_translate and not ready:
+        return {}   # Everything cached (or cached-only): do not start the score pool for nothing
+    translated = queue.Queue(maxsize=QUEUE_SIZE)
+    chunks = queue.Queue()
+    keys = list(to_translate)
+    for chunk in pack_chunks([to_translate[k] for k in keys], getattr(TRANSLATOR, 'max_chars', MAX_CHARS)):
+        chunks.put(([keys[i] for i in chunk], [to_translate[keys[i]] for i in chunk]))
+    workers = [threading.Thread(target=_translate_worker, args=(chunks, translated), daemon=True)
+               for _ in range(min(TRANSLATE_WORKERS, chunks.qsize()))]
+    for w in workers:
+        w.start()
+
+    scores = {}
+    pending = list(ready.items())
+    remaining = len(keys)
+    pool = get_score_pool()
+    inflight = []   # (batch, future) while the worker processes score
+    pbar = tqdm(total=len(keys) + len(ready), desc=f"Translate + Score {source_type}")
+
+    def store(batch, values):
+        new_scores = dict(zip([k for k, _ in batch], values))
+        CACHE.put_translations({k: (to_translate[k], eng) for k, eng in batch if k in to_translate})
+        CACHE.put_scores(new_scores, MODEL_VERSION)
+        scores.update(new_scores)
+        pbar.update(len(batch))
+
+    while remaining or pending:
+        if remaining and len(pending) < BATCH_SIZE:
+            try:
+                key, eng = translated.get(timeout=FLUSH_SECONDS if pending else None)
+            except queue.Empty:
+                key = None
+            if key is not None:
+                remaining -= 1
+                # If translation fails, assume Neutral (0) and retry next run
+                if isinstance(eng, str) and eng.strip():
+                    pending.append((key, eng))
+                else:
+                    pbar.update(1)
+                continue
+        # A full batch, the translator is slow, or all input is in: score what we have
+        batch, pending = pending[:BATCH_SIZE], pending[BATCH_SIZE:]
+        texts = [eng for _, eng in batch]
+        if pool is None:
+            store(batch, score_texts(texts))
+            continue
+        inflight.append((batch, pool.submit(_score_shard, texts)))
+        # Collect finished batches; wait on the oldest once every worker has two queued
+        while inflight and (inflight[0][1].done() or len(inflight) >= 2 * _pool_workers):
+            done_batch, future = inflight.pop(0)
+            store(done_batch, future.result())
+
+    for batch, future in inflight:
+        store(batch, future.result())
+    pbar.close()
+    for w in workers:
+        w.join()
+    return scores
+
+def translate_and_score(text_list, source_type, cached_only=False):
     """
     1. Translates Vietnamese -> English
     2. Runs FinBERT
     3. Returns list of scores (-1 to 1)
+    Every step is cached by headline hash: seen headlines are neither translated nor scored again.
+    With cached_only, unseen headlines score 0 and neither the translator nor the model is touched.
+    Missing or blank titles score 0 (neutral) without being translated, scored or cached.
     """
-    translator = GoogleTranslator(source='auto', target='en')
-    scores = []
-    
-    # We batch process to be polite to Google Translate API
-    for text in tqdm(text_list, desc=f"Processing {source_type}"):
-        try:
-            # 1. Translate
-            # Simple caching could go here, but for 50 stocks, direct is usually fine
-            eng_text = translator.translate(text)
-            
-            # 2. Analyze (FinBERT returns {label: 'positive', score: 0.99})
-            result = classifier(eng_text)[0]
-            
-            # 3. Convert to Number (-1, 0, 1) * Confidence
-            val = 0
-            if result['label'] == 'positive':
-                val = 1 * result['score']
-            elif result['label'] == 'negative':
-                val = -1 * result['score']
-            else: # Neutral
-                val = 0 
-                
-            scores.append(val)
-            
-            # Slight delay to avoid IP ban from Translator
-            time.sleep(0.3)
-            
-        except Exception as e:
-            # If translation fails, assume Neutral (0)
-            scores.append(0)
-            
-    return scores
+    keys = [text_key(t) for t in text_list]
+    unique = {k: t for k, t in zip(keys, text_list) if k is not None}   # Duplicate headlines are processed once
 
-def run_sentiment_analysis():
+    # 0. Cache lookups (scores per model version, translations per headline)
+    cached_scores = CACHE.get_scores(unique, MODEL_VERSION)
+    to_score = [] if cached_only else [k for k in unique if k not in cached_scores]
+    english = CACHE.get_translations(to_score)
+
+    # 1-3. Translate and score in an overlapped pipeline (cached translations go straight to the model)
+    ready = {k: english[k] for k in to_score if k in english}
+    to_translate = {k: unique[k] for k in to_score if k not in english}
+    cached_scores.update(stream_translate_score(to_translate, ready, source_type))
+
+    return [cached_scores.get(k, 0) for k in keys]
+
+def run_sentiment_analysis(cached_only=False):
     all_data = []
 
     # --- 1. PROCESS NEWS (Professional Sentiment) ---
     if os.path.exists(NEWS_FILE):
-        news_df = pd.read_csv(NEWS_FILE)
+        news_df = read_artifact(NEWS_FILE, columns=['ticker', 'date', 'news_title'])
         print(f"Loaded {len(news_df)} news articles.")
         
         # Filter for only relevant columns
-        scores = translate_and_score(news_df['news_title'].tolist(), "News")
+        scores = translate_and_score(news_df['news_title'].tolist(), "News", cached_only)
         news_df['sentiment_score'] = scores
         news_df['type'] = 'News'
         
@@ -75,10 +300,10 @@ def run_sentiment_analysis():
 
     # --- 2. PROCESS FORUM (Retail Sentiment) ---
     if os.path.exists(FORUM_FILE):
-        forum_df = pd.read_csv(FORUM_FILE)
+        forum_df = read_artifact(FORUM_FILE, columns=['ticker', 'original_title'])
         print(f"Loaded {len(forum_df)} forum discussions.")
         
-        scores = translate_and_score(forum_df['original_title'].tolist(), "Forum")
+        scores = translate_and_score(forum_df['original_title'].tolist(), "Forum", cached_only)
         forum_df['sentiment_score'] = scores
         forum_df['type'] = 'Forum'
         
@@ -93,11 +318,20 @@ def run_sentiment_analysis():
     # --- 3. COMBINE & SAVE ---
     if all_data:
         full_df = pd.concat(all_data, ignore_index=True)
-        full_df.to_csv(OUTPUT_FILE, index=False)
+        write_artifact(full_df, OUTPUT_FILE)
         print(f"\n✅ [SUCCESS] Processed sentiment for {len(full_df)} items.")
         print(f"Saved to {OUTPUT_FILE}")
+        CACHE.report("Sentiment cache")
+        t = TRANSLATOR.stats
+        print(f"  [Translator] {t['requests']} requests for {t['chunks']} chunks "
+              f"({t['fallback_chunks']} split back per title, {t['failed']} titles failed)")
+        shutdown_score_pool()
     else:
         print("❌ No data to process.")
 
 if __name__ == "__main__":
-    run_sentiment_analysis()
\ No newline at end of file
+    if '--warmup' in sys.argv:
+        warm_up()
+    else:
+        # --cached-only: rebuild the output from cached scores without loading torch
+        run_sentiment_analysis(cached_only='--cached-only' in sys.argv)
\ No newline at end of file
@@ -1,15 +1,23 @@
 import pandas as pd
-from vnstock import Vnstock
-from datetime import datetime, timedelta
 import os
-from tqdm import tqdm
+import sys
 import time
-import random
+from tqdm import tqdm
 import numpy as np
+from quant_starting_stocks.data_adapter import DataProvider, PRICES
+from quant_starting_stocks.indicators import IndicatorBook
+from quant_starting_stocks.artifacts import read_artifact, write_artifact
 
 # --- CONFIGURATION ---
 INPUT_FILE = 'data/target_list_with_forensics.csv'
 OUTPUT_FILE = 'data/final_target_list.csv'
+HISTORY_DAYS = 365
+MIN_BARS = 200  # Enough history for SMA 200
+MASTER_FILE = 'data/company_master_list.csv'
+MARKET_OUTPUT_FILE = 'data/market_technicals.csv'
+
+# Streaming RSI/SMA state per ticker, saved after each run
+INDICATORS = IndicatorBook()
 
 # --- 1. MANUAL TECHNICAL INDICATOR FUNCTIONS ---
 def calculate_sma(series, window):
@@ -34,48 +42,22 @@ def calculate_rsi(series, window=14):
 
 # --- 2. MAIN LOGIC ---
 
-def get_technical_indicators(ticker):
+def get_technical_indicators(ticker, history=None):
     """
-    Fetches 1 year of history using the Object-Oriented Vnstock method.
+    Computes indicators on 1 year of daily bars from the local price store.
+    The store is delta-synced first, so only bars newer than the last run are downloaded.
     """
     try:
-        # Define Dates (Last 365 days)
-        end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-        
-        # --- FIX: Use the Vnstock Class directly (Same as Step 1) ---
-        # We use source='TCBS' which is the standard for price history
-        stock = Vnstock().stock(symbol=ticker, source='VCI')
-        
-        # Fetch history (The method might be .history or .quote.history depending on version)
-        # We try the standard quote history first
-        try:
-            df = stock.quote.history(start=start_date, end=end_date, interval='1D')
-        except:
-            # Fallback for older versions or different API structures
-            return None
+        # Last 365 days (bulk-synced by run_technical_analysis, or synced here for one ticker)
+        df = history if history is not None else DataProvider.sync_price_history([ticker], days=HISTORY_DAYS).get(ticker)
         
-        if df is None or df.empty or len(df) < 200:
+        if df is None or df.empty or len(df) < MIN_BARS:
             return None # Not enough data for SMA 200
-
-        # Clean Data (Ensure 'close' is numeric)
-        # VNStock usually returns 'close' or 'Close'
-        if 'close' in df.columns:
-            df['close'] = pd.to_numeric(df['close'], errors='coerce')
-        elif 'Close' in df.columns:
-            df['close'] = pd.to_numeric(df['Close'], errors='coerce')
         
         # --- CALCULATIONS ---
-        
-        # RSI (14 period)
-        df['RSI'] = calculate_rsi(df['close'], window=14)
-        
-        # SMA (50 and 200 period)
-        df['SMA_50'] = calculate_sma(df['close'], window=50)
-        df['SMA_200'] = calculate_sma(df['close'], window=200)
-        
-        # Get the LATEST values
-        latest = df.iloc[-1]
+        # RSI-14, SMA-50 and SMA-200 come from persisted per-ticker state: only bars newer than
+        # the last run are folded in (calculate_rsi / calculate_sma remain the full-recompute reference)
+        latest = INDICATORS.latest(ticker, df['time'], df['close'])
         
         result = {
             'current_price': latest['close'],
@@ -91,6 +73,55 @@ def get_technical_indicators(ticker):
         # print(f"Error fetching TA for {ticker}: {e}")
         return None
 
+# --- 3. FULL-MARKET (WIDE MATRIX) MODE ---
+
+def build_close_matrix(histories, min_bars=MIN_BARS):
+    """
+    (bars x tickers) close matrix, right-aligned so the last row is every ticker's latest bar.
+    Each column is that ticker's own bar sequence (no calendar alignment), padded with NaN above,
+    which keeps the numbers identical to the per-ticker path. Returns (closes, padding mask).
+    """
+    tickers = [t for t, h in histories.items() if h is not None and len(h) >= min_bars]
+    lengths = np.array([len(histories[t]) for t in tickers], dtype=int)
+    n = int(lengths.max()) if len(lengths) else 0
+    matrix = np.full((n, len(tickers)), np.nan)
+    for j, t in enumerate(tickers):
+        matrix[n - lengths[j]:, j] = histories[t]['close'].to_numpy(dtype=float)
+    padding = np.arange(n)[:, None] < (n - lengths)[None, :]
+    return pd.DataFrame(matrix, columns=tickers), padding
+
+def calculate_market_indicators(closes, padding):
+    """RSI-14, SMA-50 and SMA-200 at the latest bar of every column, in one vectorized pass."""
+    # Same maths as calculate_rsi, but the padding rows are NaN so EWM starts at each ticker's first bar
+    delta = closes.diff()
+    gain = delta.where(delta > 0, 0).mask(padding)
+    loss = (-delta.where(delta < 0, 0)).mask(padding)
+    avg_gain = gain.ewm(com=13, min_periods=14).mean().iloc[-1]
+    avg_loss = loss.ewm(com=13, min_periods=14).mean().iloc[-1]
+    rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    return pd.DataFrame({
+        'ticker': closes.columns,
+        'current_price': closes.iloc[-1].to_numpy(),
+        'RSI_14': rsi.round(2).fillna(50).to_numpy(),
+        'SMA_50': calculate_sma(closes, 50).iloc[-1].round(2).to_numpy(),
+        'SMA_200': calculate_sma(closes, 200).iloc[-1].round(2).to_numpy(),
+    })
+
+def determine_signals(df):
+    """Column-wise determine_signal for a whole frame (same rules, same labels)."""
+    price, sma200, rsi = df['current_price'], df['SMA_200'], df['RSI_14']
+    is_uptrend = price > sma200
+    is_oversold = rsi < 40
+    conditions = [
+        price.isna() | sma200.isna() | rsi.isna(),
+        is_uptrend & is_oversold,
+        is_uptrend,
+        is_oversold,
+    ]
+    choices = ["NO DATA", "STRONG BUY THE DIP", "UPTREND (HOLD/BUY)", "Falling Knife (High Risk Value)"]
+    return pd.Series(np.select(conditions, choices, default="DOWNTREND (AVOID)"), index=df.index)
+
 def determine_signal(row):
     """
     Logic for the final 'Technical Signal'
@@ -126,8 +157,11 @@ def run_technical_analysis():
         print(f"❌ Missing {INPUT_FILE}. Run forensic_check.py first.")
         return
 
-    df = pd.read_csv(INPUT_FILE)
-    print(f"Loaded {len(df)} stocks. Fetching price history...")
+    df = read_artifact(INPUT_FILE)
+    print(f"Loaded {len(df)} stocks. Syncing price history...")
+    # One concurrent delta sync for the whole list; the loop below only reads the store
+    histories = DataProvider.sync_price_history(df['ticker'].tolist(), days=HISTORY_DAYS)
+    PRICES.compact()
 
     prices = []
     rsis = []
@@ -135,7 +169,7 @@ def run_technical_analysis():
     sma200s = []
 
     for ticker in tqdm(df['ticker'], desc="Calculating Indicators"):
-        data = get_technical_indicators(ticker)
+        data = get_technical_indicators(ticker, histories.get(ticker, pd.DataFrame()))
         
         if data:
             prices.append(data['current_price'])
@@ -147,9 +181,6 @@ def run_technical_analysis():
             rsis.append(np.nan)
             sma50s.append(np.nan)
             sma200s.append(np.nan)
-        
-        # Jitter to avoid rate limits
-        time.sleep(random.uniform(0.2, 0.5))
 
     # Append columns
     df['current_price'] = prices
@@ -158,9 +189,11 @@ def run_technical_analysis():
     df['SMA_200'] = sma200s
     
     print("Generating Trading Signals...")
-    df['technical_signal'] = df.apply(determine_signal, axis=1)
+    df['technical_signal'] = determine_signals(df)
     
-    df.to_csv(OUTPUT_FILE, index=False)
+    write_artifact(df, OUTPUT_FILE)
+    INDICATORS.save()
+    DataProvider.report_health()
     
     print(f"\n✅ [SUCCESS] Analysis Complete. Saved to {OUTPUT_FILE}")
     
@@ -176,5 +209,31 @@ def run_technical_analysis():
     else:
         print("\nNo stocks met the perfect 'Golden Setup' criteria today.")
 
+def run_market_technicals():
+    """Technical signals for every listed stock, not just the forensic survivors."""
+    print("--- 📉 TECHNICAL ANALYSIS: FULL MARKET ---")
+
+    if os.path.exists(MASTER_FILE):
+        tickers = read_artifact(MASTER_FILE, columns=['ticker'])['ticker'].astype(str).unique().tolist()
+    else:
+        tickers = DataProvider.get_all_tickers()
+    print(f"Syncing price history for {len(tickers)} stocks...")
+    histories = DataProvider.sync_price_history(tickers, days=HISTORY_DAYS)
+    PRICES.compact()
+
+    start = time.perf_counter()
+    closes, padding = build_close_matrix(histories)
+    df = calculate_market_indicators(closes, padding)
+    df['technical_signal'] = determine_signals(df)
+    elapsed = time.perf_counter() - start
+
+    write_artifact(df, MARKET_OUTPUT_FILE)
+    DataProvider.report_health()
+    print(f"\n✅ [SUCCESS] {len(df)} stocks with {MIN_BARS}+ bars scored in {elapsed:.2f}s. Saved to {MARKET_OUTPUT_FILE}")
+    print(df['technical_signal'].value_counts().to_string())
+
 if __name__ == "__main__":
-    run_technical_analysis()
\ No newline at end of file
+    if '--market' in sys.argv:
+        run_market_technicals()
+    else:
+        run_technical_analysis()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import os
+import time
+import tempfile
+import pandas as pd
+import pyarrow.parquet as pq
+from quant_starting_stocks import artifacts
+from quant_starting_stocks.artifacts import read_artifact, write_artifact, parquet_path
+
+# ---------------------------------------------------------
+# REGRESSION: Typed Parquet hand-off between stages (CSV copy kept for people)
+# ---------------------------------------------------------
+def forum_rows():
+    return pd.DataFrame({
+        'ticker': ['VIX', 'HPG'],
+        'original_title': ['VIX có lên được không?', None],
+        'page': [1, 2],
+        'source': ['F319_FORUM', 'F319_FORUM'],
+        'thread_id': ['0123', 'title:HPG'],   # '0123' would come back from CSV as the number 123
+        'scraped_at': ['2026-01-05', '2026-01-06'],
+    })
+
+
+def test_schema_and_projection():
+    path = os.path.join(tempfile.mkdtemp(), 'f319_smart_filtered.csv')
+    write_artifact(forum_rows(), path, encoding='utf-8-sig')
+    assert os.path.exists(path) and os.path.exists(parquet_path(path))
+
+    schema = pq.read_schema(parquet_path(path))
+    assert str(schema.field('thread_id').type) == 'string' and str(schema.field('page').type) == 'int64'
+    assert read_artifact(path).equals(forum_rows())
+    assert list(read_artifact(path, columns=['thread_id', 'ticker']).columns) == ['thread_id', 'ticker']
+
+    try:
+        write_artifact(forum_rows().drop(columns=['thread_id']), path)
+        raise AssertionError("A declared column may not be missing")
+    except ValueError:
+        pass
+
+
+def test_plain_write_reads_parquet():
+    path = os.path.join(tempfile.mkdtemp(), 'f319_smart_filtered.csv')
+    write_artifact(forum_rows(), path)
+    calls = []
+    real = artifacts.pq.read_table
+    artifacts.pq.read_table = lambda *a, **kw: calls.append(a) or real(*a, **kw)
+    try:
+        back = read_artifact(path, columns=['ticker', 'thread_id'])
+    finally:
+        artifacts.pq.read_table = real
+    assert len(calls) == 1, "read_artifact parsed the CSV instead of the Parquet file"
+    assert back['thread_id'].tolist() == ['0123', 'title:HPG']
+
+
+def test_edited_csv_wins():
+    path = os.path.join(tempfile.mkdtemp(), 'f319_smart_filtered.csv')
+    write_artifact(forum_rows(), path)
+    time.sleep(0.01)
+    forum_rows().assign(page=[5, 6]).to_csv(path, index=False)   # Edited by hand after the stage ran
+
+    back = read_artifact(path, columns=['ticker', 'page', 'thread_id'])
+    assert back['page'].tolist() == [5, 6]
+    assert back['thread_id'].tolist() == ['0123', 'title:HPG']   # Declared string columns stay text
+
+    try:
+        read_artifact(os.path.join(tempfile.mkdtemp(), 'missing.csv'))
+        raise AssertionError("Expected FileNotFoundError")
+    except FileNotFoundError:
+        pass
+
+
+if __name__ == "__main__":
+    print("--- TEST: PARQUET ARTIFACTS ---")
+    for test in (test_schema_and_projection, test_plain_write_reads_parquet, test_edited_csv_wins):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
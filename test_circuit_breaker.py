@@ -0,0 +1,143 @@
+import os
+import types
+import tempfile
+import pandas as pd
+from quant_starting_stocks import data_adapter as da
+from quant_starting_stocks.circuit_breaker import (CircuitBreaker, BreakerRegistry, RetryBudget, classify_error,
+                                                   TRANSIENT, SCHEMA, OTHER, NOT_FOUND)
+from quant_starting_stocks.price_store import PriceStore
+
+# ---------------------------------------------------------
+# REGRESSION: Half-open probing in the per-endpoint breaker
+# ---------------------------------------------------------
+def half_open_breaker():
+    breaker = CircuitBreaker('test', transient_threshold=2, cooldown=0.0)
+    for _ in range(2):
+        breaker.record_failure(TRANSIENT)
+    assert breaker.state == 'open'
+    assert breaker.allow()              # Cooldown over: the single probe goes through
+    assert breaker.state == 'half_open'
+    assert not breaker.allow()          # ...and nothing else while it is in flight
+    return breaker
+
+
+def test_probe_ending_in_other_frees_the_slot():
+    breaker = half_open_breaker()
+    breaker.record_failure(OTHER)
+    assert breaker.state == 'half_open'
+    assert breaker.allow()              # The next call is let through as a new probe
+    breaker.record_success()
+    assert breaker.state == 'closed'
+
+
+def test_probe_outcomes():
+    breaker = half_open_breaker()
+    breaker.record_failure(TRANSIENT)
+    assert breaker.state == 'open' and breaker.trips == 2
+
+    breaker = half_open_breaker()
+    breaker.record_failure(NOT_FOUND)   # The endpoint answered
+    assert breaker.state == 'closed' and breaker.allow()
+
+
+# ---------------------------------------------------------
+# REGRESSION: Error classes for messages seen in extraction_debug.log
+# ---------------------------------------------------------
+def test_classify_logged_errors():
+    cases = [
+        (ValueError("Failed to fetch data: 502 - Bad Gateway"), TRANSIENT),
+        (ValueError("Failed to fetch data: 404 - Not Found"), NOT_FOUND),
+        (KeyError("None of [Index(['ticker', 'yearReport', 'lengthReport'], dtype='object')] are in the [columns]"), SCHEMA),
+        (ConnectionError("API request failed: ('Connection aborted.', RemoteDisconnected('Remote end closed "
+                         "connection without response'))"), TRANSIENT),
+        (ValueError("503 Server Error: Service Unavailable for url: https://trading.vietcap.com.vn/api"), TRANSIENT),
+        # Numbers that are not status codes
+        (ValueError("Expected 500 rows for VN500, got 15003"), OTHER),
+        (ValueError("could not convert string to float: '1,404.5'"), OTHER),
+    ]
+    for error, kind in cases:
+        assert classify_error(error) == kind, f"{error!r}: {classify_error(error)} != {kind}"
+
+
+# ---------------------------------------------------------
+# REGRESSION: Retries, backoff and fail-fast in the shared API wrapper
+# ---------------------------------------------------------
+class Patched:
+    """Fresh breakers, a small retry budget and a recorded (not slept) backoff for one test."""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.sleeps = []
+        self.saved = (da.BREAKERS, da.RETRY_BUDGET, da.time)
+
+    def __enter__(self):
+        da.BREAKERS, da.RETRY_BUDGET = BreakerRegistry(), RetryBudget(self.budget)
+        da.time = types.SimpleNamespace(sleep=self.sleeps.append)
+        return self
+
+    def __exit__(self, *exc):
+        da.BREAKERS, da.RETRY_BUDGET, da.time = self.saved
+
+
+def failing(error, calls):
+    def call():
+        calls.append(1)
+        raise error
+    return call
+
+
+def test_transient_retries_back_off_until_budget_runs_out():
+    calls = []
+    with Patched(budget=10) as p:
+        assert da.DataProvider._safe_api_call(failing(TimeoutError("read timed out"), calls), endpoint='t') is None
+        assert len(calls) == da.MAX_RETRIES and len(p.sleeps) == da.MAX_RETRIES - 1
+        for attempt, slept in enumerate(p.sleeps):   # Doubling base plus jitter below one base step
+            assert da.RETRY_BACKOFF * 2 ** attempt <= slept < da.RETRY_BACKOFF * (2 ** attempt + 1)
+        assert da.RETRY_BUDGET.remaining == 10 - (da.MAX_RETRIES - 1)
+
+    calls = []
+    with Patched(budget=1) as p:
+        da.DataProvider._safe_api_call(failing(TimeoutError("read timed out"), calls), endpoint='t')
+        assert len(calls) == 2 and da.RETRY_BUDGET.remaining == 0   # One paid retry, then give up
+        calls.clear()
+        da.DataProvider._safe_api_call(failing(TimeoutError("read timed out"), calls), endpoint='t')
+        assert len(calls) == 1                                      # Budget spent: no retries at all
+
+    calls = []
+    with Patched(budget=10) as p:
+        da.DataProvider._safe_api_call(failing(KeyError("not in index"), calls), endpoint='t')
+        assert len(calls) == 1 and p.sleeps == [] and da.RETRY_BUDGET.remaining == 10
+
+
+def test_open_breaker_serves_stored_prices():
+    """quote.history failing fast: the sync falls back to the bars already in the price store."""
+    real_prices, real_vnstock = da.PRICES, da.Vnstock
+    calls = []
+    try:
+        with Patched(budget=10):
+            da.PRICES = PriceStore(root=os.path.join(tempfile.mkdtemp(), 'prices'))
+            plan = da.PRICES.plan(['HPG'], days=30)
+            days = pd.bdate_range(*plan['HPG'])
+            da.PRICES.record({'HPG': pd.DataFrame({'time': days, 'close': 20.0})}, plan)
+            da.PRICES._sync_state()['HPG']['synced_at'] -= 7200   # Due for a delta sync
+
+            quote = types.SimpleNamespace(history=failing(TimeoutError("timed out"), calls))
+            da.Vnstock = lambda: types.SimpleNamespace(stock=lambda **kw: types.SimpleNamespace(quote=quote))
+            breaker = da.BREAKERS.get('quote.history')
+            for _ in range(breaker.thresholds[TRANSIENT]):
+                breaker.record_failure(TRANSIENT)
+            assert breaker.state == 'open'
+
+            bars = da.DataProvider.sync_price_history(['HPG'], days=30)
+            assert calls == [] and len(bars['HPG']) == len(days)          # Failed fast, served from the store
+            assert 'HPG' in da.PRICES.plan(['HPG'], days=30)              # Still due: the next run retries
+    finally:
+        da.PRICES, da.Vnstock = real_prices, real_vnstock
+
+
+if __name__ == "__main__":
+    print("--- TEST: CIRCUIT BREAKER ---")
+    for test in (test_probe_ending_in_other_frees_the_slot, test_probe_outcomes, test_classify_logged_errors,
+                 test_transient_retries_back_off_until_budget_runs_out, test_open_breaker_serves_stored_prices):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
@@ -0,0 +1,39 @@
+import os
+import tempfile
+import pandas as pd
+from f319_scraper import ForumState, targets_hash, prune_rows
+
+# ---------------------------------------------------------
+# REGRESSION: Incremental crawl state follows the target list; merged rows expire
+# ---------------------------------------------------------
+def test_state_remembers_target_set():
+    path = os.path.join(tempfile.mkdtemp(), 'state.json')
+    state = ForumState(path)
+    assert state.targets is None            # Fresh (or pre-hash) state: never matches a target set
+    state.targets = targets_hash(['VIX', 'HPG'])
+    state.mark([{'thread_id': '1', 'last_activity': '100'}])
+    state.save()
+
+    again = ForumState(path)
+    assert again.targets == targets_hash(['HPG', 'VIX', 'HPG'])   # Order and repeats do not matter
+    assert again.targets != targets_hash(['HPG', 'VIX', 'SSI'])
+
+
+def test_prune_rows():
+    now = pd.Timestamp('2024-06-30 15:00')
+    df = pd.DataFrame({
+        'ticker': ['HPG', 'VIX', 'HPG', 'SSI'],
+        'original_title': ['a', 'b', 'c', 'd'],
+        'scraped_at': ['2024-06-29', '2024-06-29', '2024-01-02', None],
+    })
+    kept = prune_rows(df, ['HPG', 'SSI'], now=now)
+    assert kept['original_title'].tolist() == ['a', 'd']            # VIX untracked, 'c' too old
+    assert kept['scraped_at'].tolist() == ['2024-06-29', '2024-06-30']   # Undated rows count as seen today
+    assert len(prune_rows(df, [], now=now)) == 3                     # Capture All: only the age limit
+
+
+if __name__ == "__main__":
+    print("--- TEST: F319 INCREMENTAL STATE ---")
+    for test in (test_state_remembers_target_set, test_prune_rows):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
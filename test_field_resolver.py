@@ -0,0 +1,70 @@
+import logging
+from quant_starting_stocks import field_resolver
+from quant_starting_stocks.field_resolver import FieldResolver, schema_fingerprint
+
+# ---------------------------------------------------------
+# REGRESSION: Column lookups resolved once per statement schema
+# ---------------------------------------------------------
+class Captured(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def make_resolver():
+    return FieldResolver('test/is', {'revenue': ['Revenue', 'Net Revenue'], 'cogs': ['Cost of Sales'],
+                                     'net_income': ['Net Profit'], 'dividend': ['Dividend']})
+
+
+def test_resolution_and_ambiguity():
+    columns = ['ticker', 'NET REVENUE', 'Revenue deductions', 'Cost of Sales',
+               'Net Profit For the Year', 'Net Profit attributable to parent']
+    resolver = make_resolver()
+    mapping = resolver.resolve(columns)
+    assert mapping == {'revenue': 1, 'cogs': 3, 'net_income': 4, 'dividend': -1}   # First match, any case
+
+    issues = resolver.issues[schema_fingerprint(columns)]
+    assert issues['unresolved'] == ['dividend']
+    assert issues['ambiguous'] == {'revenue': ['NET REVENUE', 'Revenue deductions'],
+                                   'net_income': ['Net Profit For the Year', 'Net Profit attributable to parent']}
+
+
+def test_schema_compiled_and_logged_once():
+    handler = Captured()
+    field_resolver.logger.addHandler(handler)
+    resolver = make_resolver()
+    compiled = []
+    real = resolver._compile
+    resolver._compile = lambda columns: compiled.append(columns) or real(columns)
+    try:
+        columns = ['Revenue', 'Cost of Sales', 'Net Profit']
+        first = resolver.resolve(columns)
+        assert resolver.resolve(tuple(columns)) is first and resolver.resolve(list(columns)) is first
+        assert len(compiled) == 1
+        assert len(handler.messages) == 1 and 'dividend' in handler.messages[0]
+
+        # Same schema again in a new frame: cached. A different schema: compiled and reported once.
+        resolver.resolve(['Revenue', 'Cost of Sales', 'Net Profit'])
+        other = ['Revenue', 'Net Revenue', 'Cost of Sales', 'Net Profit', 'Dividend paid']
+        resolver.resolve(other)
+        resolver.resolve(other)
+        assert len(compiled) == 2
+        assert len(handler.messages) == 2 and schema_fingerprint(other) in handler.messages[1]
+
+        # A new resolver (e.g. next run) compiles again but the issue is only logged for it once too
+        fresh = make_resolver()
+        fresh.resolve(other)
+        fresh.resolve(other)
+        assert len(handler.messages) == 3
+    finally:
+        field_resolver.logger.removeHandler(handler)
+
+
+if __name__ == "__main__":
+    print("--- TEST: FIELD RESOLVER ---")
+    for test in (test_resolution_and_ambiguity, test_schema_compiled_and_logged_once):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
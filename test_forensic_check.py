@@ -0,0 +1,125 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import forensic_check as fc
+from quant_starting_stocks.statement_store import StatementStore
+
+# ---------------------------------------------------------
+# SETUP: Temp statement store and a stubbed VCI fetch (no network)
+# ---------------------------------------------------------
+def fake_report(ticker, r_type):
+    base = 1000.0 + sum(map(ord, ticker))
+    if r_type == 'bs':
+        cols = {'Short-term receivables': [base * 0.2, base * 0.18], 'TOTAL ASSETS': [base * 3, base * 2.7],
+                'Current assets': [base, base * 0.9], 'Fixed assets': [base * 0.8, base * 0.8],
+                'Current liabilities': [base * 0.5, base * 0.4], 'Long-term liabilities': [base * 0.3, base * 0.3],
+                'Cash and cash equivalents': [base * 0.1, base * 0.12]}
+    else:
+        cols = {'Revenue': [base * 2, base * 1.8], 'Cost of Sales': [-base * 1.2, -base * 1.1],
+                'Selling expenses': [base * 0.1, base * 0.09], 'Net Profit': [base * 0.2, base * 0.15]}
+    return pd.DataFrame({'ticker': [ticker] * 2, 'yearReport': [2024, 2023], **cols})
+
+
+def use_temp_store():
+    root = tempfile.mkdtemp()
+    fc.STATEMENTS = StatementStore(root=os.path.join(root, 'statements'), legacy_dir=os.path.join(root, 'none'))
+    calls = []
+
+    def fetch(symbol, report_types):
+        calls.append((symbol, tuple(report_types)))
+        return {r: fake_report(symbol, r) for r in report_types}
+
+    fc.fetch_statements = fetch
+    return root, calls
+
+
+def test_prefetch_fills_store_then_reads_cached():
+    real_store, real_fetch = fc.STATEMENTS, fc.fetch_statements
+    try:
+        root, calls = use_temp_store()
+        fc.prefetch_statements(['AAA', 'BBB'], max_workers=2)
+        assert sorted(calls) == [('AAA', ('bs', 'is')), ('BBB', ('bs', 'is'))]
+        part_dir = os.path.join(root, 'statements', 'report_type=bs')
+        assert len([f for f in os.listdir(part_dir) if f.endswith('.parquet')]) == 1   # Compacted
+
+        # A fresh store over the same files (next run): everything comes from disk, no fetches
+        fc.STATEMENTS = StatementStore(root=os.path.join(root, 'statements'), legacy_dir=os.path.join(root, 'none'))
+        calls.clear()
+        fc.prefetch_statements(['AAA', 'BBB'])
+        bs = fc.get_cached_data('AAA', 'bs')
+        assert calls == []
+        assert np.allclose(bs['TOTAL ASSETS'].to_numpy(), fake_report('AAA', 'bs')['TOTAL ASSETS'].to_numpy())
+
+        # A miss falls back to the fetch once and is kept for the next lookup
+        fc.get_cached_data('CCC', 'is')
+        fc.get_cached_data('CCC', 'is')
+        assert calls == [('CCC', ('is',))]
+
+        scores = fc.calculate_m_scores(['AAA', 'BBB', 'ZZZ'])
+        assert scores['beneish_m_score'].notna().tolist() == [True, True, False]   # ZZZ: nothing stored
+    finally:
+        fc.STATEMENTS, fc.fetch_statements = real_store, real_fetch
+
+
+# ---------------------------------------------------------
+# REGRESSION: Batch Beneish path must match the scalar one
+# ---------------------------------------------------------
+BS_COLUMNS = ['Short-term receivables', 'Long-term receivables', 'TOTAL ASSETS', 'Current assets',
+              'Fixed assets', 'Current liabilities', 'Long-term liabilities', 'Cash and cash equivalents']
+IS_COLUMNS = ['Revenue', 'Net Revenue', 'Cost of Sales', 'Selling expenses', 'General & Admin expenses',
+              'Net Profit For the Year', 'Net Profit attributable to parent']
+
+
+def fake_statement(rng, columns):
+    """Random 1-3 year statement: zeros, NaNs, text, extreme magnitudes, dropped and reordered columns."""
+    years = int(rng.choice([1, 2, 3], p=[0.05, 0.75, 0.2]))
+    kept = [c for c in columns if rng.random() > 0.05]
+    kept = [kept[i] for i in rng.permutation(len(kept))]
+    data = {'ticker': ['AAA'] * years, 'yearReport': list(range(2024, 2024 - years, -1))}
+    for col in kept:
+        data[col] = [fake_value(rng) for _ in range(years)]
+    return pd.DataFrame(data)
+
+
+def fake_value(rng):
+    roll = rng.random()
+    if roll < 0.08:
+        return 0.0
+    if roll < 0.10:
+        return np.nan
+    if roll < 0.12:
+        return 'n/a'
+    if roll < 0.15:
+        return float(rng.choice([1e-200, 1e200]))   # Ratios of these underflow to 0.0 in scalar Python
+    return float(rng.normal(1000, 600))
+
+
+def scalar_m_score(bs, is_):
+    try:
+        return fc.m_score_from_statements(bs, is_)
+    except ZeroDivisionError:
+        return np.nan
+
+
+def test_beneish_batch_matches_scalar():
+    rng = np.random.default_rng(11)
+    cases = [(fake_statement(rng, BS_COLUMNS), fake_statement(rng, IS_COLUMNS)) for _ in range(3000)]
+    # Receivables/revenue underflows to 0.0: the scalar path raises, the batch must flag it as failed
+    bs, is_ = fake_report('AAA', 'bs'), fake_report('AAA', 'is')
+    bs['Short-term receivables'], is_['Revenue'] = [5.0, 1e-200], [5.0, 1e200]
+    cases.append((bs, is_))
+
+    scalar = np.array([scalar_m_score(bs, is_) for bs, is_ in cases])
+    batch = fc.score_beneish_batch([fc.beneish_inputs(bs, is_) for bs, is_ in cases])['beneish_m_score'].to_numpy()
+    assert np.isnan(scalar[-1]) and np.isnan(batch[-1])
+    assert np.isfinite(scalar).sum() > 1000, "Random statements should mostly score"
+    mismatch = ~np.isclose(scalar, batch, equal_nan=True)
+    assert not mismatch.any(), f"{mismatch.sum()} cases differ, first at {np.flatnonzero(mismatch)[0]}"
+
+
+if __name__ == "__main__":
+    print("--- TEST: FORENSIC CHECK ---")
+    for test in (test_prefetch_fills_store_then_reads_cached, test_beneish_batch_matches_scalar):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
@@ -0,0 +1,60 @@
+import os
+import glob
+import pytest
+from html_parsing import BACKENDS, get_parser
+
+# ---------------------------------------------------------
+# REGRESSION: Every parser backend reads the saved pages exactly like BeautifulSoup
+# ---------------------------------------------------------
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_pages')
+
+
+def corpus(site):
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, site, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+
+def available_backends():
+    names = []
+    for name in BACKENDS:
+        try:
+            get_parser(name)
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+@pytest.mark.parametrize('backend', [b for b in BACKENDS if b != 'bs4'])
+def test_backend_matches_bs4(backend):
+    if backend not in available_backends():
+        pytest.skip(f"{backend} not installed")
+    reference, parser = get_parser('bs4'), get_parser(backend)
+    for name, html in corpus('f319').items():
+        assert parser.forum_threads(html) == reference.forum_threads(html), f"f319/{name}"
+    for name, html in corpus('cafef').items():
+        assert parser.cafef_items(html) == reference.cafef_items(html), f"cafef/{name}"
+
+
+def test_corpus_contents():
+    parser = get_parser('bs4')
+    f319 = corpus('f319')
+    threads = parser.forum_threads(f319['page-1.html'])
+    assert len(threads) == 25 and sum(t['sticky'] for t in threads) == 5
+    assert all(t['thread_id'].isdigit() and t['last_activity'] for t in threads)
+    assert parser.forum_threads(f319['page-end.html']) is None
+    assert len(parser.cafef_items(corpus('cafef')['SHB.html'])) == 10
+    assert parser.cafef_items(corpus('cafef')['empty.html']) == []
+
+
+if __name__ == "__main__":
+    print("--- TEST: HTML PARSER BACKENDS vs BEAUTIFULSOUP ---")
+    test_corpus_contents()
+    print("   ✅ PASS: test_corpus_contents")
+    for backend in available_backends():
+        if backend != 'bs4':
+            test_backend_matches_bs4(backend)
+            print(f"   ✅ PASS: test_backend_matches_bs4[{backend}]")
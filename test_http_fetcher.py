@@ -0,0 +1,88 @@
+import time
+import threading
+from http_fetcher import AsyncFetcher, HostPolicy
+
+# ---------------------------------------------------------
+# SETUP: Stub session (no network) that records concurrency and request starts per host
+# ---------------------------------------------------------
+class StubResponse:
+    def __init__(self, url):
+        self.status_code = 200
+        self.text = url
+        self.headers = {}
+
+
+class StubSession:
+    def __init__(self, delay=0.03):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.starts = []
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None, verify=True):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            self.starts.append(time.monotonic())
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return StubResponse(url)
+
+
+def make_fetcher(concurrency=2, min_interval=0.0, delay=0.03):
+    policy = HostPolicy(concurrency=concurrency, min_interval=min_interval, retries=0)
+    fetcher = AsyncFetcher(policies={'a.test': policy, 'b.test': policy})
+    sessions = {'a.test': StubSession(delay), 'b.test': StubSession(delay)}
+    fetcher._session = lambda host, policy: sessions[host]
+    return fetcher, sessions
+
+
+def test_host_cap_holds_across_concurrent_calls():
+    fetcher, sessions = make_fetcher(concurrency=2)
+    urls = [f"https://a.test/{i}" for i in range(12)] + [f"https://b.test/{i}" for i in range(12)]
+    results = {}
+
+    def run(wave):
+        results[wave] = fetcher.fetch_all(urls)
+
+    threads = [threading.Thread(target=run, args=(w,)) for w in range(3)]   # Three scrapers, one fetcher
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    fetcher.close()
+
+    assert sessions['a.test'].peak == 2 and sessions['b.test'].peak == 2
+    for wave in range(3):
+        assert [r.text for r in results[wave]] == urls   # Input order, whatever the completion order
+
+
+def test_politeness_gap_spans_calls():
+    fetcher, sessions = make_fetcher(concurrency=3, min_interval=0.05, delay=0.0)
+    for wave in range(3):   # Consecutive waves, like F319 pages then threads
+        fetcher.fetch_all([f"https://a.test/{wave}/{i}" for i in range(4)])
+    fetcher.close()
+
+    starts = sessions['a.test'].starts
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(starts) == 12 and min(gaps) >= 0.045, f"min gap {min(gaps):.3f}s"
+
+
+def test_fetch_each_streams_and_keeps_order():
+    fetcher, _ = make_fetcher(concurrency=4)
+    urls = [f"https://a.test/{i}" for i in range(10)]
+    seen = []
+    results = fetcher.fetch_each(urls, lambda i, r: seen.append((i, r.text)))
+    fetcher.close()
+    assert [r.text for r in results] == urls
+    assert sorted(seen) == list(enumerate(urls))
+
+
+if __name__ == "__main__":
+    print("--- TEST: HTTP FETCHER ---")
+    for test in (test_host_cap_holds_across_concurrent_calls, test_politeness_gap_spans_calls,
+                 test_fetch_each_streams_and_keeps_order):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
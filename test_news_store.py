@@ -0,0 +1,57 @@
+import os
+import tempfile
+import pandas as pd
+from news_store import NewsStore, normalize_dates, FEED
+
+# ---------------------------------------------------------
+# REGRESSION: Dedupe index, forward-only watermarks, column-wise date parsing
+# ---------------------------------------------------------
+def make_store():
+    return NewsStore(os.path.join(tempfile.mkdtemp(), 'news.sqlite'))
+
+
+def test_normalize_dates():
+    out = normalize_dates([1710000000, 1710000000000, '12/03/2024 09:12', '12/03/2024', '2024-03-12', 'N/A', None])
+    # Epochs (seconds or ms) are shown in exchange time (UTC+7)
+    assert out[0] == out[1] == pd.Timestamp('2024-03-09 23:00:00')
+    assert out[2] == pd.Timestamp('2024-03-12 09:12')
+    assert out[3] == out[4] == pd.Timestamp('2024-03-12')
+    assert out[5:].isna().all()
+
+
+def test_dedupe_and_watermarks():
+    store = make_store()
+    first = [
+        {'ticker': 'HPG', 'date': '10/03/2024', 'news_title': 'HPG: Báo cáo quý', 'source': 'CAFEF_AJAX'},
+        {'ticker': 'hpg', 'date': '10/03/2024', 'news_title': '  hpg:  báo cáo QUÝ ', 'source': 'CAFEF_AJAX'},
+        {'ticker': 'HPG', 'date': '12/03/2024', 'news_title': 'HPG: Báo cáo quý', 'source': 'VNSTOCK_TCBS'},
+    ]
+    assert store.add(first) == 2          # Same ticker/title/source after normalization = one row
+    assert store.add(first) == 0          # Append-only: nothing is stored twice
+    assert store.watermark('CAFEF_AJAX', 'HPG') == pd.Timestamp('2024-03-10')
+
+    store.add([{'ticker': 'HPG', 'date': '01/01/2024', 'news_title': 'Tin cũ', 'source': 'CAFEF_AJAX'}])
+    assert store.watermark('CAFEF_AJAX', 'HPG') == pd.Timestamp('2024-03-10')   # Never moves back
+
+    store.mark_run('HOSE_API', FEED, pd.Timestamp('2024-03-12 08:00'))
+    store.mark_run('HOSE_API')
+    assert store.watermark('HOSE_API') == pd.Timestamp('2024-03-12 08:00')
+    assert set(store.last_runs('HOSE_API')) == {FEED}
+
+    store.mark_scanned('HOSE_API_SCAN', ['hpg', 'VIX'], pd.Timestamp('2024-03-12 08:00'))
+    store.mark_scanned('HOSE_API_SCAN', ['HPG'], pd.Timestamp('2024-03-01'))   # Coverage never moves back
+    assert store.watermarks('HOSE_API_SCAN') == {'HPG': pd.Timestamp('2024-03-12 08:00'),
+                                                 'VIX': pd.Timestamp('2024-03-12 08:00')}
+
+    path = os.path.join(tempfile.mkdtemp(), 'raw_news_data.csv')
+    assert store.export(path, days=None) == 2   # One row per (ticker, title) across sources
+    df = pd.read_csv(path)
+    assert list(df.columns) == ['ticker', 'date', 'news_title', 'source']
+    assert df['date'].tolist() == ['12/03/2024', '01/01/2024']
+
+
+if __name__ == "__main__":
+    print("--- TEST: NEWS STORE ---")
+    for test in (test_normalize_dates, test_dedupe_and_watermarks):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
@@ -0,0 +1,90 @@
+import os
+import tempfile
+from pipeline import Pipeline, Stage
+
+# ---------------------------------------------------------
+# SETUP: Three tiny scripts linked by files (source -> two independent branches)
+# ---------------------------------------------------------
+# Each branch waits for the other one to start: run one after the other, both time out without output
+BRANCH = (
+    "import os, sys, time\n"
+    "me, other = sys.argv[1], sys.argv[2]\n"
+    "open(f'data/{me}.started', 'w').close()\n"
+    "deadline = time.time() + 30\n"
+    "while not os.path.exists(f'data/{other}.started') and time.time() < deadline:\n"
+    "    time.sleep(0.01)\n"
+    "if os.path.exists(f'data/{other}.started'):\n"
+    "    open(f'data/{me}.csv', 'w').write(open('data/source.csv').read() + me[0].upper())\n"
+)
+SCRIPTS = {
+    'source.py': "open('data/source.csv', 'w').write(open('seed.txt').read())\n",
+    'left.py': BRANCH,
+    'right.py': BRANCH,
+}
+
+
+def make_pipeline(root):
+    return Pipeline([
+        Stage('source', 'source.py', inputs=['seed.txt'], outputs=['data/source.csv']),
+        Stage('left', 'left.py', inputs=['data/source.csv'], outputs=['data/left.csv'], args=['left', 'right']),
+        Stage('right', 'right.py', inputs=['data/source.csv'], outputs=['data/right.csv'], args=['right', 'left']),
+    ], root=root, workers=2)
+
+
+def make_root():
+    root = tempfile.mkdtemp()
+    os.makedirs(os.path.join(root, 'data'))
+    for name, code in SCRIPTS.items():
+        with open(os.path.join(root, name), 'w') as f:
+            f.write(code)
+    with open(os.path.join(root, 'seed.txt'), 'w') as f:
+        f.write('v1')
+    return root
+
+
+def statuses(results):
+    return {name: r['status'] for name, r in results.items()}
+
+
+def test_dependencies_and_concurrency():
+    root = make_root()
+    pipeline = make_pipeline(root)
+    assert pipeline.deps == {'source': [], 'left': ['source'], 'right': ['source']}
+    assert pipeline.select(['left']) == {'source', 'left'}
+
+    results = pipeline.run()
+    assert statuses(results) == {'source': 'ran', 'left': 'ran', 'right': 'ran'}   # Branches overlapped
+    assert open(os.path.join(root, 'data/left.csv')).read() == 'v1L'
+    for stage in pipeline.stages.values():
+        fresh, fp = pipeline.is_fresh(stage)
+        assert fresh and pipeline._state[stage.name]['fingerprint'] == fp
+
+
+def test_skip_unchanged_and_rerun_on_change():
+    root = make_root()
+    make_pipeline(root).run()
+
+    assert set(statuses(make_pipeline(root).run()).values()) == {'skipped'}
+
+    with open(os.path.join(root, 'right.py'), 'a') as f:
+        f.write("# code change\n")
+    assert statuses(make_pipeline(root).run()) == {'source': 'skipped', 'left': 'skipped', 'right': 'ran'}
+
+    with open(os.path.join(root, 'seed.txt'), 'w') as f:
+        f.write('v2')
+    assert set(statuses(make_pipeline(root).run()).values()) == {'ran'}
+    assert open(os.path.join(root, 'data/right.csv')).read() == 'v2R'
+
+
+def test_failure_blocks_downstream():
+    root = make_root()
+    os.remove(os.path.join(root, 'seed.txt'))
+    results = make_pipeline(root).run()
+    assert statuses(results) == {'source': 'failed', 'left': 'blocked', 'right': 'blocked'}
+
+
+if __name__ == "__main__":
+    print("--- TEST: PIPELINE DAG RUNNER ---")
+    for test in (test_dependencies_and_concurrency, test_skip_unchanged_and_rerun_on_change, test_failure_blocks_downstream):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
@@ -0,0 +1,109 @@
+import os
+import glob
+import tempfile
+from datetime import datetime
+import pandas as pd
+from quant_starting_stocks.price_store import PriceStore, OVERLAP_DAYS
+
+# ---------------------------------------------------------
+# SETUP: Offline store in a temp folder, bars shaped like VCI quote.history
+# ---------------------------------------------------------
+NOW = datetime(2026, 3, 10, 15, 0)
+
+
+def vci_bars(start, end, scale=1.0, last_close=None):
+    days = pd.bdate_range(start, end)
+    closes = [scale * (20 + i * 0.1) for i in range(len(days))]
+    if last_close is not None:
+        closes[-1] = last_close
+    return pd.DataFrame({'time': days, 'open': closes, 'high': closes, 'low': closes, 'close': closes,
+                         'volume': [1000.0] * len(days)})
+
+
+def make_store():
+    return PriceStore(root=os.path.join(tempfile.mkdtemp(), 'prices'))
+
+
+def age(store, ticker, seconds=7200):
+    store._sync_state()[ticker]['synced_at'] -= seconds
+
+
+def parts(store):
+    return glob.glob(os.path.join(store.root, 'bars', '*.parquet'))
+
+
+def test_full_then_delta_plan():
+    store = make_store()
+    plan = store.plan(['HPG', 'VCB'], days=30, now=NOW)
+    assert plan == {'HPG': ('2026-02-08', '2026-03-10'), 'VCB': ('2026-02-08', '2026-03-10')}
+    assert store.record({'HPG': vci_bars(*plan['HPG'])}, plan) == []
+
+    # VCB failed: still a full backfill. HPG was just synced: skipped until FRESH_SECONDS pass
+    assert store.plan(['HPG', 'VCB'], days=30, now=NOW) == {'VCB': ('2026-02-08', '2026-03-10')}
+    age(store, 'HPG')
+    later = datetime(2026, 3, 12, 15, 0)
+    assert store.plan(['HPG'], days=30, now=later) == {'HPG': ('2026-02-28', '2026-03-12')}   # OVERLAP_DAYS back
+    assert OVERLAP_DAYS == 10
+    assert store.plan(['HPG'], days=60, now=later)['HPG'][0] == '2026-01-11'   # Window grew: full again
+
+
+def test_nothing_fetched_writes_nothing():
+    store = make_store()
+    plan = store.plan(['HPG'], days=30, now=NOW)
+    assert store.record({}, plan) == []
+    assert not os.path.exists(os.path.join(store.root, 'sync.json')) and parts(store) == []
+
+
+def test_reread_bar_last_write_wins_and_compact():
+    store = make_store()
+    plan = store.plan(['HPG'], days=30, now=NOW)
+    store.record({'HPG': vci_bars(*plan['HPG'], last_close=21.0)}, plan)   # Today's bar read mid-session
+    age(store, 'HPG')
+
+    plan = store.plan(['HPG'], days=30, now=datetime(2026, 3, 11, 15, 0))
+    fresh = vci_bars('2026-02-08', '2026-03-11')
+    fresh.loc[fresh['time'] == '2026-03-10', 'close'] = 22.5                 # Final close differs: not an adjustment
+    assert store.record({'HPG': fresh[fresh['time'] >= plan['HPG'][0]]}, plan) == []
+
+    history = PriceStore(store.root).history('HPG')
+    assert history['time'].is_unique and history['time'].iloc[-1] == pd.Timestamp('2026-03-11')
+    assert history.loc[history['time'] == '2026-03-10', 'close'].item() == 22.5
+
+    assert len(parts(store)) == 2
+    store.compact()
+    assert len(parts(store)) == 1
+    assert PriceStore(store.root).history('HPG').equals(history)
+
+
+def test_adjusted_history_is_dropped_and_backfilled():
+    store = make_store()
+    plan = store.plan(['HPG', 'VCB'], days=30, now=NOW)
+    store.record({t: vci_bars(*plan[t]) for t in plan}, plan)
+    age(store, 'HPG')
+    age(store, 'VCB')
+
+    # 2:1 split on 2026-03-11: VCI now reports every earlier HPG close halved
+    later = datetime(2026, 3, 11, 15, 0)
+    plan = store.plan(['HPG', 'VCB'], days=30, now=later)
+    bars = {'HPG': vci_bars(plan['HPG'][0], '2026-03-11', scale=0.5),
+            'VCB': vci_bars('2026-02-08', '2026-03-11').query("time >= @plan['VCB'][0]")}
+    assert store.record(bars, plan) == ['HPG']
+
+    stale = store.history('HPG')
+    assert stale['time'].min() >= pd.Timestamp(plan['HPG'][0])   # Unadjusted bars are gone
+    assert store.plan(['HPG', 'VCB'], days=30, now=later) == {'HPG': ('2026-02-09', '2026-03-11')}
+
+    backfill = store.plan(['HPG'], days=30, now=later)
+    assert store.record({'HPG': vci_bars(*backfill['HPG'], scale=0.5)}, backfill) == []
+    store.compact()
+    history = PriceStore(store.root).history('HPG')
+    assert history['close'].max() < 15 and history['time'].min() == pd.Timestamp('2026-02-09')
+    assert PriceStore(store.root).history('VCB')['close'].min() == 20.0       # Untouched
+
+
+if __name__ == "__main__":
+    print("--- TEST: PRICE STORE ---")
+    for test in (test_full_then_delta_plan, test_nothing_fetched_writes_nothing,
+                 test_reread_bar_last_write_wins_and_compact, test_adjusted_history_is_dropped_and_backfilled):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
@@ -0,0 +1,167 @@
+import os
+import time
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import sentiment_engine as se
+from sentiment_cache import SentimentCache, text_key
+from translation import StubTranslator
+
+
+class patched:
+    """Temporarily replaces sentiment_engine globals (restored on exit)."""
+
+    def __init__(self, **values):
+        self.values = values
+
+    def __enter__(self):
+        self.saved = {name: getattr(se, name) for name in self.values}
+        for name, value in self.values.items():
+            setattr(se, name, value)
+
+    def __exit__(self, *exc):
+        for name, value in self.saved.items():
+            setattr(se, name, value)
+
+
+def fake_score(text):
+    return round((sum(map(ord, text)) % 200) / 100 - 1, 2)
+
+# ---------------------------------------------------------
+# REGRESSION: Nothing to score must not start the FinBERT process pool
+# ---------------------------------------------------------
+def test_nothing_to_score_skips_pool():
+    def no_pool():
+        raise AssertionError("score pool started with nothing to score")
+
+    real = se.get_score_pool
+    se.get_score_pool = no_pool
+    try:
+        assert se.stream_translate_score({}, {}, "News") == {}
+    finally:
+        se.get_score_pool = real
+
+
+# ---------------------------------------------------------
+# REGRESSION: Missing or blank titles are not keyed, translated or scored
+# ---------------------------------------------------------
+def test_blank_titles_score_neutral():
+    assert text_key(None) is None and text_key(np.nan) is None and text_key(' \n ') is None
+    assert text_key('nan') is not None and text_key('HPG  tăng') == text_key('HPG tăng')
+
+    sent = []
+
+    def fake_stream(to_translate, ready, source_type):
+        sent.extend(to_translate.values())
+        scores = {k: 0.5 for k in to_translate}
+        se.CACHE.put_scores(scores, se.MODEL_VERSION)   # As the real stage does
+        return scores
+
+    real_cache, real_stream = se.CACHE, se.stream_translate_score
+    se.CACHE = SentimentCache(os.path.join(tempfile.mkdtemp(), 'cache.sqlite'))
+    se.stream_translate_score = fake_stream
+    try:
+        titles = ['HPG tăng trần', None, np.nan, '   ', 'HPG tăng trần']
+        assert se.translate_and_score(titles, "News") == [0.5, 0, 0, 0, 0.5]
+        assert sent == ['HPG tăng trần']
+        cached = se.cached_scores_for(titles + ['Chưa thấy'])
+        assert cached[:5] == [0.5, 0, 0, 0, 0.5] and np.isnan(cached[5])   # Unseen is NaN, blank is neutral
+    finally:
+        se.CACHE.close()
+        se.CACHE, se.stream_translate_score = real_cache, real_stream
+
+
+# ---------------------------------------------------------
+# REGRESSION: Overlapped translate -> score pipeline (stub translator, stub model)
+# ---------------------------------------------------------
+def test_stream_translate_score():
+    titles = [f"Cổ phiếu số {i} tăng" + (" FAIL" if i % 9 == 4 else "") for i in range(61)]
+    keys = [text_key(t) for t in titles]
+    ready = {text_key("Đã dịch trước"): "EN already translated"}
+    translated, scored, batches, backlog = [], [], [], []
+    lock = threading.Lock()
+
+    def translate(line):
+        with lock:
+            translated.append(line)
+        return f"EN {line}"
+
+    def score_texts(texts, batch_size=None, backend=None):
+        with lock:
+            backlog.append(len(translated) - len(scored))   # Translated but not scored yet
+            scored.extend(texts)
+        batches.append(len(texts))
+        time.sleep(0.01)   # A model slower than the translator: the queue must fill and block
+        return [fake_score(t) for t in texts]
+
+    cache = SentimentCache(os.path.join(tempfile.mkdtemp(), 'cache.sqlite'))
+    stub = StubTranslator(fn=translate, max_chars=60, fail_on=("FAIL",))
+    with patched(CACHE=cache, TRANSLATOR=stub, score_texts=score_texts, get_score_pool=lambda workers=None: None,
+                 BATCH_SIZE=4, QUEUE_SIZE=3, TRANSLATE_WORKERS=2, FLUSH_SECONDS=5.0):
+        scores = se.stream_translate_score(dict(zip(keys, titles)), ready, "News")
+
+        failed = {k for k, t in zip(keys, titles) if "FAIL" in t}
+        assert set(scores) == (set(keys) - failed) | set(ready)
+        assert all(scores[k] == fake_score(f"EN {t}") for k, t in zip(keys, titles) if k not in failed)
+        assert scores[text_key("Đã dịch trước")] == fake_score("EN already translated")
+
+        # Full batches, then the partial remainder once the input ran out
+        assert all(n == 4 for n in batches[:-1]) and 0 < batches[-1] < 4
+        assert sum(batches) == len(scores)
+        # Bounded queue: a translator worker stops once the model is QUEUE_SIZE + one batch behind
+        assert max(backlog) <= 3 + 4 + 2 * 3, f"translator ran {max(backlog)} titles ahead"
+
+        # Everything scored is cached; failed translations are not, so the next run retries them
+        assert set(cache.get_scores(keys, se.MODEL_VERSION)) == set(keys) - failed
+        assert set(cache.get_translations(keys)) == set(keys) - failed
+        stub.fail_on, stub.calls[:] = (), []
+        again = se.translate_and_score(titles, "News")
+        assert again == [fake_score(f"EN {t}") for t in titles]   # Input order, failed ones now scored
+        retried = [line for call in stub.calls for line in call.split("\n")]
+        assert retried and all("FAIL" in line for line in retried)   # Cached titles are not translated again
+    cache.close()
+
+
+# ---------------------------------------------------------
+# REGRESSION: Sharded scoring over the worker pool (a thread pool stands in for the processes)
+# ---------------------------------------------------------
+def test_parallel_scoring_reassembles_shards():
+    texts = [f"EN headline {'x' * (i * 7 % 23)} {i}" for i in range(50)]
+    shards = []
+
+    def score_texts(chunk, batch_size=None, backend=None):
+        shards.append(list(chunk))
+        time.sleep(0.001 * (len(chunk) % 3))   # Shards finish out of order
+        return [fake_score(t) for t in chunk]
+
+    pool = ThreadPoolExecutor(3)
+    with patched(score_texts=score_texts, get_score_pool=lambda workers=None: pool if (workers or 1) > 1 else None):
+        assert se.score_texts_parallel(texts, workers=3, batch_size=8) == [fake_score(t) for t in texts]
+        assert sorted(len(s) for s in shards) == [2] + [8] * 6
+        assert sorted(t for s in shards for t in s) == sorted(texts)
+        # Each shard is a length bucket: no shard's shortest text is shorter than an earlier shard's longest
+        buckets = sorted(shards, key=lambda s: min(map(len, s)))
+        assert all(max(map(len, a)) <= min(map(len, b)) for a, b in zip(buckets, buckets[1:]))
+
+        shards.clear()
+        assert se.score_texts_parallel(texts, workers=1) == [fake_score(t) for t in texts]
+        assert shards == [texts]   # Single worker: one in-process call, no pool
+
+        # The streaming stage hands batches to the pool and collects them as they finish
+        cache = SentimentCache(os.path.join(tempfile.mkdtemp(), 'cache.sqlite'))
+        with patched(CACHE=cache, TRANSLATOR=StubTranslator(), BATCH_SIZE=4, _pool_workers=3,
+                     get_score_pool=lambda workers=None: pool):
+            titles = {text_key(t): t for t in texts}
+            scores = se.stream_translate_score(titles, {}, "News")
+            assert scores == {k: fake_score(f"EN {t}") for k, t in titles.items()}
+        cache.close()
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    print("--- TEST: SENTIMENT ENGINE ---")
+    for test in (test_nothing_to_score_skips_pool, test_blank_titles_score_neutral, test_stream_translate_score,
+                 test_parallel_scoring_reassembles_shards):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
@@ -0,0 +1,134 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from technical_analysis import (calculate_rsi, calculate_sma, build_close_matrix, calculate_market_indicators,
+                                determine_signal, determine_signals)
+from quant_starting_stocks.indicators import WilderRSI, RollingSMA, IndicatorBook
+
+# ---------------------------------------------------------
+# REGRESSION: Streaming indicators vs the full-recompute path
+# ---------------------------------------------------------
+def make_closes(n=600, seed=7, gaps=True):
+    rng = np.random.default_rng(seed)
+    closes = 20_000 + np.cumsum(rng.normal(0, 300, n))
+    closes[100:130] = closes[99]              # Flat stretch: average loss decays towards 0
+    if gaps:
+        closes[rng.choice(np.arange(n // 2, n), 5, replace=False)] = np.nan   # Missing bars
+    return pd.Series(closes)
+
+
+def assert_same(streamed, reference, label, rtol=1e-9):
+    streamed, reference = np.asarray(streamed, dtype=float), np.asarray(reference, dtype=float)
+    assert np.array_equal(np.isnan(streamed), np.isnan(reference)), f"{label}: NaN positions differ"
+    ok = ~np.isnan(reference)
+    assert np.allclose(streamed[ok], reference[ok], rtol=rtol, atol=1e-9), \
+        f"{label}: max abs diff {np.max(np.abs(streamed[ok] - reference[ok]))}"
+
+
+def test_streaming_matches_full_recompute():
+    closes = make_closes()
+    rsi, sma50, sma200 = WilderRSI(14), RollingSMA(50), RollingSMA(200)
+    out = {'rsi': [], 'sma50': [], 'sma200': [], 'peek_rsi': [], 'peek_sma200': []}
+    for c in closes:
+        out['peek_rsi'].append(rsi.peek(c))
+        out['peek_sma200'].append(sma200.peek(c))
+        for ind in (rsi, sma50, sma200):
+            ind.update(c)
+        out['rsi'].append(rsi.value)
+        out['sma50'].append(sma50.value)
+        out['sma200'].append(sma200.value)
+
+    assert_same(out['rsi'], calculate_rsi(closes, 14), "RSI-14")
+    assert_same(out['peek_rsi'], calculate_rsi(closes, 14), "RSI-14 (peek)")
+    assert_same(out['sma50'], calculate_sma(closes, 50), "SMA-50")
+    assert_same(out['sma200'], calculate_sma(closes, 200), "SMA-200")
+    assert_same(out['peek_sma200'], calculate_sma(closes, 200), "SMA-200 (peek)")
+
+
+def test_edge_cases():
+    flat = pd.Series([10_000.0] * 30)
+    rising = pd.Series(np.arange(30, dtype=float))
+    for series in (flat, rising):
+        rsi = WilderRSI(14)
+        for c in series:
+            rsi.update(c)
+        assert_same([rsi.value], calculate_rsi(series, 14).iloc[-1:], "RSI edge case")
+
+
+def test_book_resumes_across_runs():
+    """Day-by-day runs with a persisted book give the same answer as recomputing the whole history."""
+    closes = make_closes(gaps=False)
+    times = pd.bdate_range('2024-01-01', periods=len(closes))
+    path = os.path.join(tempfile.mkdtemp(), 'state.json')
+
+    for day in range(220, len(closes) + 1, 37):
+        book = IndicatorBook(path)                # New process each run
+        window = slice(max(0, day - 250), day)    # The store hands over about a year of bars
+        # Today's bar is first seen as a partial value, then revised by the next sync
+        partial = closes.iloc[window].copy()
+        partial.iloc[-1] *= 1.01
+        book.latest('AAA', times[window], partial)
+        latest = book.latest('AAA', times[window], closes.iloc[window])
+        book.save()
+
+        history = closes.iloc[:day]
+        assert_same([latest['RSI']], calculate_rsi(history, 14).iloc[-1:], f"book RSI day {day}")
+        assert_same([latest['SMA_50']], calculate_sma(history, 50).iloc[-1:], f"book SMA-50 day {day}")
+        assert_same([latest['SMA_200']], calculate_sma(history, 200).iloc[-1:], f"book SMA-200 day {day}")
+        # The one-year window the old path used differs only by weights below 1e-7
+        assert_same([latest['RSI']], calculate_rsi(closes.iloc[window], 14).iloc[-1:], "windowed RSI", rtol=1e-6)
+
+
+def test_book_rebuilds_on_revised_close():
+    """Same dates, adjusted closes (a 2:1 split): the stored sums must not be reused."""
+    closes = make_closes(300, gaps=False)
+    times = pd.bdate_range('2024-01-01', periods=len(closes))
+    path = os.path.join(tempfile.mkdtemp(), 'state.json')
+    book = IndicatorBook(path)
+    book.latest('AAA', times[:-1], closes.iloc[:-1])
+    book.save()
+
+    adjusted = closes / 2
+    latest = IndicatorBook(path).latest('AAA', times, adjusted)
+    assert_same([latest['RSI']], calculate_rsi(adjusted, 14).iloc[-1:], "RSI after adjustment")
+    assert_same([latest['SMA_50']], calculate_sma(adjusted, 50).iloc[-1:], "SMA-50 after adjustment")
+    assert_same([latest['SMA_200']], calculate_sma(adjusted, 200).iloc[-1:], "SMA-200 after adjustment")
+
+
+def test_market_matrix_matches_per_ticker():
+    """Uneven histories (IPOs, gaps) in one wide matrix give the per-ticker numbers and signals."""
+    rng = np.random.default_rng(3)
+    histories = {}
+    for i in range(300):
+        n = int(rng.integers(150, 260))
+        histories[f"T{i:03d}"] = pd.DataFrame({'close': make_closes(n, seed=i, gaps=i % 7 == 0).to_numpy()})
+
+    closes, padding = build_close_matrix(histories)
+    market = calculate_market_indicators(closes, padding).set_index('ticker')
+    assert set(market.index) == {t for t, h in histories.items() if len(h) >= 200}
+
+    for ticker, row in market.iterrows():
+        close = histories[ticker]['close']
+        rsi = calculate_rsi(close, 14).iloc[-1]
+        assert_same([row['current_price'], row['SMA_50'], row['SMA_200']],
+                    [close.iloc[-1], round(calculate_sma(close, 50).iloc[-1], 2), round(calculate_sma(close, 200).iloc[-1], 2)],
+                    f"{ticker} price/SMA")
+        assert_same([row['RSI_14']], [round(rsi, 2) if not pd.isna(rsi) else 50], f"{ticker} RSI")
+
+    frame = pd.DataFrame({
+        'current_price': rng.normal(100, 10, 2000),
+        'SMA_200': rng.normal(100, 10, 2000),
+        'RSI_14': rng.uniform(0, 100, 2000),
+    })
+    frame.iloc[::50, 0] = np.nan
+    frame.iloc[::70, 2] = np.nan
+    assert (determine_signals(frame) == frame.apply(determine_signal, axis=1)).all(), "signal mismatch"
+
+
+if __name__ == "__main__":
+    print("--- TEST: STREAMING RSI/SMA vs FULL RECOMPUTE ---")
+    for test in (test_streaming_matches_full_recompute, test_edge_cases, test_book_resumes_across_runs,
+                 test_book_rebuilds_on_revised_close, test_market_matrix_matches_per_ticker):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
@@ -0,0 +1,62 @@
+import re
+from ticker_extractor import TickerExtractor
+from news_gathering import hsx_articles
+
+# ---------------------------------------------------------
+# REGRESSION: One-pass extractor vs the per-ticker \b regex loop
+# ---------------------------------------------------------
+TICKERS = ['VIX', 'HPG', 'HSG', 'FPT', 'SSI', 'VN30', 'E1VFVN30', 'MWG', 'CEO']
+TITLES = [
+    "VIX có lên được không?",
+    "VIXION không phải mã chứng khoán",
+    "HPG và HSG: thép nào khỏe hơn?",
+    "hpg, fpt, ssi - danh mục tuần này",
+    "VN30 vs E1VFVN30",
+    "Cổ phiếu MWG_2024 hay MWG?",
+    "CEO của FPT mua vào FPT",
+    "ĐHPG không phải HPG... mà là HPG!",
+    "",
+]
+
+
+def reference(title):
+    """The old filter, extended to every matching ticker (ordered by position in the title)."""
+    upper = title.upper()
+    hits = [(m.start(), t) for t in TICKERS for m in [re.search(r'\b' + re.escape(t) + r'\b', upper)] if m]
+    return [t for _, t in sorted(hits)]
+
+
+def test_matches_per_ticker_regex():
+    extractor = TickerExtractor(TICKERS)
+    for title in TITLES:
+        assert extractor.find_all(title) == reference(title), title
+
+
+def test_all_mentions_and_first():
+    extractor = TickerExtractor(t.lower() for t in TICKERS)
+    assert extractor.find_all("HPG và HSG: thép nào khỏe hơn? HPG!") == ['HPG', 'HSG']
+    assert extractor.first("CEO của FPT") == 'CEO'
+    assert extractor.first("Không có mã nào") is None
+    assert extractor.find_all(None) == []
+
+
+def test_hsx_titles_need_the_leading_ticker():
+    """--all-tickers: TIN, MWG etc. are tickers, but "tin" is also Vietnamese for news."""
+    extractor = TickerExtractor(['TIN', 'HPG', 'VIC'])
+    titles = ["HPG: Thông báo tin đồn về việc tăng vốn",
+              "tin nhanh: VIC và HPG tăng trần",
+              "TIN: Nghị quyết Hội đồng quản trị",
+              "Tin: HPG chia cổ tức",
+              "hpg: báo cáo tài chính quý 3",
+              " VIC : Giải trình biến động lợi nhuận"]
+    assert [extractor.leading(t) for t in titles] == ['HPG', None, 'TIN', None, None, 'VIC']
+    rows = hsx_articles([{'title': t, 'postedDate': 1760000000} for t in titles], extractor)
+    assert [(r['ticker'], r['news_title']) for r in rows] == [('HPG', titles[0]), ('TIN', titles[2]),
+                                                              ('VIC', titles[5])]
+
+
+if __name__ == "__main__":
+    print("--- TEST: ONE-PASS TICKER EXTRACTOR ---")
+    for test in (test_matches_per_ticker_regex, test_all_mentions_and_first, test_hsx_titles_need_the_leading_ticker):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
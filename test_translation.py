@@ -0,0 +1,46 @@
+from translation import StubTranslator, pack_chunks, split_reply, MAX_CHARS
+
+# ---------------------------------------------------------
+# BATCH TRANSLATION: packing, mapping back, per-title fallback
+# ---------------------------------------------------------
+TITLES = [f"Tin số {i}: cổ phiếu tăng trần" + " x" * (i % 40) for i in range(500)]
+
+
+def test_chunks_respect_size_limit():
+    chunks = pack_chunks(TITLES, max_chars=1000)
+    assert sorted(i for c in chunks for i in c) == list(range(len(TITLES)))
+    assert all(len('\n'.join(TITLES[i] for i in c)) <= 1000 for c in chunks)
+    assert len(pack_chunks(TITLES)) < len(TITLES) / 10, "titles should share requests"
+    assert pack_chunks(["a" * (MAX_CHARS + 10)]) == [[0]], "an oversized title gets its own chunk"
+
+
+def test_batch_maps_back_in_order():
+    stub = StubTranslator()
+    titles = TITLES + ["line\nbreak inside", "", "   "]
+    out = stub.translate_batch(titles)
+    assert out[:len(TITLES)] == [f"EN {t}" for t in TITLES]
+    assert out[-3:] == ["EN line break inside", None, None]
+    assert stub.stats['requests'] == len(stub.calls) < len(TITLES) / 10
+
+
+def test_broken_chunks_fall_back_per_title():
+    stub = StubTranslator(merge_lines=True)   # Provider that loses the line breaks
+    out = stub.translate_batch(TITLES[:20])
+    assert out == [f"EN {t}" for t in TITLES[:20]]
+    assert stub.stats['fallback_chunks'] == 1
+
+
+def test_failed_titles_are_none():
+    stub = StubTranslator(fail_on=("Tin số 7:",))
+    out = stub.translate_batch(TITLES[:10])
+    assert out[7] is None
+    assert all(out[i] == f"EN {TITLES[i]}" for i in range(10) if i != 7)
+    assert split_reply("a\n\nc", 3) is None and split_reply("a\nb", 3) is None
+
+
+if __name__ == "__main__":
+    print("--- TEST: BATCH TRANSLATION ---")
+    for test in (test_chunks_respect_size_limit, test_batch_maps_back_in_order,
+                 test_broken_chunks_fall_back_per_title, test_failed_titles_are_none):
+        test()
+        print(f"   ✅ PASS: {test.__name__}")
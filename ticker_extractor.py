@@ -0,0 +1,50 @@
+import os
+import re
+from quant_starting_stocks.artifacts import read_artifact
+
+# --- CONFIGURATION ---
+MASTER_FILE = 'data/company_master_list.csv'   # Full ticker universe (get_master_industry_list.py)
+_WORDS = re.compile(r'\w+')
+_LEADING = re.compile(r'\s*([A-Z0-9]+)\s*:')   # Exchange disclosure titles: "HPG: Nghị quyết HĐQT ..."
+
+
+class TickerExtractor:
+    """
+    Finds every ticker mentioned in a title in one pass.
+    A ticker counts only as a whole word, the same rule as re.search(r'\\bVIX\\b'): "VIX" matches
+    "VIX" but not "VIXION". Since tickers are made of word characters, that is exactly "a maximal
+    run of word characters equal to a ticker", so the title is split into word runs once and each
+    run is looked up in a set. Cost depends on the title length, not on how many tickers are tracked.
+    """
+
+    def __init__(self, tickers):
+        self.tickers = frozenset(str(t).strip().upper() for t in tickers if str(t).strip())
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def find_all(self, title):
+        """Tickers in order of first mention, without repeats."""
+        if not isinstance(title, str):
+            return []
+        found = [w for w in _WORDS.findall(title.upper()) if w in self.tickers]
+        return list(dict.fromkeys(found))
+
+    def leading(self, title):
+        """
+        The ticker a disclosure title starts with ("HPG: ..."), as written: case-sensitive, followed
+        by a colon. For feeds where a loose match turns words into tickers ("tin" vs TIN).
+        """
+        match = _LEADING.match(title) if isinstance(title, str) else None
+        return match.group(1) if match and match.group(1) in self.tickers else None
+
+    def first(self, title):
+        found = self.find_all(title)
+        return found[0] if found else None
+
+    @classmethod
+    def from_universe(cls, path=MASTER_FILE):
+        """Extractor over every listed ticker, or None if the master list has not been built yet."""
+        if not os.path.exists(path):
+            return None
+        return cls(read_artifact(path, columns=['ticker'])['ticker'].astype(str).unique())